@@ -0,0 +1,185 @@
+"""
+The hot paths to benchmark. Each case is a context manager setting things up
+and yielding a function to measure (the setup is never measured).
+"""
+
+import logging
+from contextlib import contextmanager
+
+from threatresponse import ThreatResponse, urls
+from threatresponse.api.commands import (
+    build_array_for_targets,
+    build_array_for_verdicts,
+)
+from threatresponse.api.enrich import EnrichAPI
+from threatresponse.api.profile import ProfileAPI
+from threatresponse.api.routing import Router
+from threatresponse.request import (
+    InMemoryRequest,
+    LoggedRequest,
+    RelativeRequest,
+    StandardRequest,
+    TimedRequest,
+)
+
+from .stub_server import stub_server
+
+CASES = {}
+
+OBSERVABLES = [{'type': 'ip', 'value': '10.0.{}.{}'.format(i // 256, i % 256)}
+               for i in range(100)]
+
+WHOAMI = {'user': {'user-name': 'John Doe', 'scopes': ['enrich', 'inspect']},
+          'org': {'name': 'ACME', 'id': 'org-id'}}
+
+
+def case(name):
+    def register(function):
+        CASES[name] = contextmanager(function)
+        return function
+
+    return register
+
+
+def module_results(modules, docs, kind, doc):
+    """ Returns a response of the enrich endpoints made of the results of
+    `modules` modules with `docs` docs of the `kind` each. """
+
+    return {'data': [
+        {
+            'module': 'Module {}'.format(module),
+            'module_type_id': 'type-{}'.format(module),
+            'module_instance_id': 'instance-{}'.format(module),
+            'data': {kind: {'count': docs, 'docs': [
+                doc(index) for index in range(docs)
+            ]}},
+        }
+        for module in range(modules)
+    ]}
+
+
+def verdict(index):
+    return {
+        'type': 'verdict',
+        'disposition': index % 5 + 1,
+        'observable': OBSERVABLES[index % len(OBSERVABLES)],
+        'valid_time': {'start_time': '2020-01-01T00:00:00.000Z',
+                       'end_time': '2525-01-01T00:00:00.000Z'},
+    }
+
+
+def sighting(index):
+    return {
+        'type': 'sighting',
+        'count': 1,
+        'observables': [OBSERVABLES[index % len(OBSERVABLES)]],
+        'targets': [{
+            'type': 'endpoint',
+            'observables': [{'type': 'hostname',
+                             'value': 'host-{}'.format(index % 50)}],
+            'observed_time': {'start_time': '2020-01-01T00:00:00.000Z'},
+        }],
+    }
+
+
+def in_memory_client(*routes):
+    return ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                          transport=InMemoryRequest(routes))
+
+
+@case('resolution.dispatch')
+def resolution_dispatch():
+    # The whole call except for the network, i.e. the client's own overhead.
+    client = in_memory_client(
+        ('POST', '/iroh/iroh-enrich/observe/observables', {'data': []}),
+    )
+
+    yield lambda: client.enrich.observe.observables(OBSERVABLES)
+
+
+@case('resolution.getattr')
+def resolution_getattr():
+    client = in_memory_client()
+
+    yield lambda: client.enrich.observe.observables
+
+
+@case('router.merged')
+def router_merged():
+    router = EnrichAPI._EnrichAPI__router
+
+    yield lambda: Router.merged(router, router)
+
+
+@case('api.build_resolution')
+def api_build_resolution():
+    api = EnrichAPI(None)
+
+    yield api._build_resolution
+
+
+@case('request.chain')
+def request_chain():
+    # RelativeRequest -> LoggedRequest -> TimedRequest -> StandardRequest
+    # over a local connection (kept alive).
+    logger = logging.getLogger('benchmarks')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    routes = {('GET', '/iroh/profile/whoami'): WHOAMI}
+
+    with stub_server(routes) as environment:
+        request = RelativeRequest(
+            LoggedRequest(TimedRequest(StandardRequest(), 10), logger),
+            environment['visibility'],
+        )
+
+        yield lambda: request.get('/iroh/profile/whoami')
+
+
+@case('client.stub_server')
+def client_stub_server():
+    routes = {('POST', '/iroh/iroh-enrich/observe/observables'): {'data': []}}
+
+    with stub_server(routes) as environment:
+        client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                                environment=environment)
+
+        yield lambda: client.enrich.observe.observables(OBSERVABLES)
+
+
+def api_perform(response_type):
+    request = InMemoryRequest([('GET', '/iroh/profile/whoami', WHOAMI)])
+    api = ProfileAPI(RelativeRequest(request, 'https://example.com'))
+
+    yield lambda: api.whoami(response_type=response_type)
+
+
+for response_type in ['json', 'text', 'raw']:
+    case('api.perform.' + response_type)(
+        lambda response_type=response_type: api_perform(response_type)
+    )
+
+
+@case('urls.join')
+def urls_join():
+    yield lambda: urls.join('/ctia/judgement', 'judgement-id', 'sightings')
+
+
+@case('urls.url_for')
+def urls_url_for():
+    yield lambda: urls.url_for('eu', 'private_intel')
+
+
+@case('commands.build_array_for_verdicts')
+def commands_build_array_for_verdicts():
+    response = module_results(20, 500, 'verdicts', verdict)
+
+    yield lambda: build_array_for_verdicts(response)
+
+
+@case('commands.build_array_for_targets')
+def commands_build_array_for_targets():
+    response = module_results(20, 500, 'sightings', sighting)
+
+    yield lambda: build_array_for_targets(response)
@@ -0,0 +1,129 @@
+"""
+Runs the benchmarks without any extra dependencies, saves the results as
+baselines and compares them to previously saved ones, e.g.:
+
+    python -m benchmarks.run --save 1.2.0
+    python -m benchmarks.run --compare 1.2.0 --tolerance 0.2
+
+Exits with a non-zero status if any case is slower than its baseline
+by more than the tolerance.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import timeit
+
+import threatresponse
+
+from .cases import CASES
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'baselines')
+
+
+def measure(function, rounds=5, min_time=0.2):
+    """ Returns the per call timings (in seconds) of the best
+    and median rounds each taking at least `min_time` seconds. """
+
+    timer = timeit.Timer(function)
+
+    # Calibrate the number of calls per round.
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    timings = sorted(timer.repeat(rounds, number))
+
+    return {'min': timings[0] / number,
+            'median': timings[len(timings) // 2] / number,
+            'calls': number}
+
+
+def run(pattern='*', rounds=5, min_time=0.2):
+    results = {}
+
+    for name in sorted(CASES):
+        if not fnmatch.fnmatchcase(name, pattern):
+            continue
+
+        with CASES[name]() as function:
+            function()  # Warm up (e.g. connect and get a token).
+            results[name] = measure(function, rounds, min_time)
+
+        print('{:<40} {:>12.2f} us'.format(name,
+                                           results[name]['median'] * 1e6))
+
+    return results
+
+
+def compared(results, baseline, tolerance):
+    """ Prints the ratios of the results to the baseline ones
+    and returns the names of the regressed cases. """
+
+    regressed = []
+
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        ratio = result['median'] / baseline[name]['median']
+        slower = ratio > 1 + tolerance
+        if slower:
+            regressed.append(name)
+
+        print('{:<40} {:>8.2f}x{}'.format(name, ratio,
+                                          '  REGRESSED' if slower else ''))
+
+    return regressed
+
+
+def path_for(name):
+    return os.path.join(BASELINES, name + '.json')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-k', '--cases', default='*',
+                        help='a pattern of the cases to run')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='the minimum number of seconds per round')
+    parser.add_argument('--save', metavar='NAME',
+                        help='save the results as a baseline')
+    parser.add_argument('--compare', metavar='NAME',
+                        help='compare the results to a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='the allowed slowdown (0.2 means 20%%)')
+    args = parser.parse_args(argv)
+
+    results = run(args.cases, args.rounds, args.min_time)
+
+    if args.save:
+        if not os.path.isdir(BASELINES):
+            os.makedirs(BASELINES)
+        with open(path_for(args.save), 'w') as fout:
+            json.dump({
+                'version': threatresponse.__version__,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            }, fout, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(path_for(args.compare)) as fin:
+            baseline = json.load(fin)
+
+        print('\nCompared to {} (Python {}):'.format(baseline['version'],
+                                                    baseline['python']))
+        if compared(results, baseline['results'], args.tolerance):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
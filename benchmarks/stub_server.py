@@ -0,0 +1,71 @@
+import json
+import threading
+from contextlib import contextmanager
+
+from six.moves import BaseHTTPServer, socketserver
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+@contextmanager
+def stub_server(routes):
+    """
+    Serves the JSON payloads of the `{(method, path): payload}` routes
+    (and tokens) on a local port over HTTP/1.1 with keep-alive until exit.
+    Yields the environment (i.e. the URLs by API family) to pass to clients.
+    """
+
+    bodies = dict(
+        (route, json.dumps(payload).encode('utf-8'))
+        for route, payload in routes.items()
+    )
+    bodies[('POST', '/iroh/oauth2/token')] = json.dumps({
+        'access_token': 'ACCESS_TOKEN',
+        'expires_in': 600,
+    }).encode('utf-8')
+
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Send the whole response at once (otherwise delayed ACKs
+        # make each request take tens of milliseconds).
+        wbufsize = -1
+        disable_nagle_algorithm = True
+
+        def _respond(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+
+            body = bodies.get((self.command, self.path.split('?')[0]))
+            status = 200 if body is not None else 404
+            body = body if body is not None else b'{}'
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+        def log_message(self, *args):
+            pass
+
+    server = _Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+    try:
+        yield {
+            'visibility': url,
+            'private_intel': url,
+            'global_intel': url,
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,19 @@
+"""
+The same cases as `benchmarks.run` runs, but for `pytest-benchmark`, e.g.:
+
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:20%
+"""
+
+import pytest
+
+from .cases import CASES
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_benchmark(benchmark, name):
+    with CASES[name]() as function:
+        function()  # Warm up (e.g. connect and get a token).
+        benchmark(function)
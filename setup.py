@@ -42,12 +42,22 @@ AUTHOR = 'Cisco Security'
 
 LICENSE = 'MIT'
 
-PACKAGES = setuptools.find_packages(exclude=['tests', 'tests.*'])
+PACKAGES = setuptools.find_packages(exclude=['tests', 'tests.*',
+                                                'benchmarks', 'benchmarks.*'])
 
 PYTHON_REQUIRES = '>=2.6'
 
 INSTALL_REQUIRES = read_requirements()
 
+EXTRAS_REQUIRE = {
+    # The asynchronous client (`threatresponse.aio`).
+    'aio': ['aiohttp>=3.6'],
+    # The fastest JSON codec (`codec='auto'`).
+    'orjson': ["orjson; python_version >= '3.6'"],
+    # The HTTP/2 transport (`transport='http2'`).
+    'http2': ["httpx[http2]>=0.26; python_version >= '3.8'"],
+}
+
 KEYWORDS = [
     'cisco', 'security',
     'threat', 'response',
@@ -83,6 +93,7 @@ setuptools.setup(
     packages=PACKAGES,
     python_requires=PYTHON_REQUIRES,
     install_requires=INSTALL_REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     keywords=KEYWORDS,
     classifiers=CLASSIFIERS,
 )
@@ -0,0 +1,35 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def serve(routes):
+    """ Starts a local server with the specified `(method, path, handler)`
+    routes and returns it, `server.make_url(path)` gives absolute URLs. """
+
+    app = web.Application()
+    for method, path, handler in routes:
+        app.router.add_route(method, path, handler)
+
+    server = TestServer(app)
+    await server.start_server()
+
+    return server
+
+
+def token_handler(token='ACCESS_TOKEN', calls=None):
+    async def handler(request):
+        if calls is not None:
+            calls.append(request)
+        return web.json_response({'access_token': token})
+
+    return handler
@@ -0,0 +1,395 @@
+import asyncio
+import gc
+import io
+import sys
+import warnings
+from datetime import datetime
+
+import pytest
+from aiohttp import web
+from requests import HTTPError
+
+from threatresponse.aio import (
+    AsyncMultiRegionThreatResponse,
+    AsyncThreatResponse,
+)
+from threatresponse.aio.api import AsyncCommandsAPI
+from threatresponse.aio.request import AsyncInMemoryRequest
+from threatresponse.api import EnrichAPI, IntelAPI
+from threatresponse.client import ThreatResponse
+from threatresponse.exceptions import ResponseTypeError
+from threatresponse.request.response import build_response
+
+from .helpers import run, serve, token_handler
+
+
+def environment(server):
+    url = str(server.make_url(''))
+    return {
+        'visibility': url,
+        'private_intel': url,
+        'global_intel': url,
+    }
+
+
+def test_types_of_inner_apis():
+    client = AsyncThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD')
+
+    assert isinstance(client, ThreatResponse)
+    assert isinstance(client.enrich, EnrichAPI)
+    assert isinstance(client.commands, AsyncCommandsAPI)
+    assert isinstance(client.private_intel, IntelAPI)
+
+
+def test_that_clients_reject_synchronous_context_manager():
+    clients = [
+        AsyncThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD'),
+        AsyncMultiRegionThreatResponse({'eu': ('CLIENT_ID',
+                                               'CLIENT_PASSWORD')}),
+    ]
+
+    for client in clients:
+        with pytest.raises(TypeError) as error:
+            with client:
+                pass
+
+        assert '`async with`' in str(error.value)
+
+
+def test_that_client_does_not_request_token_on_init():
+    async def scenario():
+        calls = []
+        server = await serve([
+            ('POST', '/iroh/oauth2/token', token_handler(calls=calls)),
+        ])
+
+        async with AsyncThreatResponse(
+            'CLIENT_ID', 'CLIENT_PASSWORD',
+            environment=environment(server),
+        ):
+            pass
+
+        await server.close()
+
+        return calls
+
+    assert run(scenario()) == []
+
+
+def test_that_concurrent_requests_share_single_token():
+    async def observe(request):
+        assert request.headers['Authorization'] == 'Bearer ACCESS_TOKEN'
+        payload = await request.json()
+        return web.json_response({'data': payload})
+
+    async def scenario():
+        calls = []
+        server = await serve([
+            ('POST', '/iroh/oauth2/token', token_handler(calls=calls)),
+            ('POST', '/iroh/iroh-enrich/observe/observables', observe),
+        ])
+
+        async with AsyncThreatResponse(
+            'CLIENT_ID', 'CLIENT_PASSWORD',
+            environment=environment(server),
+        ) as client:
+            responses = await asyncio.gather(*(
+                client.enrich.observe.observables([{'value': str(index)}])
+                for index in range(10)
+            ))
+
+        await server.close()
+
+        return calls, responses
+
+    calls, responses = run(scenario())
+
+    assert len(calls) == 1
+    assert responses == [
+        {'data': [{'value': str(index)}]} for index in range(10)
+    ]
+
+
+def test_that_failed_response_raises_http_error():
+    async def settings(request):
+        return web.json_response({'error': 'ERROR'}, status=403)
+
+    async def scenario():
+        server = await serve([
+            ('POST', '/iroh/oauth2/token', token_handler()),
+            ('GET', '/iroh/iroh-enrich/settings', settings),
+        ])
+
+        try:
+            async with AsyncThreatResponse(
+                'CLIENT_ID', 'CLIENT_PASSWORD',
+                environment=environment(server),
+            ) as client:
+                await client.enrich.settings.get()
+        finally:
+            await server.close()
+
+    with pytest.raises(HTTPError) as error:
+        run(scenario())
+
+    assert '"error": "ERROR"' in str(error.value)
+
+
+def test_command_verdict_succeeds():
+    async def inspect(request):
+        return web.json_response([{'type': 'domain', 'value': 'cisco.com'}])
+
+    async def deliberate(request):
+        observable = (await request.json())[0]
+        return web.json_response({'data': [{
+            'module': 'module',
+            'module_type_id': 'module_type_id',
+            'module_instance_id': 'module_instance_id',
+            'data': {'verdicts': {'count': 1, 'docs': [{
+                'observable': observable,
+                'disposition': 1,
+                'valid_time': {},
+            }]}},
+        }]})
+
+    async def scenario():
+        server = await serve([
+            ('POST', '/iroh/oauth2/token', token_handler()),
+            ('POST', '/iroh/iroh-inspect/inspect', inspect),
+            ('POST', '/iroh/iroh-enrich/deliberate/observables', deliberate),
+        ])
+
+        async with AsyncThreatResponse(
+            'CLIENT_ID', 'CLIENT_PASSWORD',
+            environment=environment(server),
+        ) as client:
+            result = await client.commands.verdict('cisco.com')
+
+        await server.close()
+
+        return result
+
+    assert run(scenario())['verdicts'] == [{
+        'observable_value': 'cisco.com',
+        'observable_type': 'domain',
+        'expiration': '',
+        'module': 'module',
+        'module_type_id': 'module_type_id',
+        'module_instance_id': 'module_instance_id',
+        'disposition_name': 'Clean',
+    }]
+
+
+def test_command_verdict_many_keeps_errors_separate():
+    async def inspect(request):
+        content = (await request.json())['content']
+        if content == 'bad':
+            return web.json_response({'error': 'ERROR'}, status=400)
+        return web.json_response([])
+
+    async def deliberate(request):
+        return web.json_response({'data': []})
+
+    async def scenario():
+        server = await serve([
+            ('POST', '/iroh/oauth2/token', token_handler()),
+            ('POST', '/iroh/iroh-inspect/inspect', inspect),
+            ('POST', '/iroh/iroh-enrich/deliberate/observables', deliberate),
+        ])
+
+        async with AsyncThreatResponse(
+            'CLIENT_ID', 'CLIENT_PASSWORD',
+            environment=environment(server),
+        ) as client:
+            results = [
+                await result for result in
+                client.commands.verdict_many(['good', 'bad'], max_workers=1)
+            ]
+
+        await server.close()
+
+        return dict((result['payload'], result) for result in results)
+
+    results = run(scenario())
+
+    assert results['good']['result'] == {'response': {'data': []},
+                                         'verdicts': []}
+    assert results['good']['error'] is None
+    assert results['bad']['result'] is None
+    assert isinstance(results['bad']['error'], HTTPError)
+
+
+def test_observables_with_chunk_size_are_posted_concurrently():
+    async def deliberate(request):
+        chunk = await request.json()
+        return web.json_response({'data': [{
+            'module_instance_id': 'module_instance_id',
+            'data': {'verdicts': {'count': len(chunk), 'docs': chunk}},
+        }]})
+
+    async def scenario():
+        server = await serve([
+            ('POST', '/iroh/oauth2/token', token_handler()),
+            ('POST', '/iroh/iroh-enrich/deliberate/observables', deliberate),
+        ])
+
+        async with AsyncThreatResponse(
+            'CLIENT_ID', 'CLIENT_PASSWORD',
+            environment=environment(server),
+        ) as client:
+            response = await client.enrich.deliberate.observables(
+                list(range(7)), chunk_size=3
+            )
+
+        await server.close()
+
+        return response
+
+    assert run(scenario()) == {'data': [{
+        'module_instance_id': 'module_instance_id',
+        'data': {'verdicts': {'count': 7, 'docs': list(range(7))}},
+    }]}
+
+
+@pytest.mark.skipif(sys.version_info < (3, 6),
+                    reason='Asynchronous generators require Python 3.6+.')
+def test_search_iter_iterates_asynchronously():
+    async def search(request):
+        offset = int(request.query.get('offset', 0))
+        entities = list(range(5))[offset:offset + 2]
+        headers = {}
+        if offset < 4:
+            headers['X-Next'] = 'limit=2&offset={}'.format(offset + 2)
+        return web.json_response(entities, headers=headers)
+
+    async def scenario():
+        server = await serve([
+            ('POST', '/iroh/oauth2/token', token_handler()),
+            ('GET', '/ctia/sighting/search', search),
+        ])
+
+        async with AsyncThreatResponse(
+            'CLIENT_ID', 'CLIENT_PASSWORD',
+            environment=environment(server),
+        ) as client:
+            entities = []
+            async for entity in client.private_intel.sighting.search.iter(
+                page_size=2
+            ):
+                entities.append(entity)
+
+        await server.close()
+
+        return entities
+
+    assert run(scenario()) == [0, 1, 2, 3, 4]
+
+
+def test_that_client_uses_injected_transport():
+    async def whoami(method, url, **kwargs):
+        return build_response(method, url, 200, {}, b'{"user": {}}')
+
+    transport = AsyncInMemoryRequest([('GET', '/iroh/profile/whoami', whoami)])
+
+    async def scenario():
+        async with AsyncThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                                       transport=transport) as client:
+            return await client.profile.whoami()
+
+    assert run(scenario()) == {'user': {}}
+    assert transport.performed == 2
+
+
+def test_that_export_and_import_methods_are_rejected():
+    transport = AsyncInMemoryRequest([])
+
+    client = AsyncThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                                 transport=transport)
+    bundle = client.private_intel.bundle
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+
+        with pytest.raises(TypeError) as error:
+            bundle.import_.post_jsonl([{'type': 'sighting'}])
+        assert 'asynchronous client' in str(error.value)
+
+        for export in (lambda sink: bundle.export.get_jsonl(sink),
+                       lambda sink: bundle.export.post_jsonl({}, sink)):
+            sink = io.StringIO()
+            with pytest.raises(TypeError) as error:
+                export(sink)
+            assert 'asynchronous client' in str(error.value)
+            assert sink.getvalue() == ''
+
+        with pytest.raises(TypeError) as error:
+            client.private_intel.sighting.search.export(
+                io.StringIO(), datetime(2020, 1, 1), datetime(2020, 1, 2)
+            )
+        assert 'asynchronous client' in str(error.value)
+
+        # Any unawaited coroutine would warn once collected.
+        gc.collect()
+
+    assert not caught
+    assert transport.performed == 0
+
+
+def test_that_stream_response_type_is_rejected():
+    transport = AsyncInMemoryRequest([])
+
+    client = AsyncThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                                 transport=transport)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+
+        with pytest.raises(ResponseTypeError) as error:
+            client.private_intel.sighting.search.get(response_type='stream')
+        assert 'asynchronous client' in str(error.value)
+
+        # Any unawaited coroutine would warn once collected.
+        gc.collect()
+
+    assert not caught
+    assert transport.performed == 0
+
+
+def test_that_multi_region_client_fails_over_without_blocking():
+    in_flight = []
+    overlapping = []
+
+    async def search(method, url, **kwargs):
+        if '.eu.' in url:
+            in_flight.append(url)
+            overlapping.append(len(in_flight))
+            await asyncio.sleep(0.05)
+            in_flight.remove(url)
+            raise asyncio.TimeoutError()
+        return build_response(method, url, 200, {}, b'[]')
+
+    transport = AsyncInMemoryRequest([
+        ('GET', '/ctia/sighting/search', search),
+    ])
+
+    async def scenario():
+        async with AsyncMultiRegionThreatResponse(
+            {'eu': ('CLIENT_ID', 'CLIENT_PASSWORD')},
+            transport=transport,
+        ) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.global_intel.sighting.search.get()
+
+        async with AsyncMultiRegionThreatResponse(
+            {'eu': ('CLIENT_ID', 'CLIENT_PASSWORD'),
+             'us': ('CLIENT_ID', 'CLIENT_PASSWORD')},
+            transport=transport,
+        ) as client:
+            return await asyncio.gather(
+                client.global_intel.sighting.search.get(),
+                client.global_intel.sighting.search.get(),
+            )
+
+    assert run(scenario()) == [[], []]
+    # Both requests were waiting for the failing region at the same time.
+    assert max(overlapping) == 2
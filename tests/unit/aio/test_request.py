@@ -0,0 +1,343 @@
+import os
+import ssl
+import time
+from collections import OrderedDict
+
+import pytest
+import requests
+from mock import MagicMock, patch
+
+from aiohttp import web
+from six.moves.http_client import UNAUTHORIZED
+
+from threatresponse.aio.request import (
+    AsyncCachingRequest,
+    AsyncClientAuthorizedRequest,
+    AsyncCompressedRequest,
+    AsyncFailoverRequest,
+    AsyncHTTP2Request,
+    AsyncLoggedRequest,
+    AsyncRateLimitedRequest,
+    AsyncRecordingRequest,
+    AsyncReplayingRequest,
+    AsyncRetryingRequest,
+    AsyncStandardRequest,
+    AsyncTokenAuthorizedRequest,
+)
+from threatresponse.request.base import asynchronous
+from threatresponse.request.caching import ResponseCache
+from threatresponse.request.failover import RegionHealth
+from threatresponse.request.cassette import Cassette
+from threatresponse.request.rate_limited import TokenBucket
+from threatresponse.request.relative import RelativeRequest
+from threatresponse.request.response import Response
+from threatresponse.request.standard import StandardRequest
+from threatresponse.request.timed import TimedRequest
+
+from .helpers import run, serve
+
+
+class InnerRequest(object):
+    """ Records every call and returns the specified responses in turn. """
+
+    def __init__(self, *responses):
+        self.calls = []
+        self._responses = list(responses)
+
+    async def perform(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self._responses.pop(0)
+
+    def post(self, url, **kwargs):
+        return self.perform('POST', url, **kwargs)
+
+
+def response(status_code=200, payload=None):
+    mocked = MagicMock()
+    mocked.headers = {}
+    mocked.status_code = status_code
+    mocked.ok = 100 <= status_code < 400
+    mocked.json.return_value = payload
+    return mocked
+
+
+def response_with_content(content, status_code=200):
+    mocked = response(status_code)
+    mocked.reason = 'OK'
+    mocked.content = content
+    return mocked
+
+
+def test_that_standard_request_converts_arguments_and_response():
+    async def echo(request):
+        return web.json_response({
+            'query': sorted(request.query.items()),
+            'body': await request.json(),
+        })
+
+    async def scenario():
+        server = await serve([('POST', '/echo', echo)])
+
+        request = AsyncStandardRequest()
+        result = await request.post(
+            str(server.make_url('/echo')),
+            params={'limit': 10, 'fields': ['a', 'b'], 'skip': None},
+            json={'spam': 'eggs'},
+            timeout=5,
+        )
+
+        await request.close()
+        await server.close()
+
+        return result
+
+    result = run(scenario())
+
+    assert isinstance(result, Response)
+    assert result.ok
+    assert result.json() == {
+        'query': [['fields', 'a'], ['fields', 'b'], ['limit', '10']],
+        'body': {'spam': 'eggs'},
+    }
+
+
+def test_that_standard_request_converts_verify_and_cert():
+    request = AsyncStandardRequest()
+
+    assert 'ssl' not in request._converted({'verify': True})
+    assert request._converted({'verify': False})['ssl'] is False
+
+    bundle = request._converted({'verify': requests.certs.where()})['ssl']
+    assert isinstance(bundle, ssl.SSLContext)
+    assert bundle.verify_mode == ssl.CERT_REQUIRED
+    assert bundle.get_ca_certs()
+    assert request._converted({'verify': requests.certs.where()})['ssl'] \
+        is bundle
+
+    with patch('ssl.create_default_context') as create_default_context:
+        context = request._converted({
+            'verify': os.path.dirname(requests.certs.where()),
+            'cert': ['client.pem', 'client.key'],
+        })['ssl']
+
+    create_default_context.assert_called_once_with(
+        capath=os.path.dirname(requests.certs.where())
+    )
+    context.load_cert_chain.assert_called_once_with('client.pem',
+                                                    'client.key')
+
+
+def test_that_requests_wrapping_asynchronous_ones_are_asynchronous():
+    assert asynchronous(AsyncStandardRequest())
+    assert asynchronous(RelativeRequest(TimedRequest(AsyncStandardRequest(),
+                                                     5), '/'))
+    assert not asynchronous(RelativeRequest(StandardRequest(), '/'))
+    assert not asynchronous(MagicMock())
+
+
+def test_that_client_authorized_request_retrieves_token_on_first_request():
+    inner = InnerRequest(response(payload={'access_token': 'Cake'}),
+                         response())
+
+    request = AsyncClientAuthorizedRequest(inner, 'x', 'y')
+    assert inner.calls == []
+
+    run(request.post('/some', headers={'Just': 'Test'}))
+
+    assert inner.calls == [
+        ('POST', 'https://visibility.amp.cisco.com/iroh/oauth2/token', {
+            'data': {'grant_type': 'client_credentials'},
+            'headers': {'Content-Type': 'application/x-www-form-urlencoded',
+                        'Accept': 'application/json'},
+            'auth': ('x', 'y'),
+        }),
+        ('POST', '/some', {
+            'headers': {'Just': 'Test', 'Authorization': 'Bearer Cake'},
+        }),
+    ]
+
+
+def test_that_client_authorized_request_retries_on_expiration():
+    inner = InnerRequest(response(payload={'access_token': 'Old'}),
+                         response(UNAUTHORIZED),
+                         response(payload={'access_token': 'New'}),
+                         response())
+
+    request = AsyncClientAuthorizedRequest(inner, 'x', 'y')
+    result = run(request.post('/some'))
+
+    assert result.status_code == 200
+    assert [call[2].get('headers', {}).get('Authorization')
+            for call in inner.calls] == [None, 'Bearer Old',
+                                         None, 'Bearer New']
+
+
+def test_that_client_authorized_request_keeps_token_if_refresh_fails():
+    unavailable = response(503)
+    unavailable.raise_for_status.side_effect = Exception('Unavailable.')
+    inner = InnerRequest(
+        response(payload={'access_token': 'Old', 'expires_in': 100}),
+        response(),
+        unavailable,
+        response(),
+        response(),
+    )
+
+    request = AsyncClientAuthorizedRequest(inner, 'x', 'y',
+                                           refresh_margin=10)
+    run(request.post('/some'))
+
+    with patch('time.time', return_value=time.time() + 95):
+        run(request.post('/some'))
+        run(request.post('/some'))
+
+    assert [call[2].get('headers', {}).get('Authorization')
+            for call in inner.calls] == [None, 'Bearer Old',
+                                         None, 'Bearer Old', 'Bearer Old']
+
+
+def test_that_client_authorized_request_rejects_background_refresh():
+    with pytest.raises(TypeError) as error:
+        AsyncClientAuthorizedRequest(InnerRequest(), 'x', 'y',
+                                     refresh_in_background=True)
+
+    assert 'asynchronous client' in str(error.value)
+
+
+def test_that_token_authorized_request_checks_token_once():
+    inner = InnerRequest(response(), response(), response())
+
+    request = AsyncTokenAuthorizedRequest(inner, 'test_token')
+
+    run(request.post('/some'))
+    run(request.post('/other'))
+
+    assert [call[:2] for call in inner.calls] == [
+        ('GET', 'https://visibility.amp.cisco.com/iroh/iroh-enrich/settings'),
+        ('POST', '/some'),
+        ('POST', '/other'),
+    ]
+
+
+def test_that_logged_request_logs_success_and_error():
+    inner = InnerRequest(response(200), response(404))
+    logger = MagicMock()
+
+    request = AsyncLoggedRequest(inner, logger)
+    run(request.get('/foo'))
+    run(request.get('/bar'))
+
+    logger.info.assert_called_once_with('GET /foo 200 OK')
+    logger.error.assert_called_once_with('GET /bar 404 Not Found')
+
+
+def test_that_retrying_request_retries_without_blocking():
+    inner = InnerRequest(response(503), response(200))
+
+    request = AsyncRetryingRequest(inner, backoff_factor=0.01)
+    result = run(request.get('/foo'))
+
+    assert result.status_code == 200
+    assert len(inner.calls) == 2
+
+
+def test_that_rate_limited_request_waits_without_blocking():
+    inner = InnerRequest(response(200), response(200))
+
+    request = AsyncRateLimitedRequest(inner, TokenBucket(rate=100, burst=1))
+
+    async def both():
+        return await request.get('/foo'), await request.get('/bar')
+
+    results = run(both())
+
+    assert [result.status_code for result in results] == [200, 200]
+    assert len(inner.calls) == 2
+
+
+def test_that_caching_request_reuses_responses_without_blocking():
+    inner = InnerRequest(response(200))
+
+    request = AsyncCachingRequest(inner, ResponseCache())
+
+    async def both():
+        return await request.get('/foo'), await request.get('/foo')
+
+    first, second = run(both())
+
+    assert first is second
+    assert len(inner.calls) == 1
+
+
+def test_that_compressed_request_falls_back_without_blocking():
+    inner = InnerRequest(response(415), response(200))
+
+    request = AsyncCompressedRequest(inner, threshold=1)
+
+    result = run(request.post('https://example.com/foo', data=b'spam'))
+
+    assert result.status_code == 200
+    assert inner.calls[0][2]['headers'] == {'Content-Encoding': 'gzip'}
+    assert inner.calls[1][2] == {'data': b'spam'}
+
+
+def test_that_failover_request_releases_discarded_responses():
+    failed = response(503)
+    us, eu = InnerRequest(failed), InnerRequest(response(200))
+
+    request = AsyncFailoverRequest(OrderedDict([('us', us), ('eu', eu)]),
+                                   RegionHealth())
+
+    assert run(request.get('/foo')).status_code == 200
+    failed.close.assert_called_once_with()
+
+    # Requests which may have side effects never fail over.
+    us._responses.append(response(503))
+    assert run(request.post('/foo')).status_code == 503
+    assert len(eu.calls) == 1
+
+
+def test_that_http2_request_falls_back_to_http1_without_blocking():
+    async def echo(request):
+        return web.json_response({
+            'query': sorted(request.query.items()),
+            'body': await request.json(),
+        })
+
+    async def scenario():
+        server = await serve([('POST', '/echo', echo)])
+
+        request = AsyncHTTP2Request()
+        result = await request.post(
+            str(server.make_url('/echo')),
+            params={'limit': 10, 'fields': ['a', 'b'], 'skip': None},
+            json={'spam': 'eggs'},
+            timeout=5,
+        )
+
+        await request.close()
+        await server.close()
+
+        return result
+
+    result = run(scenario())
+
+    assert isinstance(result, Response)
+    assert result.json() == {
+        'query': [['fields', 'a'], ['fields', 'b'], ['limit', '10']],
+        'body': {'spam': 'eggs'},
+    }
+
+
+def test_that_replaying_request_replays_recorded_exchanges():
+    cassette = Cassette()
+    recording = AsyncRecordingRequest(
+        InnerRequest(response_with_content(b'{"spam": "eggs"}')), cassette
+    )
+
+    run(recording.get('https://example.com/foo', params={'limit': 1}))
+    result = run(AsyncReplayingRequest(cassette).get(
+        'https://example.com/foo', params={'limit': 1}
+    ))
+
+    assert result.json() == {'spam': 'eggs'}
@@ -0,0 +1,91 @@
+import pytest
+from mock import MagicMock
+
+from threatresponse.api.base import API
+from threatresponse.api.routing import (
+    BoundRoute,
+    Resolution,
+    RouteNode,
+    Router,
+)
+from threatresponse.exceptions import RouteError
+
+
+def test_compiled():
+    def ab():
+        pass
+
+    def abc():
+        pass
+
+    router = Router({'a.b': ab, 'a.b.c': abc})
+
+    tree = RouteNode.compiled(router)
+
+    a = tree.children['a']
+    assert a.route == ['a'] and a.method is None
+    assert a.children['b'].route == ['a', 'b']
+    assert a.children['b'].method is ab
+    assert a.children['b'].children['c'].method is abc
+
+
+def test_bound_route_call():
+    owner = object()
+    method = MagicMock()
+    bound = BoundRoute(owner, RouteNode.compiled(Router({'x.y': method})))
+
+    bound.x.y('a', z=1)
+
+    method.assert_called_once_with(owner, 'a', z=1)
+
+    with pytest.raises(RouteError):
+        bound.x()
+
+
+def test_bound_route_getattr_is_cached():
+    bound = BoundRoute(object(), RouteNode.compiled(Router({'x.y': None})))
+
+    assert bound.x is bound.x
+    assert bound.x.y is bound.x.y
+    assert 'y' in vars(bound.x)
+
+
+def test_bound_route_getattr_falls_back_to_resolution():
+    owner = object()
+    router = Router({'x.y': None})
+    bound = BoundRoute(owner, RouteNode.compiled(router))
+
+    resolution = bound.x.z
+
+    assert isinstance(resolution, Resolution)
+    assert resolution._route == ['x', 'z']
+    with pytest.raises(RouteError):
+        resolution()
+
+
+def test_api_dispatches_by_route_tree_of_class():
+    class BaseAPI(API):
+        __router, route = Router.new()
+
+        @route('a.b')
+        def _perform(self):
+            return 'base'
+
+        @route('a.c')
+        def _perform(self):
+            return 'base'
+
+    class ChildAPI(BaseAPI):
+        __router, route = Router.new()
+
+        @route('a.b')
+        def _perform(self):
+            return 'child'
+
+    api = ChildAPI(None)
+
+    assert api.a.b() == 'child'
+    assert api.a.c() == 'base'
+    # Attribute chains are resolved once per instance.
+    assert vars(api)['a'] is api.a
+    assert api.a is not ChildAPI(None).a
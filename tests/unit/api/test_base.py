@@ -0,0 +1,49 @@
+import json
+
+from mock import MagicMock
+
+from threatresponse.api.entity import EntityAPI
+from threatresponse.exceptions import ResponseTypeError
+
+from .assertions import *
+
+
+def streamed_request(document):
+    data = json.dumps(document).encode()
+
+    response = MagicMock()
+    response.iter_content.return_value = [data[:5], data[5:]]
+    request = MagicMock()
+    request.perform.return_value = response
+
+    return request, response
+
+
+def test_stream_response_type_iterates_over_top_level_array():
+    request, response = streamed_request([{'id': '1'}, {'id': '2'}])
+
+    items = EntityAPI(request, '/x').get(response_type='stream')
+
+    assert list(items) == [{'id': '1'}, {'id': '2'}]
+    request.perform.assert_called_once_with('GET', '/x', stream=True)
+    response.raise_for_status.assert_called_once_with()
+    response.json.assert_not_called()
+    response.close.assert_called_once_with()
+
+
+def test_stream_response_type_iterates_over_stream_path():
+    request, response = streamed_request({'data': [1, 2, 3], 'errors': []})
+
+    items = EntityAPI(request, '/x').post(payload, response_type='stream',
+                                          stream_path='data[*]')
+
+    assert next(items) == 1
+    items.close()
+
+    # The connection is released even if the iteration stops early.
+    response.close.assert_called_once_with()
+
+
+def test_unsupported_response_type_fails():
+    with raises(ResponseTypeError):
+        EntityAPI(MagicMock(), '/x').get(response_type='xml')
@@ -0,0 +1,136 @@
+import io
+import json
+
+from mock import MagicMock
+
+from threatresponse.api.bundle import BundleAPI
+from threatresponse.exceptions import ResponseTypeError
+
+from .assertions import *
+
+BUNDLE = {
+    'type': 'bundle',
+    'source': 'source',
+    'sightings': [{'type': 'sighting', 'id': str(index)}
+                  for index in range(3)],
+    'vulnerabilities': [{'type': 'vulnerability', 'id': 'v'}],
+}
+
+
+def test_export_get_succeeds():
+    request = invoke(BundleAPI, lambda api: api.export.get(params=payload))
+    request.perform.assert_called_once_with(
+        'GET',
+        '/ctia/bundle/export',
+        params=payload
+    )
+
+
+def test_import_post_succeeds():
+    request = invoke(BundleAPI, lambda api: api.import_.post(payload))
+    request.perform.assert_called_once_with(
+        'POST',
+        '/ctia/bundle/import',
+        json=payload
+    )
+
+
+def test_export_post_jsonl_streams_entities_into_sink():
+    data = json.dumps(BUNDLE).encode()
+
+    response = MagicMock()
+    response.iter_content.return_value = [data[:10], data[10:]]
+    request = MagicMock()
+    request.perform.return_value = response
+
+    sink = io.StringIO()
+    exported = BundleAPI(request).export.post_jsonl(payload, sink)
+
+    request.perform.assert_called_once_with(
+        'POST',
+        '/ctia/bundle/export',
+        json=payload,
+        stream=True
+    )
+    response.close.assert_called_once_with()
+    assert exported == 4
+    assert [json.loads(line) for line in sink.getvalue().splitlines()] == (
+        BUNDLE['sightings'] + BUNDLE['vulnerabilities']
+    )
+
+
+def test_export_get_jsonl_does_not_accept_response_type():
+    with raises(ResponseTypeError):
+        BundleAPI(MagicMock()).export.get_jsonl(io.StringIO(),
+                                                response_type='json')
+
+
+def test_import_post_jsonl_posts_bounded_bundles():
+    lines = io.StringIO(u''.join(
+        json.dumps(entity) + '\n'
+        for entity in BUNDLE['sightings'] + BUNDLE['vulnerabilities']
+    ) + u'\n')
+
+    request = MagicMock()
+    request.perform.return_value.json.return_value = {'results': []}
+
+    responses = BundleAPI(request).import_.post_jsonl(
+        lines, bundle={'source': 'source'}, max_entities=3
+    )
+
+    assert responses == [{'results': []}, {'results': []}]
+    assert [call[1]['json'] for call in request.perform.call_args_list] == [
+        {'type': 'bundle', 'source': 'source',
+         'sightings': BUNDLE['sightings']},
+        {'type': 'bundle', 'source': 'source',
+         'vulnerabilities': BUNDLE['vulnerabilities']},
+    ]
+
+
+def test_import_post_jsonl_bounds_bundles_by_size():
+    entities = [{'type': 'judgement', 'reason': 'x' * 100}
+                for _ in range(5)]
+
+    request = MagicMock()
+
+    BundleAPI(request).import_.post_jsonl(iter(entities), max_bytes=300)
+
+    assert [len(call[1]['json']['judgements'])
+            for call in request.perform.call_args_list] == [2, 2, 1]
+
+
+def test_bundle_round_trips_through_jsonl():
+    bundle = {
+        'type': 'bundle',
+        'source': 'source',
+        'external_ids': ['x'],
+        'external_references': [{'source_name': 'x', 'url': 'https://x'}],
+        'judgements': [{'type': 'judgement', 'id': 'j1'}],
+        'judgement_refs': ['https://x/j1'],
+        'weaknesses': [{'type': 'weakness', 'id': 'w1'}],
+    }
+    data = json.dumps(bundle).encode()
+
+    response = MagicMock()
+    response.iter_content.return_value = [data]
+    request = MagicMock()
+    request.perform.return_value = response
+
+    sink = io.StringIO()
+
+    assert BundleAPI(request).export.get_jsonl(sink) == 2
+
+    request = MagicMock()
+    sink.seek(0)
+    responses = BundleAPI(request).import_.post_jsonl(
+        sink, bundle={'source': 'source'}
+    )
+
+    assert len(responses) == 1
+    request.perform.assert_called_once_with(
+        'POST',
+        '/ctia/bundle/import',
+        json={'type': 'bundle', 'source': 'source',
+              'judgements': bundle['judgements'],
+              'weaknesses': bundle['weaknesses']}
+    )
@@ -1,6 +1,7 @@
 from threatresponse.api import CommandsAPI
 from threatresponse.api.commands import build_array_for_targets, \
     build_array_for_verdicts
+from threatresponse.verdicts import VerdictCache
 
 from .assertions import *
 
@@ -159,3 +160,79 @@ def test_build_array_for_targets():
          'type': 'email'}], 'module': 'module',
          'module_instance_id': 'module_instance_id',
          'module_type_id': 'module_type_id'}]
+
+
+def test_command_verdict_many_keeps_errors_separate():
+    responses = {
+        'good': {'data': []},
+        'bad': Exception('Oops!'),
+    }
+
+    def perform(method, url, **kwargs):
+        response = MagicMock()
+        if url == '/iroh/iroh-inspect/inspect':
+            response.json.return_value = kwargs['json']['content']
+        else:
+            outcome = responses[kwargs['json']]
+            if isinstance(outcome, Exception):
+                response.raise_for_status.side_effect = outcome
+            else:
+                response.json.return_value = outcome
+        return response
+
+    request = MagicMock()
+    request.perform.side_effect = perform
+
+    results = list(
+        CommandsAPI(request).verdict_many(['good', 'bad'], max_workers=2)
+    )
+    results = dict((result['payload'], result) for result in results)
+
+    assert results['good']['result'] == {'response': {'data': []},
+                                         'verdicts': []}
+    assert results['good']['error'] is None
+
+    assert results['bad']['result'] is None
+    assert str(results['bad']['error']) == 'Oops!'
+
+
+def test_command_targets_many_succeeds():
+    request = MagicMock()
+    request.perform.return_value.json.return_value = {'data': []}
+
+    results = list(CommandsAPI(request).targets_many(['a', 'b', 'c']))
+
+    assert sorted(result['payload'] for result in results) == ['a', 'b', 'c']
+    assert all(
+        result['result'] == {'response': {'data': []}, 'targets': []}
+        for result in results
+    )
+    assert request.perform.call_count == 6
+
+
+def test_command_verdict_with_verdict_cache_skips_cached_observables():
+    observables = [{'type': 'domain', 'value': 'cisco.com'}]
+    deliberated = {'data': [{
+        'module': 'module',
+        'module_instance_id': 'module_instance_id',
+        'module_type_id': 'module_type_id',
+        'data': {'verdicts': {'count': 1, 'docs': [{
+            'observable': observables[0],
+            'disposition': 1,
+            'valid_time': {'end_time': '2525-01-01T00:00:00.000Z'},
+        }]}},
+    }]}
+
+    request, response = MagicMock(), MagicMock()
+    request.perform.return_value = response
+    response.json.side_effect = [observables, deliberated, observables]
+
+    api = CommandsAPI(request, verdict_cache=VerdictCache())
+
+    first = api.verdict('cisco.com')
+    second = api.verdict('cisco.com')
+
+    # The second command only inspects the payload.
+    assert request.perform.call_count == 3
+    assert second == first
+    assert second['verdicts'][0]['disposition_name'] == 'Clean'
@@ -1,4 +1,7 @@
 from threatresponse.api import EnrichAPI
+from threatresponse.api.enrich import merged_responses
+from threatresponse.exceptions import ResponseTypeError
+from threatresponse.verdicts import VerdictCache
 
 from .assertions import *
 
@@ -256,3 +259,143 @@ def test_settings_fails():
         'GET',
         '/iroh/iroh-enrich/settings'
     )
+
+
+def test_observe_observables_with_chunk_size_merges_responses():
+    observables = [{'type': 'domain', 'value': str(index)}
+                   for index in range(5)]
+
+    def perform(method, url, **kwargs):
+        chunk = kwargs['json']
+        response = MagicMock()
+        response.json.return_value = {'data': [
+            {
+                'module': 'module',
+                'module_instance_id': 'module_instance_id',
+                'module_type_id': 'module_type_id',
+                'data': {'sightings': {
+                    'count': len(chunk),
+                    'docs': [{'observables': [observable]}
+                             for observable in chunk],
+                }},
+            },
+        ]}
+        return response
+
+    request = MagicMock()
+    request.perform.side_effect = perform
+
+    response = EnrichAPI(request).observe.observables(
+        observables, chunk_size=2, max_workers=3
+    )
+
+    assert request.perform.call_count == 3
+    assert response == {'data': [
+        {
+            'module': 'module',
+            'module_instance_id': 'module_instance_id',
+            'module_type_id': 'module_type_id',
+            'data': {'sightings': {
+                'count': 5,
+                'docs': [{'observables': [observable]}
+                         for observable in observables],
+            }},
+        },
+    ]}
+
+
+def test_observables_with_chunk_size_fail_if_any_chunk_fails():
+    request = invoke_with_failure(
+        EnrichAPI,
+        lambda api: api.deliberate.observables([1], chunk_size=1)
+    )
+    request.perform.assert_called_once_with(
+        'POST',
+        '/iroh/iroh-enrich/deliberate/observables',
+        json=[1]
+    )
+
+
+def test_observables_with_chunk_size_require_json_response_type():
+    with raises(ResponseTypeError):
+        EnrichAPI(MagicMock()).refer.observables(
+            [1, 2], chunk_size=1, response_type='raw'
+        )
+
+
+def test_merged_responses():
+    def module(instance_id, **data):
+        return {'module': 'module', 'module_type_id': 'module_type_id',
+                'module_instance_id': instance_id, 'data': data}
+
+    def docs(*docs):
+        return {'count': len(docs), 'docs': list(docs)}
+
+    def link(instance_id, id_):
+        return {'module_instance_id': instance_id, 'id': id_}
+
+    first = {'data': [module('a', verdicts=docs(1), judgements=docs(1, 2)),
+                      module('b', verdicts=docs(3))],
+             'errors': ['x']}
+    second = {'data': [module('b', verdicts=docs(4)),
+                       module('c', sightings=docs(5)),
+                       module('a', verdicts=docs(6))],
+              'errors': ['y']}
+
+    assert merged_responses([first, second]) == {
+        'data': [module('a', verdicts=docs(1, 6), judgements=docs(1, 2)),
+                 module('b', verdicts=docs(3, 4)),
+                 module('c', sightings=docs(5))],
+        'errors': ['x', 'y'],
+    }
+    # The original responses must stay untouched.
+    assert first['data'][0] == module('a', verdicts=docs(1),
+                                      judgements=docs(1, 2))
+
+    assert merged_responses([
+        {'data': [link('a', 1), link('b', 2)]},
+        {'data': [link('b', 3), link('a', 1), link('a', 4)]},
+    ]) == {
+        'data': [link('a', 1), link('a', 4), link('b', 2), link('b', 3)],
+    }
+
+
+def test_deliberate_observables_with_verdict_cache_posts_misses_only():
+    def verdict(value):
+        return {'observable': {'type': 'ip', 'value': value},
+                'disposition': 2,
+                'valid_time': {'end_time': '2525-01-01T00:00:00.000Z'}}
+
+    def perform(method, url, **kwargs):
+        response = MagicMock()
+        response.json.return_value = {'data': [{
+            'module': 'module',
+            'module_instance_id': 'module_instance_id',
+            'module_type_id': 'module_type_id',
+            'data': {'verdicts': {
+                'count': len(kwargs['json']),
+                'docs': [verdict(observable['value'])
+                         for observable in kwargs['json']],
+            }},
+        }]}
+        return response
+
+    request = MagicMock()
+    request.perform.side_effect = perform
+
+    api = EnrichAPI(request, verdict_cache=VerdictCache())
+
+    api.deliberate.observables([{'type': 'ip', 'value': '1'}])
+    response = api.deliberate.observables([{'type': 'ip', 'value': '1'},
+                                           {'type': 'ip', 'value': '2'}])
+
+    assert request.perform.call_args_list[1][1] == {
+        'json': [{'type': 'ip', 'value': '2'}]
+    }
+    assert response['data'][0]['data']['verdicts'] == {
+        'count': 2, 'docs': [verdict('1'), verdict('2')]
+    }
+
+    api.deliberate.observables([{'type': 'ip', 'value': '2'}])
+
+    assert request.perform.call_count == 2
@@ -0,0 +1,153 @@
+import io
+import json
+import re
+import threading
+from datetime import datetime, timedelta
+
+from mock import MagicMock
+from pytest import raises
+from six.moves import queue
+
+from threatresponse.api.entity import IntelEntityAPI
+from threatresponse.api.export import _balanced, _slices
+
+START = datetime(2020, 1, 1)
+END = datetime(2020, 1, 2)
+RANGE = re.compile(r'timestamp:\["(.+?)" TO "(.+?)"\}')
+
+
+def sightings():
+    # Most of the sightings are in the very last hour of the day.
+    timestamps = [START + timedelta(hours=hour) for hour in range(23)]
+    timestamps += [START + timedelta(hours=23, seconds=second)
+                   for second in range(0, 3600, 60)]
+
+    return [
+        {'id': str(index),
+         'timestamp': timestamp.strftime('%Y-%m-%dT%H:%M:%S.000Z')}
+        for index, timestamp in enumerate(timestamps)
+    ]
+
+
+def search_request(entities):
+    """ Serves search and count requests filtering entities by the range
+    of timestamps within the query. """
+
+    lock = threading.Lock()
+    windows = []
+
+    def matching(query):
+        since, until = RANGE.search(query).groups()
+        return [entity for entity in entities
+                if since <= entity['timestamp'] < until]
+
+    def perform(method, url, **kwargs):
+        params = kwargs['params']
+        found = matching(params['query'])
+
+        response = MagicMock()
+        response.headers = {}
+
+        if url.endswith('/count'):
+            response.json.return_value = len(found)
+            return response
+
+        if 'offset' not in params:
+            with lock:
+                windows.append(RANGE.search(params['query']).groups())
+
+        offset = int(params.get('offset', 0))
+        response.json.return_value = found[offset:offset + params['limit']]
+        return response
+
+    request = MagicMock()
+    request.perform.side_effect = perform
+    request.windows = windows
+
+    return request
+
+
+def test_export_streams_all_entities_into_callable_sink():
+    entities = sightings()
+    request = search_request(entities)
+    exported = []
+
+    count = IntelEntityAPI(request, '/ctia/sighting').search.export(
+        exported.append, START, END, shards=4, page_size=10
+    )
+
+    assert count == len(entities)
+    assert sorted(exported, key=lambda entity: int(entity['id'])) == entities
+    assert len(request.windows) == 4
+    # The last hour is so dense that it gets split between several shards.
+    assert sum(since >= '2020-01-01T18' for since, _ in request.windows) > 1
+
+
+def test_export_writes_json_lines_into_file_sink():
+    entities = sightings()[:10]
+    sink = io.StringIO()
+
+    IntelEntityAPI(search_request(entities), '/ctia/sighting').search.export(
+        sink, START, END, shards=2
+    )
+
+    lines = sink.getvalue().splitlines()
+
+    assert sorted(map(json.loads, lines),
+                  key=lambda entity: int(entity['id'])) == entities
+
+
+def test_export_puts_entities_into_queue_sink():
+    entities = sightings()[:10]
+    sink = queue.Queue()
+
+    IntelEntityAPI(search_request(entities), '/ctia/sighting').search.export(
+        sink, START, END, shards=3, max_workers=2
+    )
+
+    assert sink.qsize() == len(entities)
+
+
+def test_export_passes_params_to_every_request():
+    entities = sightings()[:10]
+    request = search_request(entities)
+    exported = []
+
+    IntelEntityAPI(request, '/ctia/sighting').search.export(
+        exported.append, START, END, shards=2,
+        params={'query': 'ignored', 'source': 'nightly'}
+    )
+
+    assert len(exported) == len(entities)
+    for call in request.perform.call_args_list:
+        params = call[1]['params']
+        assert params['source'] == 'nightly'
+        assert RANGE.search(params['query'])
+
+
+def test_export_fails_if_any_shard_fails():
+    request = search_request(sightings())
+    perform = request.perform.side_effect
+
+    def failing(method, url, **kwargs):
+        last = '"2020-01-02T00:00:00.000Z"}' in kwargs['params']['query']
+        if last and not url.endswith('/count'):
+            raise RuntimeError('Oops!')
+        return perform(method, url, **kwargs)
+
+    request.perform.side_effect = failing
+
+    with raises(RuntimeError):
+        IntelEntityAPI(request, '/ctia/sighting').search.export(
+            lambda entity: None, START, END, shards=4
+        )
+
+
+def test_balanced_shards_cover_whole_window():
+    slices = _slices(0, 100, 10)
+    counts = dict((window, 10 if window[0] >= 80 else 0)
+                  for window in slices)
+
+    assert slices[0] == (0, 10) and slices[-1] == (90, 100)
+    assert _balanced(slices, counts, 2) == [(0, 90), (90, 100)]
+    assert _balanced(slices, dict.fromkeys(slices, 0), 2) == [(0, 100)]
@@ -1,6 +1,8 @@
+import threading
 from functools import partial
 
 from threatresponse.api.entity import IntelEntityAPI
+from threatresponse.exceptions import ResponseTypeError
 
 from .assertions import *
 
@@ -75,3 +77,85 @@ def test_search_with_query_succeeds():
         '/x/search',
         params=params
     )
+
+
+def page(entities, headers=None):
+    response = MagicMock()
+    response.json.return_value = entities
+    response.headers = headers or {}
+    return response
+
+
+def test_search_iter_follows_x_next_header():
+    request = MagicMock()
+    request.perform.side_effect = [
+        page([1, 2], {'X-Next': 'limit=2&offset=2&search_after=s1'}),
+        page([3, 4], {'X-Next': 'limit=2&offset=4&search_after=s2'}),
+        page([5]),
+    ]
+
+    api = IntelEntityAPI(request, '/x')
+    entities = list(api.search.iter(query='type:ip', page_size=2,
+                                    fields=['id', 'timestamp']))
+
+    assert entities == [1, 2, 3, 4, 5]
+    assert [call[1]['params'] for call in request.perform.call_args_list] == [
+        {'query': 'type:ip', 'limit': 2, 'fields': ['id', 'timestamp']},
+        {'query': 'type:ip', 'limit': '2', 'offset': '2',
+         'search_after': 's1', 'fields': ['id', 'timestamp']},
+        {'query': 'type:ip', 'limit': '2', 'offset': '4',
+         'search_after': 's2', 'fields': ['id', 'timestamp']},
+    ]
+
+
+def test_search_iter_falls_back_to_offset():
+    request = MagicMock()
+    request.perform.side_effect = [page([1, 2]), page([3, 4]), page([])]
+
+    api = IntelEntityAPI(request, '/x')
+    entities = list(api.search.iter(page_size=2, prefetch=False))
+
+    assert entities == [1, 2, 3, 4]
+    assert [call[1]['params'] for call in request.perform.call_args_list] == [
+        {'query': '*', 'limit': 2},
+        {'query': '*', 'limit': 2, 'offset': 2},
+        {'query': '*', 'limit': 2, 'offset': 4},
+    ]
+
+
+def test_search_iter_prefetches_next_page():
+    fetched = threading.Event()
+
+    def perform(method, url, **kwargs):
+        if kwargs['params'].get('offset'):
+            fetched.set()
+            return page([3])
+        return page([1, 2])
+
+    request = MagicMock()
+    request.perform.side_effect = perform
+
+    api = IntelEntityAPI(request, '/x')
+    entities = api.search.iter(page_size=2)
+
+    assert next(entities) == 1
+    # The first page is still being processed, but the next one is fetched.
+    assert fetched.wait(timeout=5)
+    assert list(entities) == [2, 3]
+
+
+def test_search_iter_fails_on_failed_page():
+    request = invoke_with_failure(
+        intel_entity_api('/x'),
+        lambda api: api.search.iter()
+    )
+    request.perform.assert_called_once_with(
+        'GET',
+        '/x/search',
+        params={'query': '*', 'limit': 100}
+    )
+
+
+def test_search_iter_does_not_accept_response_type():
+    with raises(ResponseTypeError):
+        IntelEntityAPI(MagicMock(), '/x').search.iter(response_type='json')
@@ -0,0 +1,4 @@
+import sys
+
+# The asynchronous client relies on the Python 3.5+ `async`/`await` syntax.
+collect_ignore = ['aio'] if sys.version_info < (3, 5) else []
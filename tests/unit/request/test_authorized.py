@@ -1,10 +1,17 @@
-from mock import MagicMock
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+from mock import MagicMock, patch
 from six.moves.http_client import UNAUTHORIZED
 
 from threatresponse.request.authorized import (
     ClientAuthorizedRequest,
     TokenAuthorizedRequest
 )
+from threatresponse.tokens import MemoryTokenCache
 
 
 def test_that_client_authorized_request_provides_header_with_token():
@@ -92,10 +99,229 @@ def test_that_authorized_request_retrieves_token_on_expiration_and_retries():
     assert (
         request.perform.call_args_list[0] == request.perform.call_args_list[1]
     )
+    # The connection of the rejected response has been released.
+    response.close.assert_called_once_with()
 
 
-def token(bearer):
+def token(bearer, expires_in=None):
     mocked = MagicMock()
     mocked.json.return_value = {'access_token': bearer}
+    if expires_in is not None:
+        mocked.json.return_value['expires_in'] = expires_in
 
     return mocked
+
+
+def test_that_lazy_client_authorized_request_retrieves_token_once():
+    request = MagicMock()
+    request.post.return_value = token('Cake')
+
+    authorized = ClientAuthorizedRequest(request, 'x', 'y', lazy=True)
+
+    request.post.assert_not_called()
+
+    threads = [
+        threading.Thread(target=authorized.get, args=('/some',))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    request.post.assert_called_once()
+    assert request.perform.call_count == 10
+    assert all(
+        call[1]['headers'] == {'Authorization': 'Bearer Cake'}
+        for call in request.perform.call_args_list
+    )
+
+
+def test_that_lazy_token_authorized_request_checks_token_once():
+    request = MagicMock()
+
+    authorized = TokenAuthorizedRequest(request, 'test_token', lazy=True)
+
+    request.perform.assert_not_called()
+
+    authorized.post('/some')
+    authorized.post('/other')
+
+    assert [call[0] for call in request.perform.call_args_list] == [
+        ('GET', 'https://visibility.amp.cisco.com/iroh/iroh-enrich/settings'),
+        ('POST', '/some'),
+        ('POST', '/other'),
+    ]
+
+
+def test_that_authorized_request_refreshes_token_before_expiration():
+    request = MagicMock()
+    request.post.side_effect = [token('Old', expires_in=100),
+                                token('New', expires_in=100)]
+
+    authorized = ClientAuthorizedRequest(request, 'x', 'y',
+                                         refresh_margin=10)
+
+    with patch('time.time', return_value=time.time() + 50):
+        authorized.get('/some')
+
+    assert request.post.call_count == 1
+
+    with patch('time.time', return_value=time.time() + 95):
+        authorized.get('/some')
+
+    assert request.post.call_count == 2
+    # No request has been wasted on the expired token.
+    assert [call[1]['headers'] for call in request.perform.call_args_list] \
+        == [{'Authorization': 'Bearer Old'}, {'Authorization': 'Bearer New'}]
+
+
+def test_that_authorized_request_keeps_valid_token_if_refresh_fails():
+    request = MagicMock()
+    request.post.side_effect = [token('Old', expires_in=100),
+                                Exception('Unavailable.'),
+                                token('New', expires_in=100)]
+
+    authorized = ClientAuthorizedRequest(request, 'x', 'y',
+                                         refresh_margin=10)
+    now = time.time()
+
+    with patch('time.time', return_value=now + 92):
+        authorized.get('/some')
+        # Do not retry the refresh on every request meanwhile.
+        authorized.get('/some')
+
+    assert request.post.call_count == 2
+
+    with patch('time.time', return_value=now + 98):
+        authorized.get('/some')
+
+    assert request.post.call_count == 3
+    assert [call[1]['headers'] for call in request.perform.call_args_list] \
+        == [{'Authorization': 'Bearer Old'}] * 2 + \
+        [{'Authorization': 'Bearer New'}]
+
+
+def test_that_authorized_request_fails_if_expired_token_refresh_fails():
+    request = MagicMock()
+    request.post.side_effect = [token('Old', expires_in=100),
+                                Exception('Unavailable.')]
+
+    authorized = ClientAuthorizedRequest(request, 'x', 'y',
+                                         refresh_margin=10)
+
+    with patch('time.time', return_value=time.time() + 100):
+        with pytest.raises(Exception) as error:
+            authorized.get('/some')
+
+    assert str(error.value) == 'Unavailable.'
+    request.perform.assert_not_called()
+
+
+def test_that_authorized_request_refreshes_token_in_background():
+    refreshed = threading.Event()
+    tokens = iter(['First', 'Second'])
+
+    def post(*args, **kwargs):
+        bearer = next(tokens, None)
+        if bearer is None:
+            refreshed.set()
+            raise Exception('No more tokens.')
+        return token(bearer, expires_in=0.1)
+
+    request = MagicMock()
+    request.post.side_effect = post
+
+    authorized = ClientAuthorizedRequest(request, 'x', 'y',
+                                         refresh_margin=0.05,
+                                         refresh_in_background=True)
+
+    assert authorized._token == 'First'
+    assert refreshed.wait(5)
+    assert authorized._token == 'Second'
+
+
+def test_that_closed_authorized_request_stops_refreshing_token():
+    request = MagicMock()
+    request.post.return_value = token('Cake', expires_in=100)
+
+    authorized = ClientAuthorizedRequest(request, 'x', 'y',
+                                         refresh_in_background=True)
+    timer = authorized._refresh_timer
+
+    assert timer.is_alive()
+
+    authorized.close()
+    timer.join(5)
+
+    assert not timer.is_alive()
+    assert authorized._refresh_timer is None
+    assert request.post.call_count == 1
+
+
+def test_that_dropped_authorized_request_stops_refreshing_token():
+    request = MagicMock()
+    request.post.return_value = token('Cake', expires_in=0.2)
+
+    authorized = ClientAuthorizedRequest(request, 'x', 'y',
+                                         refresh_margin=0.1,
+                                         refresh_in_background=True)
+    timer = authorized._refresh_timer
+    reference = weakref.ref(authorized)
+
+    del authorized
+    gc.collect()
+
+    # The pending timer must not keep the request alive.
+    assert reference() is None
+
+    timer.join(5)
+
+    assert request.post.call_count == 1
+
+
+def test_that_authorized_requests_share_token_via_cache():
+    request = MagicMock()
+    request.post.side_effect = [token('Cake', expires_in=100),
+                                token('Pie', expires_in=100)]
+
+    cache = MemoryTokenCache()
+
+    first = ClientAuthorizedRequest(request, 'x', 'y', token_cache=cache)
+    second = ClientAuthorizedRequest(request, 'x', 'y', token_cache=cache)
+
+    assert request.post.call_count == 1
+    assert first._token == second._token == 'Cake'
+
+    # Other credentials must never get the cached token.
+    third = ClientAuthorizedRequest(request, 'x', 'z', token_cache=cache)
+
+    assert request.post.call_count == 2
+    assert third._token == 'Pie'
+
+
+def test_that_authorized_request_bypasses_cache_for_rejected_token():
+    unauthorized = MagicMock()
+    unauthorized.status_code = UNAUTHORIZED
+
+    request = MagicMock()
+    request.post.side_effect = [token('Old', expires_in=100),
+                                token('New', expires_in=100)]
+    request.perform.side_effect = [unauthorized, MagicMock()]
+
+    cache = MemoryTokenCache()
+
+    first = ClientAuthorizedRequest(request, 'x', 'y', token_cache=cache)
+    second = ClientAuthorizedRequest(request, 'x', 'y', token_cache=cache)
+
+    first.get('/some')
+
+    assert request.post.call_count == 2
+    assert first._token == 'New'
+    assert cache.get(first._token_key)[0] == 'New'
+
+    # The other request picks up the new token once the old one is rejected.
+    second._refresh_token('Old')
+
+    assert request.post.call_count == 2
+    assert second._token == 'New'
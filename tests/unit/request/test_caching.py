@@ -0,0 +1,156 @@
+from mock import MagicMock, patch
+
+from threatresponse.request.caching import CachingRequest, ResponseCache
+
+
+def response(status_code=200, headers=None):
+    mocked = MagicMock()
+    mocked.status_code = status_code
+    mocked.headers = headers or {}
+
+    return mocked
+
+
+def inner(*responses):
+    request = MagicMock()
+    request.perform.side_effect = responses
+
+    return request
+
+
+@patch('time.time', return_value=100.0)
+def test_that_caching_request_reuses_fresh_responses(time):
+    first, second = response(), response()
+    request = inner(first, second)
+
+    caching = CachingRequest(request, ResponseCache(ttl=60))
+
+    assert caching.get('/foo', params={'a': 1}) is first
+    assert caching.get('/foo', params={'a': 1}) is first
+
+    time.return_value = 161.0
+
+    assert caching.get('/foo', params={'a': 1}) is second
+    assert request.perform.call_count == 2
+
+
+@patch('time.time', return_value=100.0)
+def test_that_caching_request_keys_responses_by_params(_):
+    first, second = response(), response()
+    request = inner(first, second)
+
+    caching = CachingRequest(request, ResponseCache())
+
+    assert caching.get('/foo', params={'a': 1}) is first
+    assert caching.get('/foo', params={'a': 2}) is second
+
+
+@patch('time.time', return_value=100.0)
+def test_that_caching_request_revalidates_stale_responses(time):
+    last_modified = 'Mon, 01 Jan 2024 00:00:00 GMT'
+    cached = response(headers={'ETag': '"v1"',
+                               'Last-Modified': last_modified,
+                               'Cache-Control': 'max-age=10'})
+    request = inner(cached, response(304), response(304))
+
+    cache = ResponseCache(ttl=60)
+    caching = CachingRequest(request, cache)
+
+    caching.get('/foo')
+    time.return_value = 111.0
+    assert caching.get('/foo') is cached
+    # The revalidated response is fresh again.
+    assert caching.get('/foo') is cached
+
+    assert request.perform.call_count == 2
+    assert request.perform.call_args[1]['headers'] == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': last_modified,
+    }
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'revalidations': 1,
+                             'evictions': 0, 'entries': 1,
+                             'hit_rate': 2.0 / 3}
+
+
+def test_that_caching_request_honors_cache_control():
+    request = inner(response(headers={'Cache-Control': 'no-store'}),
+                    response(headers={'Cache-Control': 'no-store'}),
+                    response(headers={'Cache-Control': 'no-cache'}),
+                    response(headers={'Cache-Control': 'no-cache'}),
+                    response(headers={'Cache-Control': 'no-cache',
+                                      'ETag': '"v1"'}),
+                    response(304))
+
+    caching = CachingRequest(request, ResponseCache())
+
+    for url in ['/no-store', '/no-cache', '/revalidated']:
+        caching.get(url)
+        caching.get(url)
+
+    assert request.perform.call_count == 6
+    assert request.perform.call_args[1] == {
+        'headers': {'If-None-Match': '"v1"'}
+    }
+
+
+@patch('time.time', return_value=100.0)
+def test_that_caching_request_uses_route_ttls(time):
+    request = MagicMock()
+    request.perform.side_effect = lambda *args, **kwargs: response()
+
+    caching = CachingRequest(request, ResponseCache(
+        ttl=10, ttls={'/ctia/*': 30, '/ctia/verdict/*': 300}
+    ))
+
+    caching.get('https://private.intel.amp.cisco.com/ctia/verdict/ip/1')
+    caching.get('https://private.intel.amp.cisco.com/ctia/judgement/1')
+    caching.get('https://visibility.amp.cisco.com/iroh/profile/whoami')
+
+    time.return_value = 150.0
+
+    caching.get('https://private.intel.amp.cisco.com/ctia/verdict/ip/1')
+    caching.get('https://private.intel.amp.cisco.com/ctia/judgement/1')
+    caching.get('https://visibility.amp.cisco.com/iroh/profile/whoami')
+
+    assert request.perform.call_count == 5
+
+
+def test_that_caching_request_evicts_least_recently_used_responses():
+    request = MagicMock()
+    request.perform.side_effect = lambda *args, **kwargs: response()
+
+    cache = ResponseCache(max_entries=2)
+    caching = CachingRequest(request, cache)
+
+    caching.get('/a')
+    caching.get('/b')
+    caching.get('/a')
+    caching.get('/c')  # Evicts /b.
+    caching.get('/a')
+
+    assert request.perform.call_count == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_that_caching_request_skips_and_invalidates_on_other_methods():
+    request = MagicMock()
+    request.perform.side_effect = lambda *args, **kwargs: response()
+
+    caching = CachingRequest(request, ResponseCache())
+
+    caching.get('/foo')
+    caching.post('/foo', json={})
+    caching.post('/foo', json={})
+    caching.get('/foo')
+    caching.get('/foo', stream=True)
+
+    assert request.perform.call_count == 5
+
+
+def test_that_caching_request_does_not_cache_errors():
+    request = inner(response(404), response(200))
+
+    caching = CachingRequest(request, ResponseCache())
+
+    assert caching.get('/foo').status_code == 404
+    assert caching.get('/foo').status_code == 200
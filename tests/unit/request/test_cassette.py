@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from mock import patch
+
+from threatresponse.client import ThreatResponse
+from threatresponse.exceptions import CassetteError
+from threatresponse.request.cassette import (
+    Cassette,
+    RecordingRequest,
+    ReplayingRequest,
+)
+from threatresponse.request.in_memory import InMemoryRequest
+
+WHOAMI = 'https://visibility.amp.cisco.com/iroh/profile/whoami'
+
+
+def recorded(*routes):
+    cassette = Cassette()
+    request = RecordingRequest(InMemoryRequest(routes, token='SECRET'),
+                               cassette)
+    return request, cassette
+
+
+def test_that_cassette_replays_recorded_client_exchanges(tmpdir):
+    transport, cassette = recorded(
+        ('GET', '/iroh/profile/whoami', {'user': {'name': 'John'}}),
+        ('POST', '/iroh/iroh-enrich/observe/observables', {'data': []}),
+    )
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            transport=transport)
+    whoami = client.profile.whoami()
+    observed = client.enrich.observe.observables([{'type': 'ip',
+                                                   'value': '1.1.1.1'}])
+
+    path = str(tmpdir.join('cassette.jsonl.gz'))
+    cassette.save(path)
+    cassette = Cassette.load(path)
+
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            transport=ReplayingRequest(cassette))
+
+    assert len(cassette) == 3
+    assert client.profile.whoami() == whoami
+    assert client.enrich.observe.observables([{'type': 'ip',
+                                               'value': '1.1.1.1'}]) \
+        == observed
+    with pytest.raises(CassetteError):
+        client.enrich.observe.observables([{'type': 'ip',
+                                            'value': '8.8.8.8'}])
+
+
+def test_that_cassette_never_stores_credentials(tmpdir):
+    transport, cassette = recorded()
+    ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD', transport=transport)
+
+    path = str(tmpdir.join('cassette.jsonl'))
+    cassette.save(path)
+
+    with open(path) as fin:
+        text = fin.read()
+
+    assert 'SECRET' not in text
+    assert 'CLIENT_PASSWORD' not in text
+    assert json.loads(json.loads(text)['content']) == {
+        'access_token': 'REDACTED',
+        'token_type': 'bearer',
+        'expires_in': 600,
+    }
+
+
+def test_that_identical_requests_get_responses_in_recorded_order():
+    transport, cassette = recorded()
+    for name in ['first', 'second']:
+        transport._request.add('GET', '/iroh/profile/whoami', {'name': name})
+        transport.get(WHOAMI)
+
+    replaying = ReplayingRequest(cassette)
+
+    assert [replaying.get(WHOAMI).json()['name'] for _ in range(3)] == [
+        'first', 'second', 'second'
+    ]
+
+
+@patch('time.sleep')
+def test_that_replaying_request_simulates_latency_and_bandwidth(sleep):
+    transport, cassette = recorded(('GET', '/iroh/profile/whoami', b'x' * 500))
+    transport.get(WHOAMI)
+
+    ReplayingRequest(cassette, latency=0.1, bandwidth=1000).get(WHOAMI)
+
+    sleep.assert_called_once_with(0.6)
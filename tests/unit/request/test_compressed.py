@@ -0,0 +1,95 @@
+import json
+import zlib
+
+import pytest
+from mock import MagicMock
+
+from threatresponse.request.compressed import CompressedRequest
+
+
+def test_that_compressed_request_keeps_small_bodies_intact():
+    request = MagicMock()
+
+    CompressedRequest(request, threshold=100).post('/foo', data=b'spam')
+
+    request.perform.assert_called_once_with('POST', '/foo', data=b'spam')
+
+
+def test_that_compressed_request_compresses_large_bodies_with_gzip():
+    request = MagicMock()
+    request.perform.return_value.status_code = 200
+    data = b'spam' * 100
+
+    CompressedRequest(request, threshold=100).post(
+        '/foo', data=data, headers={'Accept': 'application/json'}
+    )
+
+    kwargs = request.perform.call_args[1]
+    assert kwargs['headers'] == {'Accept': 'application/json',
+                                 'Content-Encoding': 'gzip'}
+    assert len(kwargs['data']) < len(data)
+    assert zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS) == data
+
+
+def test_that_compressed_request_encodes_json_payload_first():
+    request = MagicMock()
+    request.perform.return_value.status_code = 200
+    payload = [{'type': 'ip', 'value': '127.0.0.1'}] * 50
+
+    CompressedRequest(request, threshold=100, encoding='deflate').post(
+        '/foo', json=payload
+    )
+
+    kwargs = request.perform.call_args[1]
+    assert 'json' not in kwargs
+    assert kwargs['headers'] == {'Content-Type': 'application/json',
+                                 'Content-Encoding': 'deflate'}
+    assert json.loads(zlib.decompress(kwargs['data']).decode()) == payload
+
+
+def test_that_compressed_request_passes_small_payload_down_encoded():
+    request = MagicMock()
+    codec = MagicMock(content_type='application/json')
+    codec.dumps.return_value = b'[]'
+
+    CompressedRequest(request, codec, threshold=100).post('/foo', json=[])
+
+    codec.dumps.assert_called_once_with([])
+    request.perform.assert_called_once_with(
+        'POST', '/foo', data=b'[]',
+        headers={'Content-Type': 'application/json'}
+    )
+
+
+def test_that_compressed_request_keeps_already_encoded_bodies():
+    request = MagicMock()
+    headers = {'content-encoding': 'br'}
+
+    CompressedRequest(request, threshold=1).post('/foo', data=b'spam',
+                                                  headers=headers)
+
+    request.perform.assert_called_once_with('POST', '/foo', data=b'spam',
+                                            headers=headers)
+
+
+def test_that_compressed_request_falls_back_when_unsupported():
+    rejected, accepted = MagicMock(status_code=415), MagicMock(status_code=200)
+    request = MagicMock()
+    request.perform.side_effect = [rejected, accepted, accepted]
+    compressed = CompressedRequest(request, threshold=1)
+
+    assert compressed.post('https://example.com/foo', data=b'spam') \
+        is accepted
+    compressed.post('https://example.com/bar', data=b'eggs')
+
+    rejected.close.assert_called_once_with()
+    calls = request.perform.call_args_list
+    assert 'headers' in calls[0][1]
+    # The server is remembered not to support compressed bodies.
+    assert calls[1][1] == {'data': b'spam'}
+    assert calls[2][1] == {'data': b'eggs'}
+
+
+def test_that_compressed_request_rejects_unknown_encodings():
+    with pytest.raises(ValueError):
+        CompressedRequest(MagicMock(), encoding='br')
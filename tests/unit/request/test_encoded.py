@@ -0,0 +1,49 @@
+from mock import MagicMock
+
+from threatresponse.codec import StandardCodec
+from threatresponse.request.encoded import EncodedRequest
+from threatresponse.request.response import Response, build_response
+
+
+def test_that_encoded_request_encodes_json_payload():
+    request = MagicMock()
+
+    EncodedRequest(request, StandardCodec()).post(
+        '/foo', json={'spam': 'eggs'}, headers={'Accept': 'application/json'}
+    )
+
+    request.perform.assert_called_once_with(
+        'POST', '/foo',
+        data=b'{"spam": "eggs"}',
+        headers={'Accept': 'application/json',
+                 'Content-Type': 'application/json'}
+    )
+
+
+def test_that_encoded_request_keeps_explicit_data_and_content_type():
+    request = MagicMock()
+    encoded = EncodedRequest(request, StandardCodec())
+
+    encoded.post('/foo', data='spam=eggs')
+    encoded.post('/bar', json=[], headers={'content-type': 'text/json'})
+
+    assert request.perform.call_args_list[0][1] == {'data': 'spam=eggs'}
+    assert request.perform.call_args_list[1][1] == {
+        'data': b'[]', 'headers': {'content-type': 'text/json'}
+    }
+
+
+def test_that_encoded_request_decodes_responses_with_codec():
+    codec = MagicMock()
+    codec.loads.return_value = {'decoded': True}
+
+    request = MagicMock()
+    request.perform.return_value = Response(
+        build_response('GET', 'https://example.com/foo', 200, {},
+                       b'{"decoded": false}')
+    )
+
+    response = EncodedRequest(request, codec).get('/foo')
+
+    assert response.json() == {'decoded': True}
+    codec.loads.assert_called_once_with(b'{"decoded": false}')
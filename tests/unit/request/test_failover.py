@@ -0,0 +1,128 @@
+from collections import OrderedDict
+
+import pytest
+import requests
+from mock import MagicMock, patch
+
+from threatresponse.request.failover import FailoverRequest, RegionHealth
+
+
+def test_region_health_ranks_regions_by_latency_and_errors():
+    health = RegionHealth(cooldown=30)
+
+    health.record('us', 0.3)
+    health.record('eu', 0.1)
+    health.record('eu', 0.1)
+
+    # Regions not measured yet go after the measured ones.
+    assert health.ranked(['us', 'eu', 'apjc']) == ['eu', 'us', 'apjc']
+    assert health.ranked(['apjc', 'us', 'eu']) == ['apjc', 'eu', 'us']
+
+    health.record('apjc', 0.05, failed=True)
+
+    assert health.ranked(['us', 'eu', 'apjc']) == ['eu', 'us', 'apjc']
+    assert health.stats()['eu'] == {'latency': 0.1,
+                                    'error_rate': 0.0,
+                                    'requests': 2}
+
+
+def test_region_health_prefers_healthy_primary_to_regions_not_measured():
+    health = RegionHealth()
+
+    assert health.ranked(['eu', 'us', 'apjc']) == ['eu', 'us', 'apjc']
+
+    health.record('eu', 0.5)
+
+    assert health.ranked(['eu', 'us', 'apjc']) == ['eu', 'us', 'apjc']
+
+    health.record('eu', 0.5, failed=True)
+
+    assert health.ranked(['eu', 'us', 'apjc']) == ['us', 'apjc', 'eu']
+
+
+def test_region_health_restores_failed_regions_after_cooldown():
+    health = RegionHealth(cooldown=30)
+
+    with patch('time.time', return_value=1000):
+        health.record('us', 0.01, failed=True)
+        health.record('eu', 0.5)
+
+        assert health.ranked(['us', 'eu']) == ['eu', 'us']
+
+    with patch('time.time', return_value=1031):
+        assert health.ranked(['us', 'eu']) == ['us', 'eu']
+
+
+def response(status_code):
+    return MagicMock(status_code=status_code)
+
+
+def regional(result):
+    request = MagicMock()
+    if isinstance(result, Exception):
+        request.perform.side_effect = result
+    else:
+        request.perform.return_value = result
+    return request
+
+
+def test_failover_request_fails_over_on_errors_and_server_errors():
+    failed = response(503)
+    ok = response(200)
+    us = regional(requests.ConnectTimeout())
+    eu = regional(failed)
+    apjc = regional(ok)
+    health = RegionHealth()
+
+    request = FailoverRequest(
+        OrderedDict([('us', us), ('eu', eu), ('apjc', apjc)]), health
+    )
+
+    assert request.get('/ctia/sighting', params={'a': 1}) is ok
+    for region in [us, eu, apjc]:
+        region.perform.assert_called_once_with('GET', '/ctia/sighting',
+                                               params={'a': 1})
+    failed.close.assert_called_once_with()
+    assert health.stats()['us']['error_rate'] == 1
+    assert health.stats()['apjc']['error_rate'] == 0
+
+    # The healthy region goes first from now on.
+    assert request.get('/ctia/sighting') is ok
+    assert apjc.perform.call_count == 2
+    assert us.perform.call_count == 1
+
+
+def test_failover_request_gives_up_in_last_region():
+    failed = response(500)
+    request = FailoverRequest(
+        OrderedDict([('us', regional(requests.ConnectionError())),
+                     ('eu', regional(failed))]),
+        RegionHealth()
+    )
+    assert request.get('/ctia/sighting') is failed
+
+    request = FailoverRequest(
+        OrderedDict([('us', regional(response(502))),
+                     ('eu', regional(requests.ConnectionError()))]),
+        RegionHealth()
+    )
+    with pytest.raises(requests.ConnectionError):
+        request.get('/ctia/sighting')
+
+
+def test_failover_request_fails_over_only_allowed_methods():
+    us = regional(requests.ConnectionError())
+    eu = regional(response(200))
+
+    request = FailoverRequest(OrderedDict([('us', us), ('eu', eu)]),
+                              RegionHealth())
+
+    # May have taken effect in the preferred region despite failing.
+    with pytest.raises(requests.ConnectionError):
+        request.post('/ctia/sighting', json={})
+    eu.perform.assert_not_called()
+
+    request = FailoverRequest(OrderedDict([('us', us), ('eu', eu)]),
+                              RegionHealth(), methods=['post'])
+
+    assert request.post('/ctia/sighting', json={}).status_code == 200
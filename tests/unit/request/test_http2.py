@@ -0,0 +1,112 @@
+import json
+import ssl
+
+import pytest
+import requests
+
+from threatresponse.exceptions import TransportError
+from threatresponse.request.http2 import HTTP2Request, tls
+from threatresponse.request.response import Response
+
+httpx = pytest.importorskip('httpx')
+
+
+def mocked(handler):
+    # Serve requests by the handler rather than over the network.
+    request = HTTP2Request()
+    request._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return request
+
+
+def test_that_http2_request_converts_arguments_and_response():
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(201, json={'spam': 'eggs'})
+
+    response = mocked(handler).post(
+        'https://example.com/foo',
+        params={'limit': 10, 'offset': None, 'fields': ['a', 'b'],
+                'flag': True},
+        data=b'{"foo": "bar"}',
+        headers={'Content-Type': 'application/json'},
+        auth=('user', 'password'),
+        timeout=(1, 2),
+    )
+
+    assert isinstance(response, Response)
+    assert response.status_code == 201
+    assert response.reason == 'Created'
+    assert response.json() == {'spam': 'eggs'}
+
+    request = sent[0]
+    assert request.url.query == b'limit=10&fields=a&fields=b&flag=True'
+    assert request.content == b'{"foo": "bar"}'
+    assert request.headers['Content-Type'] == 'application/json'
+    assert request.headers['Authorization'].startswith('Basic ')
+    assert request.extensions['timeout']['connect'] == 1
+    assert request.extensions['timeout']['read'] == 2
+
+
+def test_that_http2_request_streams_body_lazily():
+    items = [{'id': index} for index in range(100)]
+
+    def handler(request):
+        return httpx.Response(200, content=json.dumps(items).encode())
+
+    response = mocked(handler).get('https://example.com/foo', stream=True)
+
+    body = b''.join(response.iter_content(chunk_size=16))
+
+    assert json.loads(body.decode()) == items
+    response.close()
+
+
+def test_that_http2_request_raises_requests_errors():
+    def handler(request):
+        raise httpx.ConnectError('Connection refused', request=request)
+
+    with pytest.raises(requests.ConnectionError):
+        mocked(handler).get('https://example.com/foo')
+
+
+def test_that_http2_request_configures_connection_pool():
+    request = HTTP2Request(pool_maxsize=4, keep_alive=False)
+
+    pool = request._client._transport._pool
+
+    assert pool._http2 is True
+    assert pool._max_connections == 4
+    assert pool._max_keepalive_connections == 0
+
+
+def test_that_http2_request_applies_verify_and_cert_per_pool():
+    request = HTTP2Request()
+
+    def pool(**kwargs):
+        client = request._client_for(*tls(kwargs))
+        return client._transport._pool
+
+    assert pool() is pool(verify=True) is request._client._transport._pool
+
+    unverified = pool(verify=False)
+
+    assert unverified is pool(verify=False)
+    assert unverified is not pool()
+    assert unverified._ssl_context.verify_mode == ssl.CERT_NONE
+    request.close()
+
+
+def test_that_http2_request_rejects_unsupported_arguments():
+    request = mocked(lambda request: httpx.Response(200))
+
+    assert request.get('https://example.com/foo', proxies=None,
+                       verify=True).status_code == 200
+
+    with pytest.raises(TransportError):
+        request.get('https://example.com/foo',
+                    proxies={'https': 'http://proxy'})
+    with pytest.raises(TransportError):
+        request.get('https://example.com/foo',
+                    hooks={'response': lambda response: None})
@@ -0,0 +1,49 @@
+from threatresponse.request.in_memory import InMemoryRequest
+from threatresponse.request.response import Response
+
+
+def test_that_in_memory_request_serves_canned_responses():
+    request = InMemoryRequest([
+        ('GET', '/iroh/profile/whoami', {'user': {'name': 'John'}}),
+        ('*', '/ctia/*/search', [], 206, {'X-Total-Hits': '0'}),
+    ])
+
+    whoami = request.get('https://visibility.amp.cisco.com'
+                         '/iroh/profile/whoami')
+    search = request.post('https://private.intel.amp.cisco.com'
+                          '/ctia/sighting/search', json={})
+
+    assert isinstance(whoami, Response)
+    assert whoami.json() == {'user': {'name': 'John'}}
+    assert whoami.headers['Content-Type'] == 'application/json'
+    assert search.status_code == 206
+    assert search.headers['X-Total-Hits'] == '0'
+    assert request.performed == 2
+
+
+def test_that_in_memory_request_serves_tokens_by_default():
+    response = InMemoryRequest(token='TOKEN').post(
+        'https://visibility.amp.cisco.com/iroh/oauth2/token'
+    )
+
+    assert response.json()['access_token'] == 'TOKEN'
+
+
+def test_that_in_memory_request_prefers_recent_routes_and_handlers():
+    request = InMemoryRequest([('GET', '/foo', b'old')])
+    request.add('GET', '/foo', lambda method, url, **kwargs: (
+        method, url, kwargs
+    ))
+
+    assert request.get('https://example.com/foo', params={'a': 1}) == (
+        'GET', 'https://example.com/foo', {'params': {'a': 1}}
+    )
+
+
+def test_that_in_memory_request_responds_not_found_to_unknown_routes():
+    response = InMemoryRequest(token=None).post(
+        'https://visibility.amp.cisco.com/iroh/oauth2/token'
+    )
+
+    assert response.status_code == 404
+    assert not response.ok
@@ -7,3 +7,11 @@ def test_that_proxied_request_properly_configures_session_proxies():
 
     assert request._proxy == proxy
     assert request._session.proxies == {'http': proxy, 'https': proxy}
+
+
+def test_that_proxied_request_supports_connection_pool_options():
+    request = ProxiedRequest(proxy='proxy://1.2.3.4:5', pool_maxsize=64)
+
+    adapter = request._session.get_adapter('https://example.com')
+
+    assert adapter._pool_maxsize == 64
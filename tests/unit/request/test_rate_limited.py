@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+from mock import MagicMock, patch
+
+from threatresponse.exceptions import RateLimitError
+from threatresponse.request.rate_limited import RateLimitedRequest, TokenBucket
+
+
+@patch('time.time', return_value=100.0)
+def test_that_token_bucket_allows_bursts_and_refills(time):
+    bucket = TokenBucket(rate=2, burst=3)
+
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+
+    time.return_value = 100.5
+
+    assert bucket.take() is True
+    assert bucket.take() is False
+
+
+@patch('time.time', return_value=100.0)
+def test_that_token_bucket_reserves_tokens_in_advance(_):
+    bucket = TokenBucket(rate=4)
+
+    delays = [bucket.reserve() for _ in range(6)]
+
+    assert delays == [0, 0, 0, 0, 0.25, 0.5]
+
+
+@patch('time.sleep')
+@patch('time.time', return_value=100.0)
+def test_that_rate_limited_request_waits_for_the_bucket(_, sleep):
+    request = MagicMock()
+
+    limited = RateLimitedRequest(request, TokenBucket(rate=1))
+    limited.get('/foo')
+    limited.get('/bar')
+
+    sleep.assert_called_once_with(1.0)
+    assert request.perform.call_count == 2
+
+
+@patch('time.time', return_value=100.0)
+def test_that_non_blocking_rate_limited_request_fails_fast(_):
+    request = MagicMock()
+
+    limited = RateLimitedRequest(request, TokenBucket(rate=1), block=False)
+    limited.get('/foo')
+
+    with pytest.raises(RateLimitError) as excinfo:
+        limited.get('/bar')
+
+    assert str(excinfo.value) == 'Rate limit exceeded for GET /bar.'
+    request.perform.assert_called_once_with('GET', '/foo')
+
+
+@patch('time.time', return_value=100.0)
+def test_that_rate_limited_request_picks_bucket_by_url_prefix(_):
+    request = MagicMock()
+
+    limited = RateLimitedRequest(
+        request,
+        {'https://x.com': TokenBucket(rate=1),
+         'https://x.com/api': TokenBucket(rate=1)},
+        block=False,
+    )
+    limited.get('https://x.com/foo')
+    limited.get('https://x.com/api/foo')  # The longest prefix wins.
+    limited.get('https://y.com/foo')  # Not limited.
+    limited.get('https://y.com/foo')
+
+    with pytest.raises(RateLimitError):
+        limited.get('https://x.com/bar')
+    with pytest.raises(RateLimitError):
+        limited.get('https://x.com/api/bar')
+
+    assert request.perform.call_count == 4
+
+
+@patch('time.time', return_value=100.0)
+def test_that_token_bucket_is_thread_safe(_):
+    bucket = TokenBucket(rate=10, burst=50)
+    taken = []
+
+    def run():
+        for _ in range(25):
+            taken.append(bucket.take())
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert taken.count(True) == 50
@@ -3,7 +3,7 @@ import six
 from mock import MagicMock
 from requests import HTTPError
 
-from threatresponse.request.response import Response
+from threatresponse.request.response import Response, build_response
 
 
 def test_that_getattr_and_setattr_are_delegated():
@@ -40,3 +40,12 @@ def test_that_raise_for_status_extends_error_message():
         '    ]\n'
         '}',
     )
+
+
+def test_that_built_response_can_be_iterated_over():
+    response = build_response('GET', 'https://example.com', 200,
+                              {'Content-Type': 'application/json'},
+                              b'[1, 2, 3]')
+
+    assert b''.join(response.iter_content(chunk_size=2)) == b'[1, 2, 3]'
+    assert response.json() == [1, 2, 3]
@@ -0,0 +1,140 @@
+import pytest
+from mock import MagicMock, patch
+from requests import ConnectionError
+
+from threatresponse.request.retrying import RetryingRequest
+
+
+def response(status_code, headers=None):
+    mocked = MagicMock()
+    mocked.status_code = status_code
+    mocked.headers = headers or {}
+
+    return mocked
+
+
+def inner(*outcomes):
+    request = MagicMock()
+    request.perform.side_effect = outcomes
+
+    return request
+
+
+@patch('time.sleep')
+def test_that_retrying_request_retries_with_exponential_backoff(sleep):
+    request = inner(response(503), response(429), response(502),
+                    response(200))
+
+    retrying = RetryingRequest(request, retries=3, methods=['POST'],
+                               backoff_factor=0.5, jitter=False)
+    result = retrying.post('/foo', json={'spam': 'eggs'})
+
+    assert result.status_code == 200
+    assert request.perform.call_count == 4
+    assert all(
+        call == (('POST', '/foo'), {'json': {'spam': 'eggs'}})
+        for call in request.perform.call_args_list
+    )
+    assert [call[0][0] for call in sleep.call_args_list] == [0.5, 1.0, 2.0]
+
+
+@patch('time.sleep')
+@patch('random.uniform', side_effect=lambda low, high: high / 2)
+def test_that_retrying_request_applies_jitter_and_backoff_max(_, sleep):
+    request = inner(response(503), response(503), response(503),
+                    response(200))
+
+    retrying = RetryingRequest(request, backoff_factor=4, backoff_max=6)
+    retrying.get('/foo')
+
+    assert [call[0][0] for call in sleep.call_args_list] == [2, 3, 3]
+
+
+@patch('time.sleep')
+def test_that_retrying_request_gives_up_after_retries(sleep):
+    request = inner(response(503), response(503), response(504))
+
+    retrying = RetryingRequest(request, retries=2)
+
+    assert retrying.get('/foo').status_code == 504
+    assert request.perform.call_count == 3
+
+
+@patch('time.sleep')
+def test_that_retrying_request_does_not_retry_post_by_default(sleep):
+    request = inner(response(503), ConnectionError(), response(429),
+                    response(200))
+
+    retrying = RetryingRequest(request)
+
+    assert retrying.post('/foo').status_code == 503
+    with pytest.raises(ConnectionError):
+        retrying.post('/foo')
+    sleep.assert_not_called()
+
+    # The server has not processed the request throttled by it.
+    assert retrying.post('/foo').status_code == 200
+    assert request.perform.call_count == 4
+
+
+@patch('time.sleep')
+def test_that_retrying_request_does_not_retry_other_statuses(sleep):
+    request = inner(response(500))
+
+    retrying = RetryingRequest(request)
+
+    assert retrying.get('/foo').status_code == 500
+    sleep.assert_not_called()
+
+
+@patch('time.sleep')
+def test_that_retrying_request_applies_per_status_and_method_policies(sleep):
+    retrying = RetryingRequest(inner(response(429), response(429)),
+                               statuses={429: 1})
+    assert retrying.get('/foo').status_code == 429
+    assert sleep.call_count == 1
+
+    request = inner(response(503), response(503), response(200))
+    retrying = RetryingRequest(request, methods={'get': 5})
+    assert retrying.post('/foo').status_code == 503
+    assert retrying.get('/foo').status_code == 200
+    assert request.perform.call_count == 3
+
+
+@patch('time.sleep')
+def test_that_retrying_request_respects_retry_after(sleep):
+    request = inner(response(429, {'Retry-After': '7'}), response(200))
+
+    retrying = RetryingRequest(request, backoff_max=10)
+
+    assert retrying.get('/foo').status_code == 200
+    sleep.assert_called_once_with(7.0)
+
+    # There is no point in retrying earlier than the server asks to.
+    request = inner(response(429, {'Retry-After': '3600'}), response(200))
+
+    retrying = RetryingRequest(request, backoff_max=10)
+
+    assert retrying.get('/foo').status_code == 429
+
+
+@patch('time.sleep')
+def test_that_retrying_request_respects_budget(sleep):
+    request = inner(response(503, {'Retry-After': '2'}), response(200))
+
+    retrying = RetryingRequest(request, budget=1)
+
+    assert retrying.get('/foo').status_code == 503
+    sleep.assert_not_called()
+
+
+@patch('time.sleep')
+def test_that_retrying_request_retries_connection_errors(sleep):
+    request = inner(ConnectionError('Oops!'), response(200))
+
+    assert RetryingRequest(request).get('/foo').status_code == 200
+
+    request = inner(ConnectionError('Oops!'), ConnectionError('Again!'))
+
+    with pytest.raises(ConnectionError):
+        RetryingRequest(request, retries=1).get('/foo')
@@ -20,3 +20,24 @@ def test_that_standard_request_wraps_session_response(inner_session_request):
         headers={'Threat': 'Response'},
     )
     assert isinstance(response, Response)
+
+
+def test_that_standard_request_configures_connection_pools():
+    request = StandardRequest(pool_connections=4, pool_maxsize=64,
+                              pool_block=True, max_retries=2)
+
+    for prefix in ['https://', 'http://']:
+        adapter = request._session.get_adapter(prefix + 'example.com')
+
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+        assert adapter.max_retries.total == 2
+
+    assert request._session.headers['Connection'] == 'keep-alive'
+
+
+def test_that_standard_request_may_disable_keep_alive():
+    request = StandardRequest(keep_alive=False)
+
+    assert request._session.headers['Connection'] == 'close'
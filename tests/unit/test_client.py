@@ -9,7 +9,13 @@ from threatresponse.api import (
     IntelAPI,
 )
 from threatresponse.client import ThreatResponse
-from threatresponse.exceptions import RegionError
+from threatresponse.exceptions import (
+    RateLimitError,
+    RegionError,
+    TransportError,
+)
+from threatresponse.request.http2 import HTTP2Request
+from threatresponse.request.in_memory import InMemoryRequest
 
 
 @patch('requests.Session.request')
@@ -97,3 +103,200 @@ def auth_response(status_code):
         mocked.raise_for_status.side_effect = error
 
     return mocked
+
+
+@patch('requests.Session.request')
+def test_that_client_with_lazy_auth_does_not_request_token_on_init(
+        inner_session_request):
+    inner_session_request.return_value = auth_response(200)
+
+    client = ThreatResponse(
+        client_id='CLIENT_ID',
+        client_password='CLIENT_PASSWORD',
+        lazy_auth=True,
+    )
+
+    inner_session_request.assert_not_called()
+
+    client.profile.whoami()
+
+    assert inner_session_request.call_count == 2
+    assert inner_session_request.call_args_list[0][0] == (
+        'POST', 'https://visibility.amp.cisco.com/iroh/oauth2/token'
+    )
+
+
+@patch('requests.Session.close')
+@patch('requests.Session.request')
+def test_that_client_closes_on_exit(inner_session_request, session_close):
+    inner_session_request.return_value = auth_response(200)
+    inner_session_request.return_value.json.return_value['expires_in'] = 600
+
+    with ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                        token_refresh_in_background=True) as client:
+        timer = client._authorized._refresh_timer
+        assert timer.is_alive()
+
+    timer.join(5)
+
+    assert not timer.is_alive()
+    session_close.assert_called_once_with()
+
+
+@patch('requests.Session.request')
+def test_that_client_passes_connection_pool_options(_):
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            pool_maxsize=64, pool_block=True)
+
+    adapter = client._transport._session.get_adapter(
+        'https://visibility.amp.cisco.com'
+    )
+
+    assert adapter._pool_maxsize == 64
+    assert adapter._pool_block is True
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_that_client_retries_when_asked_to(inner_session_request, sleep):
+    throttled = auth_response(429)
+    throttled.headers = {'Retry-After': '1'}
+
+    inner_session_request.side_effect = [throttled, auth_response(200)]
+
+    ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD', retry={'retries': 1})
+
+    assert inner_session_request.call_count == 2
+    sleep.assert_called_once()
+
+
+def test_that_client_shares_rate_limits_within_families():
+    transport = InMemoryRequest(token=None)
+    transport.add('*', '*', {})
+    transport.add('POST', '/iroh/oauth2/token', {'access_token': 'TOKEN'})
+
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            transport=transport,
+                            rate_limit={'visibility': {'rate': 0.01,
+                                                       'burst': 2},
+                                        'global_intel': 0.01},
+                            rate_limit_block=False)
+
+    # The token request has already taken a token from the visibility bucket.
+    client.profile.whoami()
+    with pytest.raises(RateLimitError):
+        client.inspect.inspect({'content': '1.1.1.1'})
+
+    client.global_intel.sighting.search.get()
+    with pytest.raises(RateLimitError):
+        client.global_intel.sighting.search.get()
+
+    # Not limited at all.
+    client.private_intel.sighting.search.get()
+    client.private_intel.sighting.search.get()
+
+
+@patch('time.sleep')
+def test_that_client_rate_limits_every_retry(_):
+    transport = InMemoryRequest(token=None)
+    transport.add('*', '*', {}, status_code=503)
+    transport.add('POST', '/iroh/oauth2/token', {'access_token': 'TOKEN'})
+
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            transport=transport,
+                            retry={'retries': 5},
+                            rate_limit={'rate': 0.01, 'burst': 3},
+                            rate_limit_block=False)
+
+    # The token request and two attempts to get the profile.
+    with pytest.raises(RateLimitError):
+        client.profile.whoami()
+    assert transport.performed == 3
+
+
+@patch('requests.Session.request')
+def test_that_client_caches_responses_when_asked_to(inner_session_request):
+    inner_session_request.return_value = auth_response(200)
+    inner_session_request.return_value.headers = {}
+
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            cache={'ttl': 60})
+
+    client.profile.whoami()
+    client.profile.whoami()
+
+    # The token request and the very first call only.
+    assert inner_session_request.call_count == 2
+    assert client.cache.stats()['hits'] == 1
+
+
+@patch('requests.Session.request')
+def test_that_client_shares_verdict_cache_when_asked_to(_):
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            verdict_cache={'ttl': 600})
+
+    assert client.verdict_cache is not None
+    assert client.enrich._verdict_cache is client.verdict_cache
+    assert client.commands._verdict_cache is client.verdict_cache
+
+
+@patch('requests.Session.request')
+def test_that_client_encodes_bodies_with_codec(inner_session_request):
+    token, inspected = auth_response(200), auth_response(200)
+    token.content = b'{"access_token": "ACCESS_TOKEN"}'
+    inspected.content = b'{"spam": "eggs"}'
+    inner_session_request.side_effect = [token, inspected]
+
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD', codec='json',
+                            lazy_auth=True)
+
+    assert client.inspect.inspect({'content': 'cisco.com'}) == {
+        'spam': 'eggs'
+    }
+    assert inner_session_request.call_args[1]['data'] == (
+        b'{"content": "cisco.com"}'
+    )
+
+
+@patch('requests.Session.request')
+def test_that_client_compresses_bodies_per_family(_):
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            compression={'private_intel': {'threshold': 1},
+                                         'global_intel': True})
+
+    private_intel = client.private_intel._request._request
+    global_intel = client.global_intel._request._request
+    inspect = client.inspect._request._request
+
+    assert private_intel._threshold == 1
+    assert global_intel._threshold == 1024
+    assert not hasattr(inspect, '_threshold')
+
+
+def test_that_client_uses_http2_transport_when_asked_to():
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            transport='http2', lazy_auth=True)
+
+    assert isinstance(client._transport, HTTP2Request)
+
+    with pytest.raises(TransportError):
+        ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD', transport='http3')
+
+
+def test_that_client_uses_injected_transport():
+    transport = InMemoryRequest([
+        ('GET', '/iroh/profile/whoami', {'user': {'name': 'John'}}),
+    ])
+
+    client = ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                            transport=transport)
+
+    assert client.profile.whoami() == {'user': {'name': 'John'}}
+    # The token request and the call itself.
+    assert transport.performed == 2
+
+    for options in ({'proxy': 'http://proxy'}, {'pool_maxsize': 64},
+                    {'keep_alive': False}):
+        with pytest.raises(TransportError):
+            ThreatResponse('CLIENT_ID', 'CLIENT_PASSWORD',
+                           transport=transport, **options)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import pytest
+from mock import patch
+
+from threatresponse import codec
+from threatresponse.codec import (
+    OrjsonCodec,
+    StandardCodec,
+    UjsonCodec,
+    codec_for,
+)
+from threatresponse.exceptions import CodecError
+
+VALUE = {'type': 'bundle', 'source': u'é/"', 'counts': [1, 2.5, None, True]}
+
+
+def available_codecs():
+    codecs = [StandardCodec()]
+    if codec.orjson is not None:
+        codecs.append(OrjsonCodec())
+    if codec.ujson is not None:
+        codecs.append(UjsonCodec())
+    return codecs
+
+
+@pytest.mark.parametrize('instance', available_codecs(),
+                         ids=lambda instance: type(instance).__name__)
+def test_that_codecs_round_trip_values(instance):
+    data = instance.dumps(VALUE)
+
+    assert isinstance(data, bytes)
+    assert instance.loads(data) == VALUE
+    assert instance.loads(data.decode('utf-8')) == VALUE
+
+
+def test_that_auto_codec_prefers_fastest_available_library():
+    with patch.object(codec, 'orjson', None), \
+            patch.object(codec, 'ujson', None):
+        assert isinstance(codec_for('auto'), StandardCodec)
+
+    with patch.object(codec, 'orjson', object()):
+        assert isinstance(codec_for('auto'), OrjsonCodec)
+
+
+def test_that_codec_for_returns_codec_instances_as_is():
+    instance = StandardCodec()
+
+    assert codec_for(instance) is instance
+
+
+def test_that_codec_for_fails_on_unknown_or_missing_codecs():
+    with pytest.raises(CodecError):
+        codec_for('yaml')
+
+    with patch.object(codec, 'ujson', None), pytest.raises(CodecError):
+        codec_for('ujson')
+
+
+@pytest.mark.skipif(codec.orjson is None, reason='orjson is not installed')
+def test_that_orjson_codec_falls_back_for_unsupported_values():
+    assert OrjsonCodec().dumps({1: 'one'}) == b'{"1": "one"}'
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from threatresponse.concurrency import fan_out
+
+
+def test_that_fan_out_yields_all_results_and_errors():
+    def function(item):
+        if item % 3 == 0:
+            raise ValueError(item)
+        return item * 2
+
+    results = list(fan_out(function, range(10), max_workers=4))
+
+    assert sorted(item for item, _, _ in results) == list(range(10))
+
+    for item, result, error in results:
+        if item % 3 == 0:
+            assert result is None
+            assert isinstance(error, ValueError)
+        else:
+            assert result == item * 2
+            assert error is None
+
+
+def test_that_fan_out_bounds_items_in_flight():
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0, 'consumed': 0}
+
+    def items():
+        for item in range(20):
+            state['consumed'] += 1
+            yield item
+
+    def function(item):
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+        time.sleep(0.01)
+        with lock:
+            state['running'] -= 1
+        return item
+
+    results = fan_out(function, items(), max_workers=3)
+
+    next(results)
+    # Only the items in flight (plus the completed one) have been consumed.
+    assert state['consumed'] <= 4
+
+    list(results)
+
+    assert state['peak'] <= 3
+    assert state['consumed'] == 20
+
+
+def test_that_fan_out_yields_in_order_of_completion():
+    def function(item):
+        time.sleep(item)
+        return item
+
+    results = fan_out(function, [0.2, 0.0], max_workers=2)
+
+    assert [result for _, result, _ in results] == [0.0, 0.2]
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from threatresponse import jsonstream
+
+DOCUMENT = {
+    'type': 'bundle',
+    'source': 'tricky "quoted" [brackets] {braces}',
+    'sightings': [
+        {'id': str(index), 'description': u'\\"]}é' * index,
+         'observables': [{'type': 'ip', 'value': str(index)}]}
+        for index in range(20)
+    ],
+    'judgements': [],
+    'verdicts': [{'disposition': 1}, None, True, 1.5e3, 'verdict'],
+}
+
+
+def chunked(size, indent=None):
+    text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False)
+    data = text.encode('utf-8')
+
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 64, 1 << 20])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_that_items_are_parsed_regardless_of_chunks(size, indent):
+    chunks = chunked(size, indent)
+
+    assert list(jsonstream.items(chunks, '*[*]', with_paths=True)) == [
+        ((key, index), value)
+        for key in ['sightings', 'judgements', 'verdicts']
+        for index, value in enumerate(DOCUMENT[key])
+    ]
+    assert list(jsonstream.items(chunks, 'sightings[*].observables[*]')) == [
+        sighting['observables'][0] for sighting in DOCUMENT['sightings']
+    ]
+    assert list(jsonstream.items(chunks, 'source')) == [DOCUMENT['source']]
+    assert list(jsonstream.items(chunks, '')) == [DOCUMENT]
+    assert list(jsonstream.items(chunks, 'missing[*]')) == []
+
+
+def test_that_items_accept_text_chunks():
+    assert list(jsonstream.items(['{"data": [1, ', '{"a": "b"}]}'],
+                                 'data[*]')) == [1, {'a': 'b'}]
+
+
+@pytest.mark.parametrize('document', [
+    '{"data": [1, 2',
+    '{"data" 1}',
+    '[1 2]',
+    '{"data": []}}',
+    '{"data": [1, 2,]}',
+    '{"data": [1], "other": 2,}',
+    '{"data": [{},]}',
+    '',
+])
+def test_that_invalid_documents_fail(document):
+    with pytest.raises(ValueError):
+        list(jsonstream.items([document], 'data[*]'))
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+import pytest
+import requests
+
+from threatresponse import MultiRegionThreatResponse
+from threatresponse.exceptions import RegionError
+from threatresponse.request.in_memory import InMemoryRequest
+from threatresponse.request.response import build_response
+
+CREDENTIALS = OrderedDict([('us', ('CLIENT_ID', 'CLIENT_PASSWORD')),
+                           ('eu', 'TOKEN')])
+
+
+def transport(down=()):
+    def search(method, url, **kwargs):
+        if any('.{}.'.format(region) in url for region in down):
+            raise requests.ConnectionError(url)
+        return build_response(method, url, 200, {}, b'[]')
+
+    return InMemoryRequest([
+        ('*', '/ctia/sighting*', search),
+        ('POST', '/iroh/iroh-inspect/inspect', search),
+        ('GET', '/iroh/iroh-enrich/settings', {}),
+        ('GET', '/iroh/profile/whoami', {'region': 'primary'}),
+    ])
+
+
+def test_that_regionless_apis_fail_over_to_healthy_regions():
+    client = MultiRegionThreatResponse(CREDENTIALS, primary='eu',
+                                       transport=transport(down=['eu']))
+
+    assert list(client.clients) == ['eu', 'us']
+    assert client.global_intel.sighting.search.get() == []
+    assert client.global_intel.sighting.search.get() == []
+
+    stats = client.health.stats()
+    assert stats['eu'] == dict(stats['eu'], error_rate=1, requests=1)
+    assert stats['us'] == dict(stats['us'], error_rate=0, requests=2)
+
+
+def test_that_only_requests_without_side_effects_fail_over():
+    client = MultiRegionThreatResponse(CREDENTIALS, primary='eu',
+                                       transport=transport(down=['eu']))
+
+    assert client.inspect.inspect({'content': '1.1.1.1'}) == []
+
+    with pytest.raises(requests.ConnectionError):
+        client.global_intel.sighting.post({'type': 'sighting'})
+
+
+def test_that_regional_apis_use_primary_region():
+    client = MultiRegionThreatResponse(CREDENTIALS, transport=transport())
+
+    assert client.primary is client.clients['us']
+    assert client.enrich is client.primary.enrich
+    assert client.profile.whoami() == {'region': 'primary'}
+
+
+def test_that_primary_region_must_have_credentials():
+    with pytest.raises(RegionError):
+        MultiRegionThreatResponse(CREDENTIALS, primary='apjc',
+                                  transport=transport())
@@ -0,0 +1,195 @@
+import base64
+import json
+import threading
+
+import pytest
+from six.moves import BaseHTTPServer, socketserver
+
+from threatresponse import ThreatResponse
+
+THREADS = 8
+CALLS_PER_THREAD = 25
+# Make each token expire once it has been used for that many calls.
+TOKEN_ROTATION = 47
+
+
+class StubState(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tokens = {}  # The only valid token of each client.
+        self.owners = {}  # Client of each token ever issued.
+        self.usages = {}  # Number of calls made with each token.
+        self.issued = 0
+        self.calls = 0
+        self.rotations = 0
+
+    def issue(self, client_id):
+        with self.lock:
+            self.issued += 1
+            token = 'token-{}'.format(self.issued)
+            self.tokens[client_id] = token
+            self.owners[token] = client_id
+            return token
+
+    def authorize(self, token):
+        with self.lock:
+            client_id = self.owners.get(token)
+            if client_id is None or self.tokens.get(client_id) != token:
+                return None
+
+            self.calls += 1
+            self.usages[token] = self.usages.get(token, 0) + 1
+            if self.usages[token] == TOKEN_ROTATION:
+                del self.tokens[client_id]
+                self.rotations += 1
+
+            return client_id
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    # Keep connections alive, so the client reuses its pooled connections.
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        if self.path == '/iroh/oauth2/token':
+            credentials = self.headers['Authorization'].split(' ', 1)[1]
+            client_id = base64.b64decode(credentials).decode().split(':')[0]
+            token = self.server.state.issue(client_id)
+            return self._respond(200, {'access_token': token,
+                                       'expires_in': 600})
+
+        authorization = self.headers.get('Authorization', '')
+        client_id = self.server.state.authorize(
+            authorization.replace('Bearer ', '', 1)
+        )
+        if client_id is None:
+            return self._respond(401, {'error': 'invalid_token'})
+
+        return self._respond(200, {
+            'client_id': client_id,
+            'call': self.headers.get('X-Call'),
+            'payload': json.loads(body.decode()),
+        })
+
+    def _respond(self, status_code, payload):
+        body = json.dumps(payload).encode()
+
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+@pytest.fixture
+def server():
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    server.state = StubState()
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def client_for(server, client_id, **options):
+    url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+    return ThreatResponse(
+        client_id=client_id,
+        client_password='PASSWORD',
+        environment={
+            'visibility': url,
+            'private_intel': url,
+            'global_intel': url,
+        },
+        lazy_auth=True,
+        pool_maxsize=THREADS,
+        **options
+    )
+
+
+def hammer(clients):
+    """ Runs `CALLS_PER_THREAD` calls from each of `THREADS` threads
+    per client (sharing that client) and returns the failures. """
+
+    shared_headers = {'X-Shared': 'Header'}
+    failures = []
+    start = threading.Event()
+
+    def run(client_id, client, thread):
+        start.wait()
+
+        for index in range(CALLS_PER_THREAD):
+            call = '{}-{}-{}'.format(client_id, thread, index)
+            headers = dict(shared_headers, **{'X-Call': call})
+
+            try:
+                response = client.inspect.inspect(
+                    {'content': call}, headers=headers
+                )
+            except Exception as error:
+                failures.append(error)
+                continue
+
+            if response != {'client_id': client_id,
+                            'call': call,
+                            'payload': {'content': call}}:
+                failures.append(response)
+
+    threads = [
+        threading.Thread(target=run, args=(client_id, client, thread))
+        for client_id, client in clients.items()
+        for thread in range(THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+
+    # The headers shared by all the threads must never be modified.
+    assert shared_headers == {'X-Shared': 'Header'}
+
+    return failures
+
+
+def test_that_shared_client_requests_single_token_on_first_calls(server):
+    client = client_for(server, 'CLIENT')
+
+    assert hammer({'CLIENT': client}) == []
+
+    assert server.state.calls == THREADS * CALLS_PER_THREAD
+    # Concurrent first calls and 401 retries share token requests:
+    # one initial token plus one more per each expired token.
+    assert server.state.issued == 1 + server.state.rotations
+
+
+def test_that_credentials_never_leak_between_shared_clients(server):
+    clients = {
+        'FIRST': client_for(server, 'FIRST'),
+        'SECOND': client_for(server, 'SECOND'),
+        'THIRD': client_for(server, 'THIRD', token_cache=True),
+    }
+
+    assert hammer(clients) == []
+
+    assert server.state.calls == len(clients) * THREADS * CALLS_PER_THREAD
+    assert server.state.issued == len(clients) + server.state.rotations
@@ -0,0 +1,60 @@
+import os
+import stat
+import time
+
+from threatresponse.tokens import FileTokenCache, MemoryTokenCache, token_key
+
+
+def test_token_key_depends_on_all_credentials_and_url():
+    key = token_key('id', 'password', 'https://visibility.amp.cisco.com')
+
+    assert key == token_key('id', 'password',
+                            'https://visibility.amp.cisco.com')
+    assert key != token_key('id', 'wrong', 'https://visibility.amp.cisco.com')
+    assert key != token_key('id', 'password',
+                            'https://visibility.eu.amp.cisco.com')
+    assert 'id' not in key and 'password' not in key
+
+
+def test_memory_token_cache_respects_expiration():
+    cache = MemoryTokenCache()
+
+    assert cache.get('key') is None
+
+    cache.set('key', 'Cake', time.time() + 100)
+    cache.set('expired', 'Pie', time.time() - 1)
+    cache.set('eternal', 'Tart', None)
+
+    assert cache.get('key')[0] == 'Cake'
+    assert cache.get('expired') is None
+    assert cache.get('eternal') == ('Tart', None)
+
+
+def test_file_token_cache_is_shared_between_instances(tmpdir):
+    path = str(tmpdir.join('tokens.json'))
+
+    first, second = FileTokenCache(path), FileTokenCache(path)
+
+    first.set('key', 'Cake', time.time() + 100)
+    first.set('expired', 'Pie', time.time() - 1)
+
+    with second.lock('key'):
+        assert second.get('key')[0] == 'Cake'
+    assert second.get('expired') is None
+    assert second.get('missing') is None
+
+    # Tokens are secrets, so nobody else must be able to read them.
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_file_token_cache_treats_corrupted_file_as_empty(tmpdir):
+    path = tmpdir.join('tokens.json')
+    path.write('{')
+
+    cache = FileTokenCache(str(path))
+
+    assert cache.get('key') is None
+
+    cache.set('key', 'Cake', None)
+
+    assert cache.get('key') == ('Cake', None)
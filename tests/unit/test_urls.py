@@ -0,0 +1,76 @@
+import pytest
+
+from threatresponse import urls
+from threatresponse.exceptions import EnvironmentValueError, RegionError
+from threatresponse.urls import Environment, join, url_for
+
+CUSTOM = {
+    'visibility': 'https://visibility{region}.example.com',
+    'private_intel': 'https://private{region}.example.com',
+    'global_intel': 'https://global.example.com',
+}
+
+
+def test_url_for_default_environment():
+    assert url_for(None, 'visibility') == 'https://visibility.amp.cisco.com'
+    assert url_for('us', 'global_intel') == 'https://intel.amp.cisco.com'
+    assert url_for('eu', 'private_intel') == \
+        'https://private.intel.eu.amp.cisco.com'
+
+
+def test_url_for_custom_environment():
+    assert url_for('apjc', 'visibility', CUSTOM) == \
+        'https://visibility.apjc.example.com'
+    assert url_for('eu', 'global_intel', CUSTOM) == \
+        'https://global.example.com'
+
+
+def test_url_for_invalid_region_fails():
+    with pytest.raises(RegionError) as error:
+        url_for('mars', 'visibility')
+
+    assert str(error.value) == ("Invalid region 'mars', "
+                                "must be one of: '', 'us', 'eu', 'apjc'.")
+
+
+def test_environment_is_resolved_once_per_patterns():
+    environment = Environment.resolved(dict(CUSTOM))
+
+    assert Environment.resolved(dict(CUSTOM)) is environment
+    assert Environment.resolved(environment) is environment
+    assert Environment.resolved() is Environment.resolved(None)
+    assert Environment.resolved() is not environment
+
+
+def test_only_recently_resolved_environments_are_kept():
+    environment = Environment.resolved(dict(CUSTOM))
+
+    for index in range(urls.MAX_RESOLVED_ENVIRONMENTS):
+        Environment.resolved(dict(
+            CUSTOM, visibility='https://{}.example.com'.format(index)
+        ))
+        # The most recently used environment is kept.
+        assert Environment.resolved(dict(CUSTOM)) is environment
+
+    for index in range(urls.MAX_RESOLVED_ENVIRONMENTS):
+        Environment.resolved(dict(
+            CUSTOM, visibility='https://{}.example.org'.format(index)
+        ))
+
+    assert len(urls._environments) == urls.MAX_RESOLVED_ENVIRONMENTS
+    assert Environment.resolved(dict(CUSTOM)) is not environment
+
+
+@pytest.mark.parametrize('patterns', [
+    'https://example.com',
+    {'visibility': 'https://example.com'},
+    dict(CUSTOM, global_intel=None),
+    dict(CUSTOM, global_intel='https://{unknown}.example.com'),
+])
+def test_invalid_environment_fails(patterns):
+    with pytest.raises(EnvironmentValueError):
+        Environment.resolved(patterns)
+
+
+def test_join():
+    assert join('/ctia/', 'judgement', 'a/b') == '/ctia/judgement/a%2Fb'
@@ -0,0 +1,109 @@
+from mock import patch
+
+from threatresponse.verdicts import VerdictCache
+
+NOW = 1600000000.0  # 2020-09-13T12:26:40Z.
+
+
+def observable(value, type_='domain'):
+    return {'type': type_, 'value': value}
+
+
+def module(instance_id, *docs):
+    return {'module': 'module', 'module_type_id': 'module_type_id',
+            'module_instance_id': instance_id,
+            'data': {'verdicts': {'count': len(docs), 'docs': list(docs)}}}
+
+
+def verdict(value, end_time='2525-01-01T00:00:00.000Z', disposition=2):
+    return {'observable': observable(value), 'disposition': disposition,
+            'valid_time': {'start_time': '2020-01-01T00:00:00.000Z',
+                           'end_time': end_time}}
+
+
+@patch('time.time', return_value=NOW)
+def test_that_verdict_cache_returns_cached_verdicts_and_misses(_):
+    cache = VerdictCache()
+    cache.store(
+        [observable('a'), observable('b'), observable('c')],
+        {'data': [module('first', verdict('a'), verdict('b')),
+                  module('second', verdict('a', disposition=1))]}
+    )
+
+    cached, misses = cache.split(
+        [observable('a'), observable('d'), observable('c'), observable('a')]
+    )
+
+    assert misses == [observable('d'), observable('c')]
+    assert cached == {'data': [module('first', verdict('a')),
+                               module('second', verdict('a', disposition=1))]}
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 0,
+                             'entries': 2, 'hit_rate': 1.0 / 3}
+
+
+@patch('time.time', return_value=NOW)
+def test_that_verdict_cache_respects_end_time_and_ttl(time):
+    cache = VerdictCache(ttl=600)
+    cache.store(
+        [observable('a'), observable('b')],
+        {'data': [module('first',
+                         verdict('a', end_time='2020-09-13T12:30:00.000Z'),
+                         verdict('b'))]}
+    )
+
+    time.return_value = NOW + 300
+    assert cache.split([observable('a'), observable('b')])[1] == [
+        observable('a')
+    ]
+
+    time.return_value = NOW + 900
+    assert cache.split([observable('b')])[1] == [observable('b')]
+
+
+@patch('time.time', return_value=NOW)
+def test_that_verdict_cache_only_keeps_unknown_observables_if_asked_to(time):
+    cache = VerdictCache()
+    cache.store([observable('a')], {'data': []})
+
+    assert cache.split([observable('a')]) == ({'data': []},
+                                              [observable('a')])
+
+    cache = VerdictCache(negative_ttl=60)
+    cache.store([observable('a')], {'data': []})
+
+    assert cache.split([observable('a')]) == ({'data': []}, [])
+
+
+def test_that_verdict_cache_skips_responses_with_errors():
+    cache = VerdictCache()
+    cache.store([observable('a')], {'data': [module('first', verdict('a'))],
+                                    'errors': [{'module': 'second'}]})
+
+    assert cache.split([observable('a')])[1] == [observable('a')]
+
+
+def test_that_verdict_cache_evicts_least_recently_used_observables():
+    cache = VerdictCache(max_entries=2)
+    for value in ['a', 'b']:
+        cache.store([observable(value)],
+                    {'data': [module('first', verdict(value))]})
+
+    cache.split([observable('a')])
+    cache.store([observable('c')], {'data': [module('first', verdict('c'))]})
+
+    assert cache.split([observable(value) for value in 'abc'])[1] == [
+        observable('b')
+    ]
+    assert cache.stats()['evictions'] == 1
+
+
+def test_that_verdict_cache_returns_copies_of_verdicts():
+    cache = VerdictCache()
+    cache.store([observable('a')], {'data': [module('first', verdict('a'))]})
+
+    cached, _ = cache.split([observable('a')])
+    cached['data'][0]['data']['verdicts']['docs'][0]['disposition'] = 1
+
+    assert cache.split([observable('a')])[0] == {
+        'data': [module('first', verdict('a'))]
+    }
@@ -1,5 +1,6 @@
-# Make the main class importable from the root package directly.
+# Make the main classes importable from the root package directly.
 from .client import ThreatResponse
+from .multi_region import MultiRegionThreatResponse
 
 # Load the current version meta-attribute into the package.
 from .version import __version__
@@ -0,0 +1,3 @@
+# Make the main classes importable from the `.aio` subpackage directly.
+from .client import AsyncThreatResponse
+from .multi_region import AsyncMultiRegionThreatResponse
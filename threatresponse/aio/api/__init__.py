@@ -0,0 +1,3 @@
+# Make the classes below importable from the `.aio.api` subpackage directly.
+from .commands import AsyncCommandsAPI
+from .enrich import AsyncEnrichAPI
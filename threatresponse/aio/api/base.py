@@ -0,0 +1,8 @@
+async def processed_async(response, processed):
+    """ Awaits the response of an asynchronous request,
+    then checks and processes it just like `API` does. """
+
+    response = await response
+    response.raise_for_status()
+
+    return processed(response)
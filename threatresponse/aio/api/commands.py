@@ -0,0 +1,118 @@
+import asyncio
+
+from ...api.enrich import merged_responses
+from ...api.commands import (
+    CommandsAPI,
+    build_array_for_targets,
+    build_array_for_verdicts,
+)
+from ...api.routing import Router
+from ...concurrency import DEFAULT_MAX_WORKERS
+
+
+class AsyncCommandsAPI(CommandsAPI):
+    __router, route = Router.new()
+
+    @route('verdict')
+    async def _perform(self, payload, **kwargs):
+        """
+        Command allow to simple query CTR
+        for a verdict for a bunch of observables
+        """
+
+        response = await self._post(
+            '/iroh/iroh-inspect/inspect',
+            json={'content': str(payload)},
+            **kwargs
+        )
+
+        response = await self._deliberated(response, **kwargs)
+        verdicts = build_array_for_verdicts(response)
+        return {"response": response, "verdicts": verdicts}
+
+    @route('targets')
+    async def _perform(self, payload, **kwargs):
+        """
+        Command allow to simple query CTR for a targets
+        for a bunch of observables
+        """
+
+        response = await self._post(
+            '/iroh/iroh-inspect/inspect',
+            json={'content': str(payload)},
+            **kwargs
+        )
+
+        response = await self._post(
+            '/iroh/iroh-enrich/observe/observables',
+            json=response,
+            **kwargs
+        )
+
+        result = build_array_for_targets(response)
+
+        return {"response": response, "targets": result}
+
+    @route('verdict_many')
+    def _perform(self, payloads, max_workers=None, **kwargs):
+        """
+        Runs the verdict command for each of the payloads concurrently
+        and returns an iterator of awaitables in the order of completion
+        """
+
+        return _many(
+            lambda payload: self.verdict(payload, **kwargs),
+            payloads,
+            max_workers,
+        )
+
+    @route('targets_many')
+    def _perform(self, payloads, max_workers=None, **kwargs):
+        """
+        Runs the targets command for each of the payloads concurrently
+        and returns an iterator of awaitables in the order of completion
+        """
+
+        return _many(
+            lambda payload: self.targets(payload, **kwargs),
+            payloads,
+            max_workers,
+        )
+
+    async def _deliberated(self, observables, **kwargs):
+        if self._verdict_cache is None:
+            return await self._post(
+                '/iroh/iroh-enrich/deliberate/observables',
+                json=observables,
+                **kwargs
+            )
+
+        cached, misses = self._verdict_cache.split(observables)
+        if not misses:
+            return merged_responses([cached])
+
+        response = await self._post(
+            '/iroh/iroh-enrich/deliberate/observables',
+            json=misses,
+            **kwargs
+        )
+        self._verdict_cache.store(misses, response)
+
+        return merged_responses([cached, response])
+
+
+def _many(command, payloads, max_workers):
+    # Must be called from within a running event loop (just like
+    # `asyncio.as_completed`) since the commands get scheduled right away.
+    semaphore = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+
+    async def run(payload):
+        async with semaphore:
+            try:
+                result = await command(payload)
+            except Exception as error:
+                return {"payload": payload, "result": None, "error": error}
+
+        return {"payload": payload, "result": result, "error": None}
+
+    return asyncio.as_completed([run(payload) for payload in payloads])
@@ -0,0 +1,31 @@
+import asyncio
+
+from ...api.enrich import EnrichAPI, merged_responses
+from ...concurrency import DEFAULT_MAX_WORKERS
+
+
+class AsyncEnrichAPI(EnrichAPI):
+
+    async def _deliberated(self, url, payload, **kwargs):
+        if not self._caches_verdicts(kwargs):
+            return await self._observables(url, payload, **kwargs)
+
+        cached, misses = self._verdict_cache.split(payload)
+        if not misses:
+            return merged_responses([cached])
+
+        response = await self._observables(url, misses, **kwargs)
+        self._verdict_cache.store(misses, response)
+
+        return merged_responses([cached, response])
+
+    async def _chunked(self, url, chunks, max_workers, **kwargs):
+        semaphore = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+
+        async def post(chunk):
+            async with semaphore:
+                return await self._post(url, json=chunk, **kwargs)
+
+        responses = await asyncio.gather(*(post(chunk) for chunk in chunks))
+
+        return merged_responses(responses)
@@ -0,0 +1,36 @@
+import asyncio
+
+from ...api.entity import next_page_params
+
+
+async def paginated_async(fetch, response, params, page_size, prefetch):
+    """ Asynchronously iterates over the entities of search results
+    just like `Search.iter` does (prefetching the next page as a task). """
+
+    offset = 0
+    response = await response
+
+    while True:
+        entities = response.json()
+        offset += len(entities)
+
+        params = next_page_params(response, entities, params,
+                                  page_size, offset)
+        next_page = None
+        if params is not None and prefetch:
+            next_page = asyncio.ensure_future(fetch(params))
+
+        try:
+            for entity in entities:
+                yield entity
+        except BaseException:
+            # The caller has stopped iterating (e.g. `aclose` was called).
+            if next_page is not None:
+                next_page.cancel()
+            raise
+
+        if params is None:
+            return
+
+        response = await (next_page if next_page is not None else
+                          fetch(params))
@@ -0,0 +1,54 @@
+from .api.commands import AsyncCommandsAPI
+from .api.enrich import AsyncEnrichAPI
+from .request.authorized import (
+    AsyncClientAuthorizedRequest,
+    AsyncTokenAuthorizedRequest,
+)
+from .request.caching import AsyncCachingRequest
+from .request.compressed import AsyncCompressedRequest
+from .request.encoded import AsyncEncodedRequest
+from .request.http2 import AsyncHTTP2Request
+from .request.logged import AsyncLoggedRequest
+from .request.proxied import AsyncProxiedRequest
+from .request.rate_limited import AsyncRateLimitedRequest
+from .request.retrying import AsyncRetryingRequest
+from .request.standard import AsyncStandardRequest
+from ..client import ThreatResponse
+
+
+class AsyncThreatResponse(ThreatResponse):
+    """
+    Exposes the same APIs as `ThreatResponse`,
+    but every endpoint method returns a coroutine.
+
+    Usage example:
+        async with AsyncThreatResponse(client_id, client_password) as client:
+            response = await client.enrich.observe.observables(payload)
+    """
+
+    _standard_request = AsyncStandardRequest
+    _proxied_request = AsyncProxiedRequest
+    _http2_request = AsyncHTTP2Request
+    _encoded_request = AsyncEncodedRequest
+    _logged_request = AsyncLoggedRequest
+    _retrying_request = AsyncRetryingRequest
+    _rate_limited_request = AsyncRateLimitedRequest
+    _caching_request = AsyncCachingRequest
+    _compressed_request = AsyncCompressedRequest
+    _client_authorized_request = AsyncClientAuthorizedRequest
+    _token_authorized_request = AsyncTokenAuthorizedRequest
+    _commands_api = AsyncCommandsAPI
+    _enrich_api = AsyncEnrichAPI
+
+    async def close(self):
+        await self._transport.close()
+
+    def __enter__(self):
+        raise TypeError('The asynchronous client must be closed '
+                        'asynchronously, use `async with` instead.')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
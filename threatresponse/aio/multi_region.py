@@ -0,0 +1,31 @@
+from .client import AsyncThreatResponse
+from .request.failover import AsyncFailoverRequest
+from ..multi_region import MultiRegionThreatResponse
+
+
+class AsyncMultiRegionThreatResponse(MultiRegionThreatResponse):
+    """
+    Exposes the same APIs as `MultiRegionThreatResponse`,
+    but every endpoint method returns a coroutine.
+
+    Usage example:
+        async with AsyncMultiRegionThreatResponse(credentials) as client:
+            response = await client.global_intel.sighting.search.get()
+    """
+
+    _client = AsyncThreatResponse
+    _failover_request = AsyncFailoverRequest
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.close()
+
+    def __enter__(self):
+        raise TypeError('The asynchronous client must be closed '
+                        'asynchronously, use `async with` instead.')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,17 @@
+# Make the classes below importable from `.aio.request` directly.
+from .authorized import (
+    AsyncClientAuthorizedRequest,
+    AsyncTokenAuthorizedRequest,
+)
+from .caching import AsyncCachingRequest
+from .cassette import AsyncRecordingRequest, AsyncReplayingRequest
+from .compressed import AsyncCompressedRequest
+from .encoded import AsyncEncodedRequest
+from .failover import AsyncFailoverRequest
+from .http2 import AsyncHTTP2Request
+from .in_memory import AsyncInMemoryRequest
+from .logged import AsyncLoggedRequest
+from .proxied import AsyncProxiedRequest
+from .rate_limited import AsyncRateLimitedRequest
+from .retrying import AsyncRetryingRequest
+from .standard import AsyncStandardRequest
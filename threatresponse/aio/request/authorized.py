@@ -0,0 +1,211 @@
+import asyncio
+import time
+
+from six.moves.http_client import UNAUTHORIZED
+from six.moves.urllib.parse import urljoin
+
+from ...request.authorized import ClientAuthorizedRequest
+from ...request.base import Request
+from ...tokens import token_key
+from ...urls import url_for
+
+
+class AsyncClientAuthorizedRequest(Request):
+    """
+    Provides authorization header for inner asynchronous request.
+    The token is always requested on the very first request (regardless
+    of `lazy`) since there may be no running event loop on init.
+    The token is regenerated `refresh_margin` seconds before it expires
+    by the first request to notice that (`refresh_in_background`
+    is rejected, since there may be no running event loop either).
+    If that fails, the current token keeps being used (and the refresh
+    retried every so often) until it actually expires.
+    If `token_cache` is specified, the token is shared with any other request
+    having the same credentials and region/environment via that cache.
+    """
+
+    def __init__(self, request, client_id,
+                 client_password, region=None, environment=None,
+                 lazy=True, refresh_margin=None, refresh_in_background=False,
+                 token_cache=None):
+        if refresh_in_background:
+            raise TypeError('Refreshing the token in background is not '
+                            'supported by the asynchronous client.')
+
+        self._request = request
+        self._client_id = client_id
+        self._client_password = client_password
+
+        self._token_url = urljoin(
+            url_for(region, 'visibility', environment),
+            '/iroh/oauth2/token'
+        )
+
+        self._refresh_margin = (
+            ClientAuthorizedRequest.DEFAULT_REFRESH_MARGIN
+            if refresh_margin is None else
+            refresh_margin
+        )
+
+        self._token_cache = token_cache
+        self._token_key = token_key(client_id, client_password,
+                                    self._token_url)
+
+        self._token = None
+        self._token_expires_at = None
+        self._token_lock = None
+        # When requests may try to refresh the token early again.
+        self._refresh_retry_at = 0
+
+    async def perform(self, method, url, **kwargs):
+        headers = kwargs.pop('headers', {})
+
+        token = self._token
+        if token is None:
+            token = await self._refresh_token(token)
+        elif self._expires_soon(self._token_expires_at):
+            token = await self._refresh_token_early(token)
+
+        response = await self._perform(method, url, headers, token, **kwargs)
+
+        if response.status_code == UNAUTHORIZED:
+            # The token has already expired (most probably),
+            # so regenerate it again and try one more time
+            token = await self._refresh_token(token)
+            response = await self._perform(method, url, headers, token,
+                                           **kwargs)
+
+        return response
+
+    async def _refresh_token(self, expired):
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+
+        async with self._token_lock:
+            # Some other coroutine may have already refreshed the token
+            # while this one was waiting for the lock, so just reuse it.
+            if self._token is expired:
+                self._token, self._token_expires_at = \
+                    await self._cached_token(expired)
+
+            return self._token
+
+    async def _refresh_token_early(self, token):
+        if self._refresh_retry_at > time.time():
+            # A recent refresh has failed, so keep using the current token.
+            return token
+
+        try:
+            return await self._refresh_token(token)
+        except Exception:
+            if not self._token_expires_at > time.time():
+                raise
+            # The current token is still valid, so keep using it
+            # rather than failing (or retrying) every request meanwhile.
+            self._refresh_retry_at = min(
+                time.time() + ClientAuthorizedRequest.BACKGROUND_RETRY_DELAY,
+                self._token_expires_at
+            )
+            return self._token
+
+    _expires_soon = ClientAuthorizedRequest._expires_soon
+
+    async def _cached_token(self, expired):
+        # Unlike the synchronous request, do not hold the cache lock
+        # while requesting a token, since that would block the event loop.
+        cached = None
+        if self._token_cache is not None:
+            cached = self._token_cache.get(self._token_key)
+
+        stale = cached is None or cached[0] == expired
+
+        if stale or self._expires_soon(cached[1]):
+            cached = await self._request_token()
+            if self._token_cache is not None:
+                self._token_cache.set(self._token_key, *cached)
+
+        return cached
+
+    async def _request_token(self):
+        data = {'grant_type': 'client_credentials'}
+        headers = {'Content-Type': 'application/x-www-form-urlencoded',
+                   'Accept': 'application/json'}
+        auth = (self._client_id, self._client_password)  # HTTP Basic Auth
+
+        response = await self._request.post(self._token_url,
+                                            data=data,
+                                            headers=headers,
+                                            auth=auth)
+
+        response.raise_for_status()
+
+        payload = response.json()
+        token = payload['access_token']  # OK
+
+        expires_in = payload.get('expires_in')
+        expires_at = (
+            None if expires_in is None else
+            time.time() + expires_in
+        )
+
+        return token, expires_at
+
+    @staticmethod
+    def _headers(token):
+        return {'Authorization': 'Bearer {token}'.format(token=token)}
+
+    def _perform(self, method, url, headers, token, **kwargs):
+        headers = dict(headers, **self._headers(token))
+        kwargs['headers'] = headers
+        return self._request.perform(method, url, **kwargs)
+
+
+class AsyncTokenAuthorizedRequest(Request):
+    """
+    Provides authorization header for inner asynchronous request.
+    The token is always checked on the very first request (regardless
+    of `lazy`) since there may be no running event loop on init.
+    """
+
+    def __init__(self, request, token, region=None, environment=None,
+                 lazy=True):
+        self._request = request
+        self._token = token
+        self._check_url = urljoin(
+            url_for(region, 'visibility', environment),
+            '/iroh/iroh-enrich/settings',
+        )
+        self._checked = False
+        self._check_lock = None
+
+    async def perform(self, method, url, **kwargs):
+        if not self._checked:
+            await self._check_token_once()
+
+        headers = kwargs.pop('headers', {})
+        response = await self._perform(method, url, headers, **kwargs)
+        return response
+
+    async def _check_token_once(self):
+        if self._check_lock is None:
+            self._check_lock = asyncio.Lock()
+
+        async with self._check_lock:
+            if not self._checked:
+                await self._check_token()
+                self._checked = True
+
+    async def _check_token(self):
+        headers = {'Accept': 'application/json'}
+
+        response = await self._perform('GET', self._check_url, headers)
+        response.raise_for_status()
+
+    @property
+    def _headers(self):
+        return {'Authorization': 'Bearer {token}'.format(token=self._token)}
+
+    def _perform(self, method, url, headers, **kwargs):
+        headers = dict(headers, **self._headers)
+        kwargs['headers'] = headers
+        return self._request.perform(method, url, **kwargs)
@@ -0,0 +1,28 @@
+from ...request.caching import CachingRequest
+
+
+class AsyncCachingRequest(CachingRequest):
+    """
+    Caches successful responses to inner asynchronous GET requests.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        key = self._key(method, url, kwargs)
+        if key is None:
+            response = await self._request.perform(method, url, **kwargs)
+
+            if method.upper() not in self.CACHEABLE_METHODS:
+                self._cache.invalidate(url)
+
+            return response
+
+        entry = self._cache.get(key)
+        if entry is not None and not entry.expired():
+            self._cache.record('hits')
+            return entry.response
+
+        response = await self._request.perform(
+            method, url, **self._conditional(entry, kwargs)
+        )
+
+        return self._stored(key, url, entry, response)
@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+from ...request.cassette import RecordingRequest, ReplayingRequest
+
+
+class AsyncRecordingRequest(RecordingRequest):
+    """
+    Records the exchanges of the inner asynchronous request into the cassette.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        started_at = time.time()
+        response = await self._request.perform(method, url, **kwargs)
+        self._cassette.record(method, url, kwargs, response,
+                              time.time() - started_at)
+
+        return response
+
+    async def close(self):
+        await self._request.close()
+
+
+class AsyncReplayingRequest(ReplayingRequest):
+    """
+    Replays the exchanges of the cassette without blocking the event loop.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        response, delay = self._replayed(method, url, kwargs)
+        await asyncio.sleep(delay)
+
+        return response
+
+    async def close(self):
+        pass
@@ -0,0 +1,18 @@
+from ...request.compressed import CompressedRequest
+
+
+class AsyncCompressedRequest(CompressedRequest):
+    """
+    Compresses large bodies of inner asynchronous requests.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        kwargs, compressed = self._compressed(url, kwargs)
+        if compressed is None:
+            return await self._request.perform(method, url, **kwargs)
+
+        response = await self._request.perform(method, url, **compressed)
+        if not self._rejected(url, response):
+            return response
+
+        return await self._request.perform(method, url, **kwargs)
@@ -0,0 +1,15 @@
+from ...request.encoded import EncodedRequest
+
+
+class AsyncEncodedRequest(EncodedRequest):
+    """
+    Encodes `json` payloads of inner asynchronous requests into `data` bytes
+    and decodes JSON bodies of their responses with the specified codec.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        response = await self._request.perform(method, url,
+                                               **self._encoded(kwargs))
+        response._codec = self._codec
+
+        return response
@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+import aiohttp
+
+from ...request.failover import FailoverRequest
+
+
+class AsyncFailoverRequest(FailoverRequest):
+    """
+    Performs each asynchronous request in the healthiest region
+    with exactly the same policies as `FailoverRequest` does.
+    """
+
+    ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+    async def perform(self, method, url, **kwargs):
+        regions = self._regions(method)
+
+        for region in regions:
+            started_at = time.time()
+            try:
+                response = await self._requests_by_region[region].perform(
+                    method, url, **kwargs
+                )
+            except self.ERRORS:
+                if self._settled(region, regions, started_at):
+                    raise
+                continue
+
+            if self._settled(region, regions, started_at, response):
+                return response
+
+            # Release the connection of the response being discarded.
+            response.close()
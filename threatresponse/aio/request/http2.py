@@ -0,0 +1,81 @@
+import aiohttp
+
+from ...request.base import Request
+from ...request.http2 import built, converted, httpx, httpx_verify, tls
+from ...exceptions import TransportError
+
+
+class AsyncHTTP2Request(Request):
+    """
+    Performs HTTP requests asynchronously using the `httpx` library over
+    HTTP/2 (see `HTTP2Request`). Returns the same responses (with the body
+    already read) as `AsyncStandardRequest` and raises the same `aiohttp`
+    connection errors.
+    """
+
+    def __init__(self, proxy=None, pool_connections=None, pool_maxsize=None,
+                 pool_block=True, max_retries=0, keep_alive=True):
+        if httpx is None:
+            raise TransportError(
+                'The httpx library is not installed, '
+                'run `pip install threatresponse[http2]`.'
+            )
+
+        limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=None if keep_alive else 0,
+        )
+        self._transport_options = dict(http2=True,
+                                       limits=limits,
+                                       proxy=proxy,
+                                       retries=max_retries)
+
+        self._client = self._new_client(True, None)
+        self._clients = {}  # By the other `verify` and `cert` values.
+
+    async def perform(self, method, url, **kwargs):
+        # The whole body is always read, so there is nothing to stream.
+        kwargs.pop('stream', None)
+        client = self._client_for(*tls(kwargs))
+        kwargs, options = converted(kwargs)
+
+        try:
+            response = await client.send(
+                client.build_request(method, url, **kwargs),
+                **options
+            )
+        except httpx.HTTPError as error:
+            raise _aiohttp_error(error) from error
+
+        return built(response)
+
+    async def close(self):
+        await self._client.aclose()
+        for client in self._clients.values():
+            await client.aclose()
+
+    def _client_for(self, verify, cert):
+        if verify is True and cert is None:
+            return self._client
+
+        if (verify, cert) not in self._clients:
+            self._clients[verify, cert] = self._new_client(verify, cert)
+
+        return self._clients[verify, cert]
+
+    def _new_client(self, verify, cert):
+        transport = httpx.AsyncHTTPTransport(verify=httpx_verify(verify),
+                                             cert=cert,
+                                             **self._transport_options)
+
+        return httpx.AsyncClient(transport=transport, timeout=None)
+
+
+def _aiohttp_error(error):
+    # Let the other requests handle errors the same way as usual.
+    if isinstance(error, httpx.TimeoutException):
+        return aiohttp.ServerTimeoutError(str(error))
+    if isinstance(error, (httpx.NetworkError, httpx.RemoteProtocolError)):
+        return aiohttp.ClientConnectionError(str(error))
+
+    return aiohttp.ClientError(str(error))
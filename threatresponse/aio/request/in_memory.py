@@ -0,0 +1,19 @@
+from ...request.in_memory import InMemoryRequest
+
+
+class AsyncInMemoryRequest(InMemoryRequest):
+    """
+    Serves canned responses from memory to asynchronous requests.
+    The functions serving routes (if any) may be coroutine functions too.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        response = super(AsyncInMemoryRequest, self).perform(method, url,
+                                                             **kwargs)
+        if hasattr(response, '__await__'):
+            response = await response
+
+        return response
+
+    async def close(self):
+        pass
@@ -0,0 +1,21 @@
+from ...request.logged import LoggedRequest
+
+
+class AsyncLoggedRequest(LoggedRequest):
+    """
+    Logs every response of inner asynchronous request.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        try:
+            response = await self._request.perform(method, url, **kwargs)
+        except Exception:
+            self._log_error(method, url)
+            raise
+
+        if response.ok:  # 100 <= code < 400.
+            self._log_success(method, url, response)
+        else:  # 400 <= code < 600.
+            self._log_error(method, url, response)
+
+        return response
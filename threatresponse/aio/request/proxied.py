@@ -0,0 +1,18 @@
+from .standard import AsyncStandardRequest
+
+
+class AsyncProxiedRequest(AsyncStandardRequest):
+    """
+    Supports asynchronous HTTP request proxying via a specified proxy server.
+    """
+
+    def __init__(self, proxy, **pool_options):
+        super(AsyncProxiedRequest, self).__init__(**pool_options)
+
+        self._proxy = proxy
+
+    def _converted(self, kwargs):
+        kwargs = super(AsyncProxiedRequest, self)._converted(kwargs)
+        kwargs.setdefault('proxy', self._proxy)
+
+        return kwargs
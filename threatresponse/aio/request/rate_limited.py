@@ -0,0 +1,17 @@
+import asyncio
+
+from ...request.rate_limited import RateLimitedRequest
+
+
+class AsyncRateLimitedRequest(RateLimitedRequest):
+    """
+    Limits the rate of inner asynchronous requests
+    without blocking the event loop while waiting.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        delay = self._delay(method, url)
+        if delay:
+            await asyncio.sleep(delay)
+
+        return await self._request.perform(method, url, **kwargs)
@@ -0,0 +1,32 @@
+import asyncio
+import time
+
+import aiohttp
+
+from ...request.retrying import RetryingRequest
+
+
+class AsyncRetryingRequest(RetryingRequest):
+    """
+    Retries asynchronous requests with exactly the same policies
+    as `RetryingRequest` does, but without blocking the event loop.
+    """
+
+    async def perform(self, method, url, **kwargs):
+        started = time.time()
+        attempt = 0
+
+        while True:
+            try:
+                response = await self._request.perform(method, url, **kwargs)
+            except aiohttp.ClientConnectionError:
+                delay = self._delay(method, attempt, started)
+                if delay is None:
+                    raise
+            else:
+                delay = self._delay(method, attempt, started, response)
+                if delay is None:
+                    return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
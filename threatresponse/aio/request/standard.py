@@ -0,0 +1,121 @@
+import base64
+
+import aiohttp
+
+from ...request.base import Request
+from ...request.response import build_response
+from ...request.standard import flattened_params, ssl_context
+
+
+class AsyncStandardRequest(Request):
+    """
+    Performs plain HTTP requests asynchronously using the `aiohttp` library.
+    Accepts the same keyword arguments as `requests` does and returns
+    the same responses (with the body already read) as `StandardRequest`.
+
+    Supports the same connection pooling options as `StandardRequest`
+    except for those having no `aiohttp` counterpart: `pool_connections`
+    (pools are not limited by the number of hosts), `pool_block` (requests
+    always wait for a free connection) and `max_retries` (no retries).
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None,
+                 pool_block=True, max_retries=None, keep_alive=True):
+        self._pool_maxsize = pool_maxsize
+        self._keep_alive = keep_alive
+
+        # The session must be created from within a running event loop,
+        # so postpone its creation until the very first request.
+        self._session = None
+        self._ssl_contexts = {}  # By the other `verify` and `cert` values.
+
+    async def perform(self, method, url, **kwargs):
+        if self._session is None:
+            self._session = self._create_session()
+
+        async with self._session.request(
+            method, url, **self._converted(kwargs)
+        ) as response:
+            content = await response.read()
+
+        return build_response(method,
+                              response.url,
+                              response.status,
+                              response.headers,
+                              content,
+                              reason=response.reason)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _create_session(self):
+        options = {'force_close': not self._keep_alive}
+        if self._pool_maxsize is not None:
+            options['limit_per_host'] = self._pool_maxsize
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**options)
+        )
+
+    def _converted(self, kwargs):
+        """ Converts `requests` keyword arguments into `aiohttp` ones. """
+
+        kwargs = dict(kwargs)
+
+        # The whole body is always read, so there is nothing to stream.
+        kwargs.pop('stream', None)
+
+        if 'params' in kwargs:
+            kwargs['params'] = flattened_params(kwargs['params'])
+
+        auth = kwargs.pop('auth', None)
+        if isinstance(auth, tuple):
+            # Build the HTTP Basic Auth header directly since passing `auth`
+            # to `aiohttp` is deprecated in its recent versions.
+            kwargs['headers'] = dict(kwargs.get('headers') or {})
+            kwargs['headers']['Authorization'] = _basic_auth(*auth)
+
+        timeout = kwargs.get('timeout')
+        if timeout is not None:
+            if isinstance(timeout, tuple):
+                connect, read = timeout
+                timeout = aiohttp.ClientTimeout(sock_connect=connect,
+                                                sock_read=read)
+            else:
+                timeout = aiohttp.ClientTimeout(total=timeout)
+            kwargs['timeout'] = timeout
+
+        ssl = self._ssl(kwargs.pop('verify', None), kwargs.pop('cert', None))
+        if ssl is not None:
+            kwargs['ssl'] = ssl
+
+        proxies = kwargs.pop('proxies', None)
+        if proxies:
+            kwargs['proxy'] = proxies.get('https') or proxies.get('http')
+
+        return kwargs
+
+    def _ssl(self, verify, cert):
+        """ Returns the `ssl` argument of `aiohttp` matching the `verify`
+        and `cert` arguments of `requests` (`None` for the defaults). """
+
+        verify = True if verify is None else verify
+        cert = tuple(cert) if isinstance(cert, list) else cert
+
+        if cert is None and verify is True:
+            return None
+        if cert is None and verify is False:
+            return False
+
+        # Loading certificates is costly, so build every context just once.
+        if (verify, cert) not in self._ssl_contexts:
+            self._ssl_contexts[verify, cert] = ssl_context(verify, cert)
+
+        return self._ssl_contexts[verify, cert]
+
+
+def _basic_auth(username, password):
+    credentials = '{}:{}'.format(username, password).encode('utf-8')
+    return 'Basic ' + base64.b64encode(credentials).decode('ascii')
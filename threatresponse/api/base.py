@@ -1,5 +1,10 @@
-from .routing import Resolution, Router
+from .routing import BoundRoute, RouteNode, Router
+from .. import jsonstream
 from ..exceptions import ResponseTypeError
+from ..request.base import asynchronous
+
+# The size of chunks to read streamed responses by.
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class API(object):
@@ -29,8 +34,11 @@ class API(object):
             'raw': lambda response: response,
             'json': lambda response: response.json(),
             'text': lambda response: response.text,
+            'stream': lambda response: _streamed(response, stream_path),
         }
         response_type = kwargs.pop('response_type', 'json')
+        # The JSON path of the values to stream (top-level array items).
+        stream_path = kwargs.pop('stream_path', '[*]')
 
         if response_type not in response_types:
             raise ResponseTypeError(
@@ -41,39 +49,100 @@ class API(object):
                 )
             )
 
+        if response_type == 'stream':
+            if asynchronous(self._request):
+                # The asynchronous requests always read the whole body.
+                raise ResponseTypeError(
+                    "Response type 'stream' is not supported "
+                    "by the asynchronous client."
+                )
+
+            kwargs['stream'] = True
+
         response = self._request.perform(method, *args, **kwargs)
-        response.raise_for_status()
 
         processed = response_types[response_type]
 
+        if hasattr(response, '__await__'):
+            # The inner request is asynchronous, so let the caller await
+            # the response before it gets checked and processed.
+            # Import lazily since the module uses the Python 3.5+ syntax.
+            from ..aio.api.base import processed_async
+
+            return processed_async(response, processed)
+
+        response.raise_for_status()
+
         return processed(response)
 
     def __getattr__(self, item):
         if self._resolution is None:
             self._resolution = self._build_resolution()
 
-        return self._resolution.__getattr__(item)
+        attribute = getattr(self._resolution, item)
+        if isinstance(attribute, BoundRoute):
+            # Skip `__getattr__` for the very same attribute next time.
+            self.__dict__[item] = attribute
+
+        return attribute
 
     def _build_resolution(self):
-        """ Traverses the MRO and merges values of
-        `__router` attributes to build a single `Resolution`. """
+        """ Binds the route tree of the class to the instance. """
 
-        router = None
+        cls = type(self)
+        if cls not in _route_trees:
+            _route_trees[cls] = RouteNode.compiled(_merged_router(cls))
 
-        for cls in type(self).mro():
-            attribute = '_{class_name}__{router}'.format(
-                class_name=cls.__name__,
-                router='router'
-            )
+        return BoundRoute(self, _route_trees[cls])
 
-            if hasattr(cls, attribute):
-                router = Router.merged(router, getattr(cls, attribute))
 
-        if router is None:
-            raise Exception(
-                'Could not build a resolution for {type}.'.format(
-                    type=type(self)
-                )
+# The route trees by class, compiled once per class on first use.
+_route_trees = {}
+
+
+def synchronous(api, action):
+    """ Raises unless the API performs requests synchronously,
+    since the action is not supported by the asynchronous client. """
+
+    if asynchronous(api._request):
+        raise TypeError('{action} is not supported '
+                        'by the asynchronous client.'.format(action=action))
+
+
+def _merged_router(cls):
+    """ Traverses the MRO and merges values of
+    `__router` attributes to build a single `Router`. """
+
+    router = None
+
+    for base in cls.mro():
+        attribute = '_{class_name}__{router}'.format(
+            class_name=base.__name__,
+            router='router'
+        )
+
+        if hasattr(base, attribute):
+            router = Router.merged(router, getattr(base, attribute))
+
+    if router is None:
+        raise Exception(
+            'Could not build a resolution for {type}.'.format(
+                type=cls
             )
+        )
+
+    return router
+
+
+def _streamed(response, path):
+    """ Yields the values matching the path while the response body
+    is being read and parsed incrementally. """
 
-        return Resolution(self, router)
+    try:
+        for value in jsonstream.items(
+            response.iter_content(chunk_size=STREAM_CHUNK_SIZE), path
+        ):
+            yield value
+    finally:
+        # Release the connection even if the caller stops iterating early.
+        response.close()
@@ -1,5 +1,21 @@
-from .base import API
+import json
+from contextlib import contextmanager
+
+import six
+
+from .base import API, synchronous
 from .routing import Router
+from ..exceptions import ResponseTypeError
+
+# Limits of a single bundle posted by `import_.post_jsonl`.
+DEFAULT_MAX_ENTITIES = 1000
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Bundle keys of entity types which are not just pluralized.
+BUNDLE_KEYS = {
+    'asset-properties': 'asset_properties',
+    'vulnerability': 'vulnerabilities',
+    'weakness': 'weaknesses',
+}
 
 
 class BundleAPI(API):
@@ -22,6 +38,26 @@ class BundleAPI(API):
             **kwargs
         )
 
+    @route('export.get_jsonl')
+    def _perform(self, sink, **kwargs):
+        """
+        Streams the entities of the exported bundle into the sink
+        (a path or a file-like object) as JSON lines
+        and returns the number of entities
+        """
+
+        return self._exported(self._get, sink, **kwargs)
+
+    @route('export.post_jsonl')
+    def _perform(self, payload, sink, **kwargs):
+        """
+        Streams the entities of the exported bundle into the sink
+        (a path or a file-like object) as JSON lines
+        and returns the number of entities
+        """
+
+        return self._exported(self._post, sink, json=payload, **kwargs)
+
     @route('import_.post')
     def _perform(self, payload, **kwargs):
         return self._post(
@@ -29,3 +65,105 @@ class BundleAPI(API):
             json=payload,
             **kwargs
         )
+
+    @route('import_.post_jsonl')
+    def _perform(self, entities, bundle=None,
+                 max_entities=DEFAULT_MAX_ENTITIES,
+                 max_bytes=DEFAULT_MAX_BYTES, **kwargs):
+        """
+        Imports the entities (an iterable or a path or a file-like object
+        of JSON lines) in bundles of at most `max_entities` entities
+        and `max_bytes` bytes (along with the `bundle` fields, e.g. `source`)
+        and returns the list of responses to the bundles
+        """
+
+        synchronous(self, 'Importing JSON lines')
+
+        responses = []
+
+        with _opened(entities, 'r') as lines:
+            for chunk in _chunked(_entities(lines), max_entities, max_bytes):
+                payload = dict(bundle or {}, type='bundle')
+                for entity in chunk:
+                    payload.setdefault(_bundle_key(entity), []).append(entity)
+
+                responses.append(self._post(
+                    '/ctia/bundle/import',
+                    json=payload,
+                    **kwargs
+                ))
+
+        return responses
+
+    def _exported(self, method, sink, **kwargs):
+        if 'response_type' in kwargs:
+            raise ResponseTypeError("'response_type' cannot be "
+                                    "specified for this method.")
+
+        synchronous(self, 'Exporting JSON lines')
+
+        entities = method('/ctia/bundle/export',
+                          response_type='stream',
+                          stream_path='*[*]',
+                          **kwargs)
+        exported = 0
+
+        with _opened(sink, 'w') as fout:
+            for entity in entities:
+                # Bundles also hold lists of other values (e.g. `external_ids`
+                # or `judgement_refs`), which are not entities to export.
+                if not isinstance(entity, dict) or 'type' not in entity:
+                    continue
+
+                fout.write(six.text_type(json.dumps(entity)) + u'\n')
+                exported += 1
+
+        return exported
+
+
+@contextmanager
+def _opened(target, mode):
+    if isinstance(target, six.string_types):
+        with open(target, mode) as opened:
+            yield opened
+    else:
+        yield target
+
+
+def _entities(lines):
+    for entity in lines:
+        if isinstance(entity, six.string_types):
+            if not entity.strip():
+                continue
+            entity = json.loads(entity)
+        yield entity
+
+
+def _chunked(entities, max_entities, max_bytes):
+    chunk = []
+    size = 0
+
+    for entity in entities:
+        # Roughly the size of the entity within the bundle.
+        entity_size = len(json.dumps(entity)) + 1
+
+        full = len(chunk) >= max_entities or size + entity_size > max_bytes
+        if chunk and full:
+            yield chunk
+            chunk = []
+            size = 0
+
+        chunk.append(entity)
+        size += entity_size
+
+    if chunk:
+        yield chunk
+
+
+def _bundle_key(entity):
+    entity_type = entity['type']
+
+    return BUNDLE_KEYS.get(
+        entity_type,
+        entity_type.replace('-', '_') + 's'
+    )
@@ -1,12 +1,19 @@
 from copy import deepcopy
 
 from .base import API
+from .enrich import merged_responses
 from .routing import Router
+from ..concurrency import fan_out
 
 
 class CommandsAPI(API):
     __router, route = Router.new()
 
+    def __init__(self, request, verdict_cache=None):
+        super(CommandsAPI, self).__init__(request)
+
+        self._verdict_cache = verdict_cache
+
     @route('verdict')
     def _perform(self, payload, **kwargs):
         """
@@ -20,11 +27,7 @@ class CommandsAPI(API):
             **kwargs
         )
 
-        response = self._post(
-            '/iroh/iroh-enrich/deliberate/observables',
-            json=response,
-            **kwargs
-        )
+        response = self._deliberated(response, **kwargs)
         verdicts = build_array_for_verdicts(response)
         return {"response": response, "verdicts": verdicts}
 
@@ -51,6 +54,59 @@ class CommandsAPI(API):
 
         return {"response": response, "targets": result}
 
+    @route('verdict_many')
+    def _perform(self, payloads, max_workers=None, **kwargs):
+        """
+        Runs the verdict command for each of the payloads on a thread pool
+        and yields the results in the order of completion
+        """
+
+        return _many(
+            lambda payload: self.verdict(payload, **kwargs),
+            payloads,
+            max_workers,
+        )
+
+    @route('targets_many')
+    def _perform(self, payloads, max_workers=None, **kwargs):
+        """
+        Runs the targets command for each of the payloads on a thread pool
+        and yields the results in the order of completion
+        """
+
+        return _many(
+            lambda payload: self.targets(payload, **kwargs),
+            payloads,
+            max_workers,
+        )
+
+    def _deliberated(self, observables, **kwargs):
+        if self._verdict_cache is None:
+            return self._post(
+                '/iroh/iroh-enrich/deliberate/observables',
+                json=observables,
+                **kwargs
+            )
+
+        # Only ask for verdicts missing from the cache.
+        cached, misses = self._verdict_cache.split(observables)
+        if not misses:
+            return merged_responses([cached])
+
+        response = self._post(
+            '/iroh/iroh-enrich/deliberate/observables',
+            json=misses,
+            **kwargs
+        )
+        self._verdict_cache.store(misses, response)
+
+        return merged_responses([cached, response])
+
+
+def _many(command, payloads, max_workers):
+    for payload, result, error in fan_out(command, payloads, max_workers):
+        yield {"payload": payload, "result": result, "error": error}
+
 
 def build_array_for_verdicts(verdict_dict):
     verdicts = []
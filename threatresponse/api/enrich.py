@@ -1,11 +1,22 @@
+import json
+from collections import OrderedDict
+from copy import deepcopy
+
 from .base import API
 from .routing import Router
 from .. import urls
+from ..concurrency import fan_out
+from ..exceptions import ResponseTypeError
 
 
 class EnrichAPI(API):
     __router, route = Router.new()
 
+    def __init__(self, request, verdict_cache=None):
+        super(EnrichAPI, self).__init__(request)
+
+        self._verdict_cache = verdict_cache
+
     @route('health')
     def _perform(self, **kwargs):
         """
@@ -34,9 +45,9 @@ class EnrichAPI(API):
         https://visibility.amp.cisco.com/iroh/iroh-enrich/index.html#/Deliberate/post_iroh_iroh_enrich_deliberate_observables
         """
 
-        return self._post(
+        return self._deliberated(
             '/iroh/iroh-enrich/deliberate/observables',
-            json=payload,
+            payload,
             **kwargs
         )
 
@@ -70,9 +81,9 @@ class EnrichAPI(API):
         https://visibility.amp.cisco.com/iroh/iroh-enrich/index.html#/Observe/post_iroh_iroh_enrich_observe_observables
         """
 
-        return self._post(
+        return self._observables(
             '/iroh/iroh-enrich/observe/observables',
-            json=payload,
+            payload,
             **kwargs
         )
 
@@ -106,9 +117,9 @@ class EnrichAPI(API):
         https://visibility.amp.cisco.com/iroh/iroh-enrich/index.html#/Refer/post_iroh_iroh_enrich_refer_observables
         """
 
-        return self._post(
+        return self._observables(
             '/iroh/iroh-enrich/refer/observables',
-            json=payload,
+            payload,
             **kwargs
         )
 
@@ -146,3 +157,121 @@ class EnrichAPI(API):
             '/iroh/iroh-enrich/settings',
             **kwargs
         )
+
+    def _observables(self, url, payload, chunk_size=None, max_workers=None,
+                     **kwargs):
+        """ Posts `payload` (a list of observables) either as is or,
+        if `chunk_size` is specified, split into chunks of at most
+        `chunk_size` observables which are posted concurrently
+        and then merged back into a single response. """
+
+        if not chunk_size or len(payload) <= chunk_size:
+            return self._post(url, json=payload, **kwargs)
+
+        if kwargs.get('response_type', 'json') != 'json':
+            raise ResponseTypeError("Only 'json' response type can be "
+                                    "specified along with 'chunk_size'.")
+
+        chunks = [
+            payload[start:start + chunk_size]
+            for start in range(0, len(payload), chunk_size)
+        ]
+
+        return self._chunked(url, chunks, max_workers, **kwargs)
+
+    def _deliberated(self, url, payload, **kwargs):
+        """ Posts only the observables missing from the verdict cache
+        (if any) and merges their verdicts with the cached ones. """
+
+        if not self._caches_verdicts(kwargs):
+            return self._observables(url, payload, **kwargs)
+
+        cached, misses = self._verdict_cache.split(payload)
+        if not misses:
+            return merged_responses([cached])
+
+        response = self._observables(url, misses, **kwargs)
+        self._verdict_cache.store(misses, response)
+
+        return merged_responses([cached, response])
+
+    def _caches_verdicts(self, kwargs):
+        response_type = kwargs.get('response_type', 'json')
+
+        return self._verdict_cache is not None and response_type == 'json'
+
+    def _chunked(self, url, chunks, max_workers, **kwargs):
+        responses = [None] * len(chunks)
+
+        for index, response, error in fan_out(
+            lambda index: self._post(url, json=chunks[index], **kwargs),
+            range(len(chunks)),
+            max_workers,
+        ):
+            if error is not None:
+                raise error
+
+            responses[index] = response
+
+        return merged_responses(responses)
+
+
+def merged_responses(responses):
+    """ Merges responses of the same enrich endpoint (e.g. for different
+    chunks of observables) into a single one of the very same shape.
+    Module results get grouped by `module_instance_id`, lists of `docs`
+    get concatenated and their `count` values get summed up. """
+
+    result = OrderedDict()
+    modules = OrderedDict()
+    seen = set()
+
+    for response in responses:
+        for key, value in response.items():
+            if key == 'data':
+                result.setdefault(key, None)
+                for module in value:
+                    _merge_module(modules, seen, module)
+            elif isinstance(value, list):
+                result.setdefault(key, []).extend(value)
+            else:
+                result.setdefault(key, value)
+
+    if 'data' in result:
+        result['data'] = [
+            module
+            for results in modules.values()
+            for module in results
+        ]
+
+    return dict(result)
+
+
+def _merge_module(modules, seen, module):
+    results = modules.setdefault(module.get('module_instance_id'), [])
+
+    # Modules of the observe/deliberate endpoints have nested `data`
+    # which gets merged, whereas refer ones are flat, so they are simply
+    # grouped (skipping duplicates, e.g. the very same link from each chunk).
+    if not isinstance(module.get('data'), dict):
+        key = json.dumps(module, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            results.append(module)
+        return
+
+    if not results:
+        # Copy the nested containers to not modify the original module.
+        results.append(deepcopy(module))
+        return
+
+    data = results[0]['data']
+
+    for key, value in module['data'].items():
+        if key not in data:
+            data[key] = deepcopy(value)
+        elif isinstance(value, dict) and 'docs' in value:
+            data[key].setdefault('docs', []).extend(value['docs'])
+            data[key]['count'] = (
+                data[key].get('count', 0) + value.get('count', 0)
+            )
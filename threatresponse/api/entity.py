@@ -1,4 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from six.moves.urllib.parse import parse_qs
+
 from .base import API
+from .export import export_sharded
 from .. import urls
 from ..exceptions import ResponseTypeError
 
@@ -68,6 +73,55 @@ class Search(EntityAPI):
             **kwargs
         )
 
+    def iter(self, query='*', page_size=100, fields=None, prefetch=True,
+             **kwargs):
+        """ Iterates over all the entities matching the query page by page,
+        following the `X-Next` header (i.e. `search_after`) if the server
+        sends it or just the `offset` otherwise, while fetching the next page
+        in the background (unless `prefetch` is `False`). """
+
+        if 'response_type' in kwargs:
+            raise ResponseTypeError("'response_type' cannot be "
+                                    "specified for this method.")
+
+        url = urls.join(self._url, self.NAME)
+        params = dict(kwargs.pop('params', None) or {},
+                      query=query, limit=page_size)
+        if fields:
+            params['fields'] = fields
+
+        def fetch(params):
+            return self._get(url, params=params, response_type='raw',
+                             **kwargs)
+
+        first = fetch(params)
+
+        if hasattr(first, '__await__'):
+            # The inner request is asynchronous, so iterate asynchronously.
+            # Import lazily since the module uses the Python 3.6+ syntax.
+            from ..aio.api.entity import paginated_async
+
+            return paginated_async(fetch, first, params, page_size, prefetch)
+
+        return _paginated(fetch, first, params, page_size, prefetch)
+
+    def export(self, sink, start, end, field='timestamp', query='*',
+               shards=None, max_workers=None, page_size=1000, fields=None,
+               **kwargs):
+        """ Exports all the entities matching the query whose `field` is
+        within the `[start, end)` window (of `datetime` values) into the sink,
+        which is either a queue (entities are put), a file-like object
+        (entities are written as JSON lines) or a callable (called with each
+        entity). The window is split into `shards` time ranges with (roughly)
+        equal numbers of entities (according to `search.count`), which are
+        exported concurrently by `max_workers` threads (8 by default).
+        Returns the number of exported entities. """
+
+        return export_sharded(self, sink, start, end, field=field,
+                              query=query, shards=shards,
+                              max_workers=max_workers, page_size=page_size,
+                              fields=fields, **kwargs)
+
 
 class Metric(EntityAPI):
     NAME = 'metric'
@@ -103,3 +157,52 @@ class IntelEntityAPI(EntityAPI):
             urls.join(self._url, 'external_id', id_),
             **kwargs
         )
+
+
+def _paginated(fetch, response, params, page_size, prefetch):
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    offset = 0
+
+    try:
+        while True:
+            entities = response.json()
+            offset += len(entities)
+
+            params = next_page_params(response, entities, params,
+                                      page_size, offset)
+            next_page = None
+            if params is not None and executor is not None:
+                # Fetch the next page while the current one is processed.
+                next_page = executor.submit(fetch, params)
+
+            for entity in entities:
+                yield entity
+
+            if params is None:
+                return
+
+            response = (
+                next_page.result() if next_page is not None else
+                fetch(params)
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def next_page_params(response, entities, params, page_size, offset):
+    """ Returns the params of the request for the next page of search results
+    or `None` if the current page (of `entities`) is the last one. """
+
+    if len(entities) < page_size:
+        return None
+
+    next_page = response.headers.get('X-Next')
+    if next_page:
+        # The query string with `search_after` (and `offset`) of the next page.
+        return dict(params, **dict(
+            (name, values if len(values) > 1 else values[0])
+            for name, values in parse_qs(next_page).items()
+        ))
+
+    return dict(params, offset=offset)
@@ -0,0 +1,179 @@
+import calendar
+import json
+import threading
+from datetime import datetime, timedelta
+
+import six
+
+from .base import synchronous
+from ..concurrency import fan_out
+
+EPOCH = datetime(1970, 1, 1)
+# The number of time slices counted per shard to balance the shards.
+SLICES_PER_SHARD = 4
+# The number of times too dense slices get split into smaller ones.
+REFINEMENTS = 3
+
+
+def export_sharded(search, sink, start, end, field='timestamp', query='*',
+                   shards=None, max_workers=None, page_size=1000,
+                   fields=None, **kwargs):
+    """
+    Exports the entities matching the query whose `field` is within
+    the `[start, end)` time window into the sink (see `Search.export`).
+    Returns the number of exported entities.
+    """
+
+    synchronous(search, 'Sharded export')
+
+    # The params of the caller apply to both counting and searching,
+    # whereas the query is always the ranged one.
+    params = kwargs.pop('params', None) or {}
+    workers = max_workers or shards or 8
+    shards = shards or workers
+    start, end = _milliseconds(start), _milliseconds(end)
+
+    def ranged(since, until):
+        return '({query}) AND {field}:["{since}" TO "{until}"}}'.format(
+            query=query,
+            field=field,
+            since=_timestamp(since),
+            until=_timestamp(until),
+        )
+
+    def count(window):
+        return search.count(params=dict(params, query=ranged(*window)),
+                            **kwargs)
+
+    def counted(windows):
+        return _completed(fan_out(count, windows, workers))
+
+    slices = _slices(start, end, shards * SLICES_PER_SHARD)
+    counts = dict(counted(slices))
+
+    for _ in range(REFINEMENTS):
+        # Split the slices holding more than a shard should, so they can be
+        # spread across several shards (e.g. bursts of entities).
+        target = float(sum(counts.values())) / shards
+        refined = dict(
+            (window, _slices(window[0], window[1], SLICES_PER_SHARD))
+            for window in slices
+            if counts[window] > target and window[1] - window[0] > 1
+        )
+        if not refined:
+            break
+
+        for window in refined:
+            del counts[window]
+        counts.update(counted(
+            part for parts in refined.values() for part in parts
+        ))
+        slices = [part
+                  for window in slices
+                  for part in refined.get(window, [window])]
+
+    write = _writer(sink)
+    stopped = threading.Event()
+
+    def export(window):
+        written = 0
+
+        for entity in search.iter(query=ranged(*window), page_size=page_size,
+                                  fields=fields, params=params, **kwargs):
+            if stopped.is_set():
+                break
+            write(entity)
+            written += 1
+
+        return written
+
+    try:
+        return sum(
+            result for _, result in _completed(fan_out(
+                export,
+                _balanced(slices, counts, shards),
+                workers,
+            ))
+        )
+    finally:
+        # Stop the other shards as soon as one of them fails.
+        stopped.set()
+
+
+def _completed(results):
+    for item, result, error in results:
+        if error is not None:
+            raise error
+        yield item, result
+
+
+def _slices(start, end, number):
+    """ Splits the `[start, end)` window into (at most) `number`
+    windows of (almost) equal length. """
+
+    number = max(min(number, end - start), 1)
+    bounds = [start + (end - start) * index // number
+              for index in range(number + 1)]
+
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _balanced(slices, counts, shards):
+    """ Groups consecutive slices into (at most) `shards` windows
+    with (roughly) equal numbers of entities. The windows still cover
+    the whole time range, so entities created meanwhile are not missed. """
+
+    total = sum(counts.values())
+    if not total:
+        return [(slices[0][0], slices[-1][1])]
+
+    target = float(total) / shards
+    windows = []
+    since = slices[0][0]
+    accumulated = 0
+
+    for window in slices:
+        accumulated += counts[window]
+
+        if accumulated >= target * (len(windows) + 1) or window is slices[-1]:
+            windows.append((since, window[1]))
+            since = window[1]
+
+    return windows
+
+
+def _writer(sink):
+    """ Returns a thread-safe function writing entities to the sink. """
+
+    lock = threading.Lock()
+
+    if hasattr(sink, 'put'):  # E.g. `queue.Queue` (thread-safe itself).
+        return sink.put
+
+    if hasattr(sink, 'write'):  # A file-like object gets JSON lines.
+        def write(entity):
+            line = six.text_type(json.dumps(entity)) + u'\n'
+            with lock:
+                sink.write(line)
+    else:
+        def write(entity):
+            with lock:
+                sink(entity)
+
+    return write
+
+
+def _milliseconds(moment):
+    if moment.utcoffset() is not None:
+        moment = moment.replace(tzinfo=None) - moment.utcoffset()
+
+    seconds = calendar.timegm(moment.timetuple())
+
+    return seconds * 1000 + moment.microsecond // 1000
+
+
+def _timestamp(milliseconds):
+    moment = EPOCH + timedelta(milliseconds=milliseconds)
+
+    return '{}.{:03d}Z'.format(moment.strftime('%Y-%m-%dT%H:%M:%S'),
+                               moment.microsecond // 1000)
@@ -1,3 +1,4 @@
 # Make the classes below importable from the `.routing` subpackage directly.
 from .resolution import Resolution
 from .router import Router
+from .tree import BoundRoute, RouteNode
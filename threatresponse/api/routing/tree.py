@@ -0,0 +1,64 @@
+from .resolution import Resolution
+
+
+class RouteNode(object):
+    """ Represents a node of the prefix tree of the routes of a `Router`.
+    `tree.children['x'].children['y']` would contain `node.route = ['x', 'y']`
+    and the method registered by the `'x.y'` route (if any). """
+
+    __slots__ = ('router', 'route', 'method', 'children')
+
+    def __init__(self, router, route=None, method=None):
+        self.router = router
+        self.route = route or []
+        self.method = method
+        self.children = {}
+
+    @classmethod
+    def compiled(cls, router):
+        """ Returns the root of the prefix tree of the router's routes. """
+
+        root = cls(router)
+
+        for route, method in router._routes.items():
+            node = root
+            for item in route.split('.'):
+                if item not in node.children:
+                    node.children[item] = cls(router, node.route + [item])
+                node = node.children[item]
+            node.method = method
+
+        return root
+
+
+class BoundRoute(object):
+    """ Represents a node of the route tree bound to an owner.
+    `bound.x.y(...)` invokes the method registered by the `'x.y'` route.
+
+    Child nodes get bound on first access and then stored as attributes,
+    so subsequent attribute chains resolve without any allocation.
+    Routes missing from the tree fall back to `Resolution`
+    (which fails on call). """
+
+    def __init__(self, owner, node):
+        self._owner = owner
+        self._node = node
+
+    def __call__(self, *args, **kwargs):
+        method = self._node.method
+        if method is None:
+            # Not a route itself but a prefix of some other routes.
+            method = self._node.router.resolve('.'.join(self._node.route))
+
+        return method(self._owner, *args, **kwargs)
+
+    def __getattr__(self, item):
+        node = self._node.children.get(item)
+        if node is None:
+            return Resolution(self._owner, self._node.router,
+                              self._node.route + [item])
+
+        bound = BoundRoute(self._owner, node)
+        self.__dict__[item] = bound
+
+        return bound
@@ -7,66 +7,225 @@ from .api.response import ResponseAPI
 from .api.commands import CommandsAPI
 from .api.sse import SSEDeviceAPI, SSETenantAPI
 from .api.user_mgmt import UserMgmtAPI
-from .exceptions import CredentialsError
+from .codec import codec_for
+from .exceptions import CredentialsError, TransportError
 from .request.authorized import ClientAuthorizedRequest, TokenAuthorizedRequest
+from .request.base import Request
+from .request.caching import CachingRequest, ResponseCache
+from .request.compressed import CompressedRequest
+from .request.encoded import EncodedRequest
+from .request.http2 import HTTP2Request
 from .request.logged import LoggedRequest
 from .request.proxied import ProxiedRequest
+from .request.rate_limited import RateLimitedRequest, TokenBucket
 from .request.relative import RelativeRequest
+from .request.retrying import RetryingRequest
 from .request.standard import StandardRequest
 from .request.timed import TimedRequest
-from .urls import url_for
+from .tokens import default_token_cache
+from .urls import Environment
+from .verdicts import VerdictCache
+
+
+FAMILIES = ('visibility', 'private_intel', 'global_intel')
+TRANSPORTS = ('http1', 'http2')
 
 
 class ThreatResponse(object):
+    # The building blocks below can be overridden by subclasses
+    # (e.g. by the asynchronous client) to reuse the same request chain.
+    _standard_request = StandardRequest
+    _proxied_request = ProxiedRequest
+    _http2_request = HTTP2Request
+    _encoded_request = EncodedRequest
+    _logged_request = LoggedRequest
+    _retrying_request = RetryingRequest
+    _rate_limited_request = RateLimitedRequest
+    _caching_request = CachingRequest
+    _compressed_request = CompressedRequest
+    _client_authorized_request = ClientAuthorizedRequest
+    _token_authorized_request = TokenAuthorizedRequest
+    _commands_api = CommandsAPI
+    _enrich_api = EnrichAPI
 
     def __init__(self, client_id=None, client_password=None,
                  token=None, **options):
 
+        transport = options.get('transport', 'http1')
         proxy = options.get('proxy')
         timeout = options.get('timeout')
         logger = options.get('logger')
+        retry = options.get('retry')
+        codec = options.get('codec')
+        codec = codec_for(codec) if codec else None
         region = options.get('region')
-        environment = options.get('environment')
+        # Resolve (and validate) the URLs of all the regions just once.
+        environment = Environment.resolved(options.get('environment'))
+        lazy_auth = options.get('lazy_auth', False)
+        token_refresh_margin = options.get('token_refresh_margin')
+        token_refresh_in_background = options.get(
+            'token_refresh_in_background', False
+        )
+        token_cache = options.get('token_cache')
+        if token_cache is True:
+            token_cache = default_token_cache
 
-        request = ProxiedRequest(proxy) if proxy else StandardRequest()
+        pool_options = dict(
+            (name, options[name])
+            for name in (
+                'pool_connections',
+                'pool_maxsize',
+                'pool_block',
+                'max_retries',
+                'keep_alive',
+            )
+            if name in options
+        )
+
+        if isinstance(transport, Request):
+            # E.g. `InMemoryRequest` or a custom one.
+            ignored = sorted(pool_options) + (['proxy'] if proxy else [])
+            if ignored:
+                raise TransportError(
+                    'Options {options} cannot be combined with an instance '
+                    'of a `Request` subclass as the transport, configure '
+                    'the instance itself instead.'.format(
+                        options=', '.join(map(repr, ignored)),
+                    )
+                )
+            request = transport
+        elif transport == 'http2':
+            request = self._http2_request(proxy, **pool_options)
+        elif transport == 'http1':
+            request = (
+                self._proxied_request(proxy, **pool_options) if proxy else
+                self._standard_request(**pool_options)
+            )
+        else:
+            raise TransportError(
+                'Unsupported transport {transport}, must be either one of: '
+                '{transports} or an instance of a `Request` subclass.'.format(
+                    transport=repr(transport),
+                    transports=', '.join(map(repr, TRANSPORTS)),
+                )
+            )
+        self._transport = request
+        if codec:
+            request = self._encoded_request(request, codec)
+        buckets = _token_buckets(options.get('rate_limit'))
+        if buckets:
+            # Every request sent over the wire (i.e. every retry and token
+            # request too) takes a token from the bucket of its family
+            # (the first one of the families sharing the same URL).
+            request = self._rate_limited_request(
+                request,
+                dict((environment.url_for(region, family), buckets[family])
+                     for family in reversed(FAMILIES) if family in buckets),
+                block=options.get('rate_limit_block', True),
+            )
         request = TimedRequest(request, timeout) if timeout else request
-        request = LoggedRequest(request, logger) if logger else request
+        request = self._logged_request(request, logger) if logger else request
+        if retry:
+            request = self._retrying_request(request, **_options(retry))
         if token:
-            request = TokenAuthorizedRequest(request,
-                                             token,
-                                             region=region,
-                                             environment=environment)
+            request = self._token_authorized_request(request,
+                                                     token,
+                                                     region=region,
+                                                     environment=environment,
+                                                     lazy=lazy_auth)
         elif client_id and client_password:
-            request = ClientAuthorizedRequest(request,
-                                              client_id,
-                                              client_password,
-                                              region=region,
-                                              environment=environment)
+            request = self._client_authorized_request(
+                request,
+                client_id,
+                client_password,
+                region=region,
+                environment=environment,
+                lazy=lazy_auth,
+                refresh_margin=token_refresh_margin,
+                refresh_in_background=token_refresh_in_background,
+                token_cache=token_cache or None,
+            )
         else:
             raise CredentialsError(
                 'Credentials must be supplied either '
                 'as a pair of client_id and client_password or '
                 'as a single token.'
             )
+        self._authorized = request
+
+        compression = _per_family(options.get('compression'))
+        cache = options.get('cache')
+        self._cache = (
+            ResponseCache(**_options(cache)) if cache else None
+        )
+        verdict_cache = options.get('verdict_cache')
+        self._verdict_cache = (
+            VerdictCache(**_options(verdict_cache)) if verdict_cache else None
+        )
+        requests_by_family = {}
 
         def request_for(family):
-            return RelativeRequest(
-                request,
-                url_for(region, family, environment)
-            )
+            # All the APIs of the same family share a single request,
+            # whereas all the families share a single response cache.
+            if family not in requests_by_family:
+                family_request = request
+                if family in compression:
+                    family_request = self._compressed_request(
+                        family_request,
+                        codec,
+                        **_options(compression[family])
+                    )
+                # Cache hits neither count towards rate limits nor wait.
+                if self._cache is not None:
+                    family_request = self._caching_request(family_request,
+                                                           self._cache)
+
+                requests_by_family[family] = RelativeRequest(
+                    family_request,
+                    environment.url_for(region, family)
+                )
+
+            return requests_by_family[family]
 
         self._inspect = InspectAPI(request_for('visibility'))
-        self._enrich = EnrichAPI(request_for('visibility'))
+        self._enrich = self._enrich_api(request_for('visibility'),
+                                        verdict_cache=self._verdict_cache)
         self._int = IntAPI(request_for('visibility'))
         self._response = ResponseAPI(request_for('visibility'))
         self._private_intel = PrivateIntel(request_for('private_intel'))
         self._profile = ProfileAPI(request_for('visibility'))
         self._global_intel = GlobalIntel(request_for('global_intel'))
-        self._commands = CommandsAPI(request_for('visibility'))
+        self._commands = self._commands_api(
+            request_for('visibility'),
+            verdict_cache=self._verdict_cache
+        )
         self._user_mgmt = UserMgmtAPI(request_for('visibility'))
         self._sse_device = SSEDeviceAPI(request_for('visibility'))
         self._sse_tenant = SSETenantAPI(request_for('visibility'))
 
+    def close(self):
+        """ Stops refreshing the token in background (if it does)
+        and closes the pooled connections. """
+
+        for request in (self._authorized, self._transport):
+            close = getattr(request, 'close', None)
+            if close is not None:
+                close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @property
+    def verdict_cache(self):
+        return self._verdict_cache
+
     @property
     def inspect(self):
         return self._inspect
@@ -110,3 +269,37 @@ class ThreatResponse(object):
     @property
     def sse_tenant(self):
         return self._sse_tenant
+
+
+def _per_family(option):
+    """ Returns the values of an option by API family. The option is either
+    a single value for every family or a dict of values by family. """
+
+    if not option:
+        return {}
+
+    if isinstance(option, dict) and all(
+        key in FAMILIES for key in option
+    ):
+        return dict(
+            (family, value) for family, value in option.items() if value
+        )
+
+    return dict((family, option) for family in FAMILIES)
+
+
+def _options(option):
+    # Options like `cache=True` mean the defaults.
+    return option if isinstance(option, dict) else {}
+
+
+def _token_buckets(rate_limit):
+    """ Builds a token bucket per API family from the `rate_limit` option.
+    Each limit is either a rate (in requests per second) or a dict
+    of `rate` and (optionally) `burst`. """
+
+    return dict(
+        (family, TokenBucket(**_options(limit)) if isinstance(limit, dict)
+         else TokenBucket(limit))
+        for family, limit in _per_family(rate_limit).items()
+    )
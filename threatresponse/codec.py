@@ -0,0 +1,111 @@
+import abc
+import json
+
+import six
+
+from .exceptions import CodecError
+
+# Faster JSON libraries are optional.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class Codec(six.with_metaclass(abc.ABCMeta, object)):
+    """
+    Interface for encoding and decoding JSON bodies.
+    """
+
+    content_type = 'application/json'
+
+    @abc.abstractmethod
+    def dumps(self, value):
+        """ Returns the value encoded as UTF-8 JSON bytes. """
+
+    @abc.abstractmethod
+    def loads(self, data):
+        """ Returns the value decoded from JSON bytes (or text). """
+
+
+class StandardCodec(Codec):
+    """
+    Uses the built-in `json` module.
+    """
+
+    def dumps(self, value):
+        return json.dumps(value).encode('utf-8')
+
+    def loads(self, data):
+        if isinstance(data, six.binary_type):
+            data = data.decode('utf-8')
+
+        return json.loads(data)
+
+
+class OrjsonCodec(StandardCodec):
+    """
+    Uses the `orjson` library (falls back to the built-in `json` module
+    for values it does not support, e.g. dicts with non-string keys).
+    """
+
+    def dumps(self, value):
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            return super(OrjsonCodec, self).dumps(value)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonCodec(StandardCodec):
+    """
+    Uses the `ujson` library.
+    """
+
+    def dumps(self, value):
+        return ujson.dumps(value, ensure_ascii=False,
+                           escape_forward_slashes=False).encode('utf-8')
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+CODECS = {
+    'orjson': (OrjsonCodec, lambda: orjson),
+    'ujson': (UjsonCodec, lambda: ujson),
+    'json': (StandardCodec, lambda: json),
+}
+# The fastest codecs go first.
+PREFERENCE = ('orjson', 'ujson', 'json')
+
+
+def codec_for(codec='auto'):
+    """ Returns a codec by its name (`'auto'` means the fastest one
+    available) or the codec itself if it is already an instance. """
+
+    if isinstance(codec, Codec):
+        return codec
+
+    if codec == 'auto':
+        codec = next(name for name in PREFERENCE if CODECS[name][1]())
+
+    if codec not in CODECS:
+        raise CodecError(
+            'Unsupported codec {codec}, must be one of: {codecs}.'.format(
+                codec=repr(codec),
+                codecs=', '.join(map(repr, ('auto',) + PREFERENCE)),
+            )
+        )
+
+    cls, library = CODECS[codec]
+    if library() is None:
+        raise CodecError('The {} library is not installed.'.format(codec))
+
+    return cls()
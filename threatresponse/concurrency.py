@@ -0,0 +1,48 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def fan_out(function, items, max_workers=None):
+    """
+    Calls `function(item)` for each item on a bounded thread pool
+    and yields `(item, result, error)` tuples in the order of completion.
+
+    At most `max_workers` items are in flight at any moment, so `items`
+    may be a lazy iterable which is consumed only as fast as it is processed.
+    A failure of a single item does not affect the other ones,
+    it is just reported as the `error` of that item (`result` is `None`).
+    """
+
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    items = iter(items)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+
+    def submit():
+        for item in items:
+            pending[executor.submit(function, item)] = item
+            if len(pending) >= max_workers:
+                break
+
+    try:
+        submit()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                result = None if error is not None else future.result()
+
+                yield item, result, error
+
+            submit()
+    finally:
+        # Do not start anything new if the caller has stopped iterating.
+        for future in pending:
+            future.cancel()
+
+        executor.shutdown(wait=True)
@@ -2,6 +2,10 @@ class RegionError(ValueError):
     pass
 
 
+class EnvironmentValueError(ValueError):
+    pass
+
+
 class RouteError(ValueError):
     pass
 
@@ -12,3 +16,19 @@ class ResponseTypeError(ValueError):
 
 class CredentialsError(ValueError):
     pass
+
+
+class RateLimitError(RuntimeError):
+    pass
+
+
+class CodecError(ValueError):
+    pass
+
+
+class TransportError(ValueError):
+    pass
+
+
+class CassetteError(LookupError):
+    pass
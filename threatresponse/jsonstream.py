@@ -0,0 +1,263 @@
+"""
+Incremental parsing of large JSON documents, e.g. streamed responses.
+
+Only the values matching a path get parsed (one at a time), so memory usage
+is bounded by the largest of them rather than by the whole document.
+A path consists of object keys separated by dots (`*` matches any key)
+and `[*]` matching any array item, e.g. `'data[*]'` matches the items of the
+`data` array, whereas `'*[*]'` matches the items of all the arrays of an object
+(like the entities of a bundle).
+"""
+
+import codecs
+import json
+import re
+
+import six
+
+PATH_STEP = re.compile(r'\[\*\]|[^.\[\]]+')
+WHITESPACE = re.compile(r'\s*')
+STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+SCALAR = re.compile(r'[^\s\[\]{}:,"]+')
+# Skips strings while looking for brackets. A lone quote means
+# the string is cut off at the end of the buffer (i.e. more data is needed).
+BRACKET = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]|"', re.DOTALL)
+
+ANY_ITEM = object()
+ANY_KEY = '*'
+
+
+def items(chunks, path, with_paths=False):
+    """
+    Yields the values matching the path (or `(path, value)` pairs where `path`
+    is a tuple of actual keys and indices if `with_paths` is `True`)
+    of the JSON document consisting of the chunks (either bytes or text).
+    """
+
+    parser = Parser(path)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    for chunk in chunks:
+        if isinstance(chunk, six.binary_type):
+            chunk = decoder.decode(chunk)
+
+        for found in parser.feed(chunk):
+            yield found if with_paths else found[1]
+
+    for found in parser.feed(decoder.decode(b'', True), final=True):
+        yield found if with_paths else found[1]
+
+
+def steps(path):
+    return [
+        ANY_ITEM if step == '[*]' else step
+        for step in PATH_STEP.findall(path or '')
+    ]
+
+
+class Parser(object):
+    """
+    Incrementally parses a JSON document fed chunk by chunk and yields
+    `(path, value)` pairs of the values matching the path.
+    """
+
+    def __init__(self, path):
+        self._steps = steps(path)
+        self._buffer = ''
+        self._position = 0
+        self._frames = []  # Pairs of a container and its current key/index.
+        self._expect = 'value'
+        self._value = None  # The state of the value being read (if any).
+
+    def feed(self, text, final=False):
+        # Drop the data that has already been handled.
+        cut = self._position if self._value is None else self._value['start']
+        self._buffer = self._buffer[cut:] + text
+        self._position -= cut
+        if self._value is not None:
+            self._value['start'] = 0
+
+        while True:
+            if self._value is not None:
+                found = self._read_value(final)
+                if found is None:
+                    break
+                if found is not False:
+                    yield found
+                continue
+
+            self._position = WHITESPACE.match(
+                self._buffer, self._position
+            ).end()
+
+            if self._position == len(self._buffer):
+                break
+
+            if not self._next_token(final):
+                break
+
+        if final and self._expect != 'end':
+            raise ValueError('Incomplete JSON document.')
+
+    def _next_token(self, final):
+        """ Handles the next structural token (or starts reading a value),
+        returns `False` if more data is needed. """
+
+        char = self._buffer[self._position]
+
+        if self._expect == 'value' and char not in ']}':
+            self._start_value()
+            return True
+
+        if self._expect == 'key' and char == '"':
+            match = STRING.match(self._buffer, self._position)
+            if match is None:
+                return self._need_more(final)
+            self._frames[-1][1] = json.loads(match.group())
+            self._position = match.end()
+            self._expect = 'colon'
+            return True
+
+        if self._expect == 'colon' and char == ':':
+            self._position += 1
+            self._expect = 'value'
+            return True
+
+        if self._expect == 'comma' and char == ',':
+            self._position += 1
+            frame = self._frames[-1]
+            if frame[0] == 'array':
+                frame[1] += 1
+                self._expect = 'value'
+            else:
+                self._expect = 'key'
+            return True
+
+        closing = {'array': ']', 'object': '}'}
+        container, key = self._frames[-1] if self._frames else (None, None)
+        # Containers close either after a value or right after opening
+        # (but never right after a comma).
+        empty = key == 0 if container == 'array' else key is None
+        closable = self._expect == 'comma' or (
+            self._expect in ('value', 'key') and empty
+        )
+        if char == closing.get(container) and closable:
+            self._position += 1
+            self._frames.pop()
+            self._value_done()
+            return True
+
+        raise ValueError('Unexpected {char!r} at {position} '
+                         'of JSON document.'.format(char=char,
+                                                    position=self._position))
+
+    def _start_value(self):
+        path = tuple(key for _, key in self._frames)
+        matching = self._matching(path)
+
+        char = self._buffer[self._position]
+
+        if matching == 'prefix' and char in '[{':
+            # Go deeper towards the values matching the path.
+            self._position += 1
+            if char == '[':
+                self._frames.append(['array', 0])
+                self._expect = 'value'
+            else:
+                self._frames.append(['object', None])
+                self._expect = 'key'
+            return
+
+        # Either read the matching value or skip it.
+        self._value = {
+            'path': path,
+            'keep': matching == 'full',
+            'start': self._position,
+            'first': char,
+            'depth': 0,
+        }
+
+    def _read_value(self, final):
+        """ Returns the `(path, value)` pair of the value that has been read,
+        `False` if it has been skipped or `None` if more data is needed. """
+
+        value = self._value
+        char = value['first']
+
+        if char in '[{':
+            end = self._container_end(value)
+        else:
+            match = (STRING if char == '"' else SCALAR).match(
+                self._buffer, value['start']
+            )
+            cut_off = match is None or (
+                char != '"' and match.end() == len(self._buffer)
+            )
+            if cut_off and not final:
+                end = None
+            elif match is None:
+                raise ValueError('Invalid JSON value at {}.'.format(
+                    value['start']
+                ))
+            else:
+                end = match.end()
+
+        if end is None:
+            if not value['keep']:
+                # No need to keep the beginning of a skipped value.
+                value['start'] = self._position
+            return None
+
+        self._value = None
+        self._position = end
+        self._value_done()
+
+        if not value['keep']:
+            return False
+
+        text = self._buffer[value['start']:end]
+
+        return value['path'], json.loads(text)
+
+    def _container_end(self, value):
+        """ Returns the end of the container being read (or `None`). """
+
+        if value['depth'] == 0:
+            self._position = value['start']
+
+        for match in BRACKET.finditer(self._buffer, self._position):
+            token = match.group()
+
+            if token == '"':
+                self._position = match.start()
+                return None
+            if token in '[{':
+                value['depth'] += 1
+            elif token in ']}':
+                value['depth'] -= 1
+                if value['depth'] == 0:
+                    return match.end()
+
+        self._position = len(self._buffer)
+        return None
+
+    def _value_done(self):
+        self._expect = 'comma' if self._frames else 'end'
+
+    def _matching(self, path):
+        if len(path) > len(self._steps):
+            return None
+
+        for step, key in zip(self._steps, path):
+            if step is ANY_ITEM:
+                if not isinstance(key, int):
+                    return None
+            elif isinstance(key, int) or step not in (ANY_KEY, key):
+                return None
+
+        return 'full' if len(path) == len(self._steps) else 'prefix'
+
+    def _need_more(self, final):
+        if final:
+            raise ValueError('Incomplete JSON document.')
+        return False
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+
+import six
+
+from .api.inspect import InspectAPI
+from .api.intel import GlobalIntel
+from .client import ThreatResponse
+from .exceptions import CredentialsError, RegionError
+from .request.failover import FailoverRequest, RegionHealth
+
+# The APIs serving the very same data in every region.
+REGIONLESS_APIS = ('global_intel', 'inspect')
+
+
+class MultiRegionThreatResponse(object):
+    """
+    Holds clients for several regions of the same org and routes requests
+    to the APIs serving the same data in every region (i.e. `global_intel`
+    and `inspect`) to the healthiest region by rolling latency and error rate,
+    failing over to the other regions on connection errors, timeouts
+    or `5xx` responses. Only reads (and inspecting) fail over, whereas the
+    requests which may have side effects (e.g. creating entities) always
+    use the primary region, as well as the other APIs (e.g. `enrich`
+    or `private_intel`) do, since their data are regional.
+
+    Usage example:
+        client = MultiRegionThreatResponse(
+            {'us': (us_client_id, us_client_password),
+             'eu': (eu_client_id, eu_client_password)},
+            primary='eu',
+        )
+        client.global_intel.sighting.search.get(params={'query': '*'})
+    """
+
+    _client = ThreatResponse
+    _failover_request = FailoverRequest
+
+    def __init__(self, credentials, primary=None, health=None, **options):
+        if not credentials:
+            raise CredentialsError('Credentials must be supplied '
+                                   'for at least one region.')
+
+        regions = list(credentials)
+        if primary is None:
+            primary = regions[0]
+        if primary not in credentials:
+            raise RegionError(
+                'Primary region {} must be one of: {}.'.format(
+                    repr(primary), ', '.join(map(repr, regions))
+                )
+            )
+
+        # The primary region is preferred while the regions are equally
+        # healthy (e.g. before any of them gets measured).
+        regions.remove(primary)
+        regions.insert(0, primary)
+
+        self._health = health or RegionHealth()
+        self._clients = OrderedDict(
+            (region, self._client_for(region, credentials[region],
+                                      lazy=region != primary, **options))
+            for region in regions
+        )
+        self._primary = self._clients[primary]
+
+        self._global_intel = GlobalIntel(self._routed('global_intel'))
+        # Inspecting has no side effects, so it may be repeated anywhere.
+        self._inspect = InspectAPI(
+            self._routed('inspect', methods=['GET', 'HEAD', 'POST'])
+        )
+
+    @property
+    def clients(self):
+        """ The clients by region (the primary one first). """
+
+        return OrderedDict(self._clients)
+
+    @property
+    def primary(self):
+        return self._primary
+
+    @property
+    def health(self):
+        return self._health
+
+    @property
+    def global_intel(self):
+        return self._global_intel
+
+    @property
+    def inspect(self):
+        return self._inspect
+
+    def close(self):
+        for client in self._clients.values():
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, item):
+        if item == '_primary':  # Not initialized (yet).
+            raise AttributeError(item)
+
+        # The regional APIs of the primary client.
+        return getattr(self._primary, item)
+
+    def _client_for(self, region, credentials, lazy=False, **options):
+        # Clients for the other regions must not fail on init
+        # if their regions are down at that moment.
+        if lazy:
+            options['lazy_auth'] = True
+
+        if isinstance(credentials, six.string_types):
+            return self._client(token=credentials, region=region, **options)
+
+        client_id, client_password = credentials
+
+        return self._client(client_id, client_password, region=region,
+                            **options)
+
+    def _routed(self, api, methods=None):
+        return self._failover_request(
+            OrderedDict((region, getattr(client, api)._request)
+                        for region, client in self._clients.items()),
+            self._health,
+            methods=methods
+        )
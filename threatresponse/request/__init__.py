@@ -1,8 +1,17 @@
 # Make the classes below importable from the `.request` subpackage directly.
 from .authorized import ClientAuthorizedRequest, TokenAuthorizedRequest
+from .caching import CachingRequest, ResponseCache
+from .cassette import Cassette, RecordingRequest, ReplayingRequest
+from .compressed import CompressedRequest
+from .encoded import EncodedRequest
+from .failover import FailoverRequest, RegionHealth
+from .http2 import HTTP2Request
+from .in_memory import InMemoryRequest
 from .logged import LoggedRequest
 from .proxied import ProxiedRequest
+from .rate_limited import RateLimitedRequest, TokenBucket
 from .relative import RelativeRequest
 from .response import Response
+from .retrying import RetryingRequest
 from .standard import StandardRequest
 from .timed import TimedRequest
@@ -1,17 +1,39 @@
+import threading
+import time
+import weakref
+
 from six.moves.http_client import UNAUTHORIZED
 from six.moves.urllib.parse import urljoin
 
 from .base import Request
+from ..tokens import token_key
 from ..urls import url_for
 
 
 class ClientAuthorizedRequest(Request):
     """
     Provides authorization header for inner request.
+    Thread-safe: may be shared by any number of threads.
+    If `lazy`, the token is requested on the very first request
+    rather than on init (concurrent first requests share a single one).
+    The token is regenerated `refresh_margin` seconds before it expires,
+    either by the first request to notice that or, if `refresh_in_background`,
+    by a background (daemon) thread right on time. If that fails, the current
+    token keeps being used (and the refresh retried every so often) until
+    it actually expires.
+    If `token_cache` is specified, the token is shared with any other request
+    having the same credentials and region/environment via that cache.
+    The background thread never keeps the request alive, and `close` stops it.
     """
 
+    DEFAULT_REFRESH_MARGIN = 30  # Seconds.
+    # How long to wait before trying again if an early refresh fails.
+    BACKGROUND_RETRY_DELAY = 5  # Seconds.
+
     def __init__(self, request, client_id,
-                 client_password, region=None, environment=None):
+                 client_password, region=None, environment=None,
+                 lazy=False, refresh_margin=None, refresh_in_background=False,
+                 token_cache=None):
         self._request = request
         self._client_id = client_id
         self._client_password = client_password
@@ -21,21 +43,156 @@ class ClientAuthorizedRequest(Request):
             '/iroh/oauth2/token'
         )
 
-        self._token = self._request_token()
+        self._refresh_margin = (
+            self.DEFAULT_REFRESH_MARGIN if refresh_margin is None else
+            refresh_margin
+        )
+        self._refresh_in_background = refresh_in_background
+        self._refresh_timer = None
+
+        self._token_cache = token_cache
+        self._token_key = token_key(client_id, client_password,
+                                    self._token_url)
+
+        self._token = None
+        self._token_expires_at = None
+        self._token_lock = threading.Lock()
+        # When requests may try to refresh the token early again.
+        self._refresh_retry_at = 0
+
+        if not lazy:
+            with self._token_lock:
+                self._update_token()
 
     def perform(self, method, url, **kwargs):
         headers = kwargs.pop('headers', {})
 
-        response = self._perform(method, url, headers, **kwargs)
+        token = self._token
+        if token is None:
+            token = self._refresh_token(token)
+        elif self._expires_soon(self._token_expires_at):
+            token = self._refresh_token_early(token)
+
+        response = self._perform(method, url, headers, token, **kwargs)
 
         if response.status_code == UNAUTHORIZED:
+            # Release the connection of the response being discarded.
+            response.close()
             # The token has already expired (most probably),
             # so regenerate it again and try one more time
-            self._token = self._request_token()
-            response = self._perform(method, url, headers, **kwargs)
+            token = self._refresh_token(token)
+            response = self._perform(method, url, headers, token, **kwargs)
 
         return response
 
+    def close(self):
+        """ Stops refreshing the token in background (if it does). """
+
+        with self._token_lock:
+            self._refresh_in_background = False
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+
+    def _refresh_token(self, expired):
+        with self._token_lock:
+            # Some other thread may have already refreshed the token
+            # while this one was waiting for the lock, so just reuse it.
+            if self._token is expired:
+                self._update_token(expired)
+
+            return self._token
+
+    def _refresh_token_early(self, token):
+        if self._refresh_retry_at > time.time():
+            # A recent refresh has failed, so keep using the current token.
+            return token
+
+        with self._token_lock:
+            # Some other thread may have already refreshed the token
+            # (or failed to) while this one was waiting for the lock.
+            if self._token is not token or \
+                    self._refresh_retry_at > time.time():
+                return self._token
+
+            try:
+                self._update_token(token)
+            except Exception:
+                if not self._token_expires_at > time.time():
+                    raise
+                # The current token is still valid, so keep using it
+                # rather than failing (or retrying) every request meanwhile.
+                self._refresh_retry_at = min(
+                    time.time() + self.BACKGROUND_RETRY_DELAY,
+                    self._token_expires_at
+                )
+
+            return self._token
+
+    def _expires_soon(self, expires_at):
+        if expires_at is None:
+            return False
+
+        return expires_at - self._refresh_margin <= time.time()
+
+    def _update_token(self, expired=None):
+        # Must be called with the token lock acquired.
+        if self._token_cache is None:
+            self._token, self._token_expires_at = self._request_token()
+        else:
+            self._token, self._token_expires_at = self._cached_token(expired)
+
+        self._schedule_refresh()
+
+    def _cached_token(self, expired):
+        with self._token_cache.lock(self._token_key):
+            # Some other request may have already put a fresh token
+            # into the cache, otherwise request a new one and share it.
+            cached = self._token_cache.get(self._token_key)
+            stale = cached is None or cached[0] == expired
+
+            if stale or self._expires_soon(cached[1]):
+                cached = self._request_token()
+                self._token_cache.set(self._token_key, *cached)
+
+            return cached
+
+    def _schedule_refresh(self, delay=None):
+        if not self._refresh_in_background:
+            return
+
+        if delay is None:
+            if self._token_expires_at is None:
+                return
+
+            delay = max(
+                self._token_expires_at - self._refresh_margin - time.time(),
+                0
+            )
+
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+
+        # The timer refers to the request weakly, so dropping the request
+        # (e.g. along with its client) stops the refreshing as well.
+        self._refresh_timer = threading.Timer(delay, _refresh_on_time,
+                                              [weakref.ref(self)])
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_on_time(self):
+        with self._token_lock:
+            if not self._refresh_in_background:  # Closed meanwhile.
+                return
+
+            try:
+                self._update_token(self._token)
+            except Exception:
+                # Keep retrying while the current token is still valid,
+                # then just let the next request handle the token.
+                if self._token_expires_at > time.time():
+                    self._schedule_refresh(self.BACKGROUND_RETRY_DELAY)
+
     def _request_token(self):
         data = {'grant_type': 'client_credentials'}
         headers = {'Content-Type': 'application/x-www-form-urlencoded',
@@ -49,40 +206,76 @@ class ClientAuthorizedRequest(Request):
 
         response.raise_for_status()
 
-        return response.json()['access_token']  # OK
+        payload = response.json()
+        token = payload['access_token']  # OK
 
-    @property
-    def _headers(self):
-        return {'Authorization': 'Bearer {token}'.format(token=self._token)}
+        # Time to live (in seconds) may be missing in theory,
+        # so rely on getting 401 Unauthorized in that case.
+        expires_in = payload.get('expires_in')
+        expires_at = (
+            None if expires_in is None else
+            time.time() + expires_in
+        )
 
-    def _perform(self, method, url, headers, **kwargs):
-        headers.update(self._headers)
-        kwargs['headers'] = headers
+        return token, expires_at
+
+    @staticmethod
+    def _headers(token):
+        return {'Authorization': 'Bearer {token}'.format(token=token)}
+
+    def _perform(self, method, url, headers, token, **kwargs):
+        # Use the token read once per request (rather than the current one)
+        # and never update the headers of the caller in place, since both
+        # the token and the headers may be shared with other threads.
+        kwargs['headers'] = dict(headers, **self._headers(token))
         return self._request.perform(method, url, **kwargs)
 
 
+def _refresh_on_time(reference):
+    request = reference()
+    if request is not None:
+        request._refresh_on_time()
+
+
 class TokenAuthorizedRequest(Request):
     """
     Provides authorization header for inner request.
+    Thread-safe: may be shared by any number of threads.
+    If `lazy`, the token is checked on the very first request
+    rather than on init (concurrent first requests share a single check).
     """
 
-    def __init__(self, request, token, region=None, environment=None):
+    def __init__(self, request, token, region=None, environment=None,
+                 lazy=False):
         self._request = request
         self._token = token
         self._check_url = urljoin(
             url_for(region, 'visibility', environment),
             '/iroh/iroh-enrich/settings',
         )
-        self._check_token()
+        self._checked = False
+        self._check_lock = threading.Lock()
+
+        if not lazy:
+            self._check_token()
+            self._checked = True
 
     def perform(self, method, url, **kwargs):
+        if not self._checked:
+            self._check_token_once()
+
         headers = kwargs.pop('headers', {})
         response = self._perform(method, url, headers, **kwargs)
         return response
 
+    def _check_token_once(self):
+        with self._check_lock:
+            if not self._checked:
+                self._check_token()
+                self._checked = True
+
     def _check_token(self):
         headers = {'Accept': 'application/json'}
-        headers.update(self._headers)
 
         response = self._perform('GET', self._check_url, headers)
         response.raise_for_status()
@@ -92,6 +285,7 @@ class TokenAuthorizedRequest(Request):
         return {'Authorization': 'Bearer {token}'.format(token=self._token)}
 
     def _perform(self, method, url, headers, **kwargs):
-        headers.update(self._headers)
-        kwargs['headers'] = headers
+        # Never update the headers of the caller in place,
+        # since they may be shared with other threads.
+        kwargs['headers'] = dict(headers, **self._headers)
         return self._request.perform(method, url, **kwargs)
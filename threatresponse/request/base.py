@@ -1,11 +1,18 @@
 import abc
+import inspect
 
 import six
 
+# Coroutine functions (and so asynchronous requests) need Python 3.5+.
+_iscoroutinefunction = getattr(inspect, 'iscoroutinefunction',
+                               lambda function: False)
+
 
 class Request(six.with_metaclass(abc.ABCMeta, object)):
     """
     Interface for performing HTTP requests.
+    Implementations must be thread-safe, i.e. never modify any of the passed
+    arguments in place and guard any state shared between requests.
     """
 
     @abc.abstractmethod
@@ -26,3 +33,16 @@ class Request(six.with_metaclass(abc.ABCMeta, object)):
 
     def delete(self, url, **kwargs):
         return self.perform('DELETE', url, **kwargs)
+
+
+def asynchronous(request):
+    """ Whether the request is asynchronous, i.e. its `perform` returns
+    a coroutine either by itself or since the request it wraps does. """
+
+    if not isinstance(request, Request):
+        return False
+
+    if _iscoroutinefunction(request.perform):
+        return True
+
+    return asynchronous(getattr(request, '_request', None))
@@ -0,0 +1,232 @@
+import fnmatch
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from six.moves.urllib.parse import urlparse
+
+from .base import Request
+
+MAX_AGE = re.compile(r'max-age\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+class CachedResponse(object):
+
+    def __init__(self, url, response, expires_at):
+        self.url = url
+        self.response = response
+        self.expires_at = expires_at
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+
+    def expired(self):
+        return self.expires_at <= time.time()
+
+    def validators(self):
+        """ Returns the headers making a conditional request
+        for the same resource. """
+
+        headers = {}
+
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+
+class ResponseCache(object):
+    """
+    Keeps up to `max_entries` responses (evicting the least recently used ones)
+    for `ttl` seconds by default or for as long as `ttls` specify for URL paths
+    matching their (shell-style) patterns, e.g. `{'/ctia/verdict/*': 300}`
+    (the longest matching pattern wins). Thread-safe.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60, ttls=None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        # Try more specific (i.e. longer) patterns first.
+        self._ttls = sorted(
+            (ttls or {}).items(),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ('hits', 'misses', 'revalidations', 'evictions'), 0
+        )
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                # Mark the entry as the most recently used one.
+                del self._entries[key]
+                self._entries[key] = entry
+
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, url):
+        """ Drops all the responses to requests for the URL
+        (regardless of their params). """
+
+        with self._lock:
+            for key in [key for key in self._entries
+                        if self._entries[key].url == url]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def lifetime(self, url, headers):
+        """ Returns the number of seconds to keep the response for
+        or `None` if the response must not be stored at all. """
+
+        cache_control = headers.get('Cache-Control', '').lower()
+
+        if 'no-store' in cache_control:
+            return None
+
+        if 'no-cache' in cache_control:
+            # Stored, but must always be revalidated.
+            return 0
+
+        ttl = self._ttl
+        path = urlparse(url).path
+        for pattern, route_ttl in self._ttls:
+            if fnmatch.fnmatchcase(path, pattern):
+                ttl = route_ttl
+                break
+
+        max_age = MAX_AGE.search(cache_control)
+        if max_age:
+            ttl = min(ttl, int(max_age.group(1)))
+
+        return ttl
+
+    def record(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        """ Returns the numbers of hits (including revalidated responses),
+        misses, revalidations and evictions along with the hit rate. """
+
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = float(stats['hits']) / lookups if lookups else 0.0
+
+        return stats
+
+
+class CachingRequest(Request):
+    """
+    Caches successful responses to GET requests (by URL, params and headers)
+    in the specified response cache, revalidating stale responses with their
+    `ETag` and `Last-Modified` headers (if any). Any other request for a URL
+    drops the cached responses for that URL.
+    """
+
+    CACHEABLE_METHODS = ('GET',)
+
+    def __init__(self, request, cache):
+        self._request = request
+        self._cache = cache
+
+    def perform(self, method, url, **kwargs):
+        key = self._key(method, url, kwargs)
+        if key is None:
+            return self._uncached(method, url, kwargs)
+
+        entry = self._cache.get(key)
+        if entry is not None and not entry.expired():
+            self._cache.record('hits')
+            return entry.response
+
+        response = self._request.perform(
+            method, url, **self._conditional(entry, kwargs)
+        )
+
+        return self._stored(key, url, entry, response)
+
+    def _uncached(self, method, url, kwargs):
+        response = self._request.perform(method, url, **kwargs)
+
+        if method.upper() not in self.CACHEABLE_METHODS:
+            self._cache.invalidate(url)
+
+        return response
+
+    def _key(self, method, url, kwargs):
+        """ Returns the cache key of the request
+        or `None` if its response must not be cached. """
+
+        if method.upper() not in self.CACHEABLE_METHODS:
+            return None
+
+        # Streamed responses are consumed by callers, so they cannot be reused.
+        if kwargs.get('stream'):
+            return None
+
+        return (
+            method.upper(),
+            url,
+            json.dumps([kwargs.get('params'), kwargs.get('headers')],
+                       sort_keys=True, default=str),
+        )
+
+    @staticmethod
+    def _conditional(entry, kwargs):
+        if entry is None:
+            return kwargs
+
+        validators = entry.validators()
+        if not validators:
+            return kwargs
+
+        headers = dict(kwargs.get('headers') or {}, **validators)
+
+        return dict(kwargs, headers=headers)
+
+    def _stored(self, key, url, entry, response):
+        if entry is not None and response.status_code == 304:
+            self._cache.record('hits')
+            self._cache.record('revalidations')
+            self._store(key, url, entry.response, response.headers)
+            return entry.response
+
+        self._cache.record('misses')
+
+        if response.status_code == 200:
+            self._store(key, url, response, response.headers)
+
+        return response
+
+    def _store(self, key, url, response, headers):
+        lifetime = self._cache.lifetime(url, headers)
+        if lifetime is None:
+            return
+
+        entry = CachedResponse(url, response, time.time() + lifetime)
+
+        # Responses expiring right away are only worth storing to revalidate.
+        if lifetime > 0 or entry.validators():
+            self._cache.set(key, entry)
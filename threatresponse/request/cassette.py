@@ -0,0 +1,231 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+from collections import defaultdict
+
+import requests
+import six
+
+from .base import Request
+from .response import build_response
+from ..exceptions import CassetteError
+
+# Never stored, so cassettes may be safely shared (e.g. committed).
+REDACTED_HEADERS = ('authorization', 'cookie', 'set-cookie')
+REDACTED_FIELDS = ('access_token', 'refresh_token', 'id_token')
+REDACTED = 'REDACTED'
+# Bodies are stored already decoded.
+SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class Cassette(object):
+    """
+    Keeps HTTP exchanges recorded by `RecordingRequest` to be replayed
+    by `ReplayingRequest`. Cassettes are saved as JSON lines (one exchange
+    per line, gzipped if the path ends with `.gz`). Requests are identified
+    by their method, URL (including params) and a hash of their body,
+    whereas neither request headers nor credentials (tokens included)
+    are ever stored. Thread-safe.
+    """
+
+    def __init__(self, exchanges=None):
+        self._exchanges = list(exchanges or [])
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        with _opened(path, 'r') as fin:
+            return cls(json.loads(line) for line in fin if line.strip())
+
+    def save(self, path):
+        with self._lock:
+            exchanges = list(self._exchanges)
+
+        with _opened(path, 'w') as fout:
+            for exchange in exchanges:
+                line = json.dumps(exchange, sort_keys=True)
+                fout.write(six.text_type(line) + u'\n')
+
+    def __len__(self):
+        return len(self._exchanges)
+
+    @property
+    def exchanges(self):
+        with self._lock:
+            return list(self._exchanges)
+
+    def record(self, method, url, kwargs, response, elapsed):
+        """ Stores the response to the request (along with the number
+        of seconds it took). """
+
+        exchange = dict(_request_key(method, url, kwargs),
+                        status_code=response.status_code,
+                        reason=response.reason,
+                        headers=_redacted_headers(response.headers),
+                        elapsed=round(elapsed, 6),
+                        **_encoded_content(response.content))
+
+        with self._lock:
+            self._exchanges.append(exchange)
+
+
+class RecordingRequest(Request):
+    """
+    Records the exchanges of the inner request (usually a transport)
+    into the cassette.
+    """
+
+    def __init__(self, request, cassette):
+        self._request = request
+        self._cassette = cassette
+
+    def perform(self, method, url, **kwargs):
+        started_at = time.time()
+        response = self._request.perform(method, url, **kwargs)
+        self._cassette.record(method, url, kwargs, response,
+                              time.time() - started_at)
+
+        return response
+
+    def close(self):
+        close = getattr(self._request, 'close', None)
+        if close is not None:
+            close()
+
+
+class ReplayingRequest(Request):
+    """
+    Replays the exchanges of the cassette rather than performing requests.
+    Identical requests get the responses in the order they were recorded
+    in, the last one repeating once the others run out, requests missing
+    from the cassette raise `CassetteError`.
+
+    Each response takes `latency` seconds (either a number or `'recorded'`
+    meaning the time the recorded response took) plus the time it takes
+    to transfer its body at `bandwidth` bytes per second (if specified).
+    """
+
+    def __init__(self, cassette, latency=0, bandwidth=None):
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._lock = threading.Lock()
+        self._exchanges = defaultdict(list)
+        for exchange in cassette.exchanges:
+            self._exchanges[_key(exchange)].append(exchange)
+
+    def perform(self, method, url, **kwargs):
+        response, delay = self._replayed(method, url, kwargs)
+        time.sleep(delay)
+
+        return response
+
+    def close(self):
+        pass
+
+    def _replayed(self, method, url, kwargs):
+        """ Returns the recorded response to the request
+        along with the number of seconds to delay it for. """
+
+        key = _key(_request_key(method, url, kwargs))
+
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise CassetteError(
+                    'No recorded response to {} {}.'.format(*key[:2])
+                )
+            exchange = exchanges.pop(0) if len(exchanges) > 1 else exchanges[0]
+
+        return _response(method, url, exchange), self._delay(exchange)
+
+    def _delay(self, exchange):
+        delay = (
+            exchange['elapsed'] if self._latency == 'recorded' else
+            self._latency or 0
+        )
+        if self._bandwidth:
+            delay += float(exchange['size']) / self._bandwidth
+
+        return delay
+
+
+def _request_key(method, url, kwargs):
+    """ Returns the parts identifying the request: its method, full URL
+    (with the params encoded the same way `requests` does) and the hash
+    of its body (if any). """
+
+    prepared = requests.Request(method, url,
+                                params=kwargs.get('params'),
+                                data=kwargs.get('data'),
+                                json=kwargs.get('json')).prepare()
+
+    body = prepared.body
+    if isinstance(body, six.text_type):
+        body = body.encode('utf-8')
+
+    return {
+        'method': prepared.method,
+        'url': prepared.url,
+        'body_hash': hashlib.sha1(body).hexdigest() if body else None,
+    }
+
+
+def _key(exchange):
+    return exchange['method'], exchange['url'], exchange['body_hash']
+
+
+def _response(method, url, exchange):
+    if exchange['encoding'] == 'base64':
+        content = base64.b64decode(exchange['content'])
+    else:
+        content = exchange['content'].encode('utf-8')
+
+    return build_response(method, url, exchange['status_code'],
+                          exchange['headers'], content,
+                          reason=exchange['reason'])
+
+
+def _redacted_headers(headers):
+    return dict((name, value) for name, value in headers.items()
+                if name.lower() not in REDACTED_HEADERS + SKIPPED_HEADERS)
+
+
+def _encoded_content(content):
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        return {'content': base64.b64encode(content).decode('ascii'),
+                'encoding': 'base64',
+                'size': len(content)}
+
+    if any(field in text for field in REDACTED_FIELDS):
+        text = _redacted_text(text)
+
+    return {'content': text, 'encoding': 'utf-8', 'size': len(content)}
+
+
+def _redacted_text(text):
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return text
+
+    if not isinstance(payload, dict):
+        return text
+
+    for field in REDACTED_FIELDS:
+        if field in payload:
+            payload[field] = REDACTED
+
+    return json.dumps(payload)
+
+
+def _opened(path, mode):
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, mode + 'b'), encoding='utf-8')
+
+    return io.open(path, mode, encoding='utf-8')
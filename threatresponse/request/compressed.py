@@ -0,0 +1,95 @@
+import threading
+import zlib
+
+import six
+from six.moves.urllib.parse import urlparse
+
+from .base import Request
+from .encoded import encoded
+from ..codec import StandardCodec
+
+UNSUPPORTED_MEDIA_TYPE = 415
+
+WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+
+class CompressedRequest(Request):
+    """
+    Compresses bodies of inner requests (with `json` payloads encoded by
+    the codec first) of at least `threshold` bytes with the specified
+    `encoding` (either `'gzip'` or `'deflate'`). If a server responds with
+    `415 Unsupported Media Type`, the request is repeated uncompressed and
+    no more requests to that server get compressed.
+    """
+
+    def __init__(self, request, codec=None, threshold=1024, level=6,
+                 encoding='gzip'):
+        if encoding not in WBITS:
+            raise ValueError(
+                'Unsupported encoding {}, must be one of: {}.'.format(
+                    repr(encoding), ', '.join(map(repr, sorted(WBITS)))
+                )
+            )
+
+        self._request = request
+        self._codec = codec or StandardCodec()
+        self._threshold = threshold
+        self._level = level
+        self._encoding = encoding
+        self._unsupported = set()  # Servers not accepting compressed bodies.
+        self._lock = threading.Lock()
+
+    def perform(self, method, url, **kwargs):
+        kwargs, compressed = self._compressed(url, kwargs)
+        if compressed is None:
+            return self._request.perform(method, url, **kwargs)
+
+        response = self._request.perform(method, url, **compressed)
+        if not self._rejected(url, response):
+            return response
+
+        response.close()
+        return self._request.perform(method, url, **kwargs)
+
+    def _compressed(self, url, kwargs):
+        """ Returns the keyword arguments (with the `json` payload encoded
+        once, so it never gets encoded again further down) along with
+        the ones with the compressed body or `None` if the body must not
+        be compressed. """
+
+        with self._lock:
+            if urlparse(url).netloc in self._unsupported:
+                return kwargs, None
+
+        kwargs = encoded(kwargs, self._codec)
+
+        data = kwargs.get('data')
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+        if not isinstance(data, six.binary_type):
+            return kwargs, None
+        if len(data) < self._threshold:
+            return kwargs, None
+
+        headers = dict(kwargs.get('headers') or {})
+        if any(name.lower() == 'content-encoding' for name in headers):
+            return kwargs, None
+        headers['Content-Encoding'] = self._encoding
+
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED,
+                                      WBITS[self._encoding])
+        data = compressor.compress(data) + compressor.flush()
+
+        return kwargs, dict(kwargs, data=data, headers=headers)
+
+    def _rejected(self, url, response):
+        if response.status_code != UNSUPPORTED_MEDIA_TYPE:
+            return False
+
+        with self._lock:
+            self._unsupported.add(urlparse(url).netloc)
+
+        return True
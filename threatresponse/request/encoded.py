@@ -0,0 +1,39 @@
+from .base import Request
+
+
+class EncodedRequest(Request):
+    """
+    Encodes `json` payloads of inner requests into `data` bytes
+    and decodes JSON bodies of their responses with the specified codec.
+    """
+
+    def __init__(self, request, codec):
+        self._request = request
+        self._codec = codec
+
+    def perform(self, method, url, **kwargs):
+        response = self._request.perform(method, url, **self._encoded(kwargs))
+        response._codec = self._codec
+
+        return response
+
+    def _encoded(self, kwargs):
+        return encoded(kwargs, self._codec)
+
+
+def encoded(kwargs, codec):
+    """ Returns a copy of request keyword arguments with the `json`
+    payload (if any) encoded by the codec into `data` bytes. """
+
+    if kwargs.get('json') is None or kwargs.get('data') is not None:
+        return kwargs
+
+    kwargs = dict(kwargs)
+    kwargs['data'] = codec.dumps(kwargs.pop('json'))
+
+    headers = dict(kwargs.get('headers') or {})
+    if not any(name.lower() == 'content-type' for name in headers):
+        headers['Content-Type'] = codec.content_type
+    kwargs['headers'] = headers
+
+    return kwargs
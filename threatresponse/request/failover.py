@@ -0,0 +1,135 @@
+import threading
+import time
+
+import requests
+
+from .base import Request
+
+INFINITY = float('inf')
+
+
+class RegionHealth(object):
+    """
+    Tracks the rolling (exponentially weighted by `smoothing`) latency
+    and error rate of requests by region. Regions failed within the last
+    `cooldown` seconds go last, the others go by their latency penalized
+    by their error rate, whereas regions not measured yet go after those
+    (in the preferred order) unless preferred the most. Thread-safe.
+    """
+
+    def __init__(self, smoothing=0.2, cooldown=30):
+        self._smoothing = smoothing
+        self._cooldown = cooldown
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, region, latency, failed=False):
+        with self._lock:
+            stats = self._stats.setdefault(region, {
+                'latency': latency,
+                'error_rate': float(failed),
+                'requests': 0,
+                'failed_at': None,
+            })
+            stats['latency'] += self._smoothing * (latency - stats['latency'])
+            stats['error_rate'] += self._smoothing * (
+                float(failed) - stats['error_rate']
+            )
+            stats['requests'] += 1
+            if failed:
+                stats['failed_at'] = time.time()
+
+    def ranked(self, regions):
+        """ Returns the regions (preferred ones first)
+        from the healthiest one to the least. """
+
+        now = time.time()
+        preferred = regions[0] if regions else None
+
+        with self._lock:
+            def score(region):
+                stats = self._stats.get(region)
+                if stats is None:
+                    # Never prefer a region just since it is not measured.
+                    return False, 0.0 if region == preferred else INFINITY
+                cooling = now - (stats['failed_at'] or 0) < self._cooldown
+                return cooling, stats['latency'] * (1 + stats['error_rate'])
+
+            # Sorting is stable, so ties keep the preferred order.
+            return sorted(regions, key=score)
+
+    def stats(self):
+        """ Returns the latency (in seconds), error rate and number
+        of requests by region. """
+
+        with self._lock:
+            return dict(
+                (region, dict((key, value) for key, value in stats.items()
+                              if key != 'failed_at'))
+                for region, stats in self._stats.items()
+            )
+
+
+class FailoverRequest(Request):
+    """
+    Performs each request in the healthiest region (see `RegionHealth`)
+    by the inner requests by region (preferred ones first), failing over
+    to the next region on connection errors, timeouts or `5xx` responses.
+    Returns the response (or raises the error) of the last region tried.
+
+    Only requests of the specified `methods` (`GET` and `HEAD` by default)
+    fail over, since the others may have taken effect in a region despite
+    failing, so they are performed in the most preferred region only.
+    """
+
+    ERRORS = (requests.ConnectionError, requests.Timeout)
+    DEFAULT_METHODS = ('GET', 'HEAD')
+
+    def __init__(self, requests_by_region, health, methods=None):
+        self._requests_by_region = requests_by_region
+        self._health = health
+        self._methods = frozenset(
+            method.upper()
+            for method in (self.DEFAULT_METHODS if methods is None else
+                           methods)
+        )
+
+    def perform(self, method, url, **kwargs):
+        regions = self._regions(method)
+
+        for region in regions:
+            started_at = time.time()
+            try:
+                response = self._requests_by_region[region].perform(
+                    method, url, **kwargs
+                )
+            except self.ERRORS:
+                if self._settled(region, regions, started_at):
+                    raise
+                continue
+
+            if self._settled(region, regions, started_at, response):
+                return response
+
+            # Release the connection of the response being discarded.
+            response.close()
+
+    def _regions(self, method):
+        """ Returns the regions to perform the request in (in order). """
+
+        regions = list(self._requests_by_region)
+
+        if method.upper() not in self._methods:
+            return regions[:1]
+
+        return self._health.ranked(regions)
+
+    def _settled(self, region, regions, started_at, response=None):
+        """ Records the outcome of the request in the region (either
+        the response or an error) and returns whether it is the final one,
+        i.e. either a successful one or the one of the last region. """
+
+        failed = response is None or response.status_code >= 500
+        self._health.record(region, time.time() - started_at, failed)
+
+        return not failed or region == regions[-1]
@@ -0,0 +1,217 @@
+import threading
+
+import requests
+import six
+
+from .base import Request
+from .response import build_response
+from .standard import flattened_params, ssl_context
+from ..exceptions import TransportError
+
+# The HTTP/2 transport is optional.
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# The keyword arguments of `requests` having no `httpx` counterpart.
+UNSUPPORTED_ARGUMENTS = ('proxies', 'hooks')
+
+
+class HTTP2Request(Request):
+    """
+    Performs HTTP requests using the `httpx` library over HTTP/2 (if a server
+    supports it, otherwise over HTTP/1.1), so concurrent requests to the same
+    host get multiplexed over a single connection rather than opening one
+    connection per request. Accepts the same keyword arguments as `requests`
+    does and returns the same responses as `StandardRequest` (connection
+    errors are raised as the `requests` ones too).
+
+    Supports the same connection pooling options as `StandardRequest`
+    except for those having no `httpx` counterpart: `pool_connections`
+    (pools are not limited by the number of hosts) and `pool_block` (requests
+    always wait for a free connection). `pool_maxsize` is the total number
+    of connections to keep. Unlike `requests`, `httpx` applies `verify`
+    and `cert` per connection pool, so requests passing other values
+    than the default ones get pools of their own (per distinct values).
+    """
+
+    def __init__(self, proxy=None, pool_connections=None, pool_maxsize=None,
+                 pool_block=True, max_retries=0, keep_alive=True):
+        if httpx is None:
+            raise TransportError(
+                'The httpx library is not installed, '
+                'run `pip install threatresponse[http2]`.'
+            )
+
+        limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=None if keep_alive else 0,
+        )
+        self._transport_options = dict(http2=True,
+                                       limits=limits,
+                                       proxy=proxy,
+                                       retries=max_retries)
+
+        self._client = self._new_client(True, None)
+        self._clients = {}  # By the other `verify` and `cert` values.
+        self._lock = threading.Lock()
+
+    def perform(self, method, url, **kwargs):
+        stream = kwargs.pop('stream', False)
+        client = self._client_for(*tls(kwargs))
+        kwargs, options = converted(kwargs)
+
+        try:
+            response = client.send(
+                client.build_request(method, url, **kwargs),
+                stream=stream,
+                **options
+            )
+        except httpx.HTTPError as error:
+            six.raise_from(_requests_error(error), error)
+
+        if not stream:
+            return built(response)
+
+        # Let the body be read (and the connection released) lazily.
+        result = built(response, content=False)
+        result._content_consumed = False
+        result.raw = _Raw(response)
+
+        return result
+
+    def close(self):
+        self._client.close()
+        for client in self._clients.values():
+            client.close()
+
+    def _client_for(self, verify, cert):
+        if verify is True and cert is None:
+            return self._client
+
+        with self._lock:
+            if (verify, cert) not in self._clients:
+                self._clients[verify, cert] = self._new_client(verify, cert)
+
+            return self._clients[verify, cert]
+
+    def _new_client(self, verify, cert):
+        transport = httpx.HTTPTransport(verify=httpx_verify(verify),
+                                        cert=cert,
+                                        **self._transport_options)
+
+        # Unlike `httpx`, `requests` neither times out nor stops at redirects
+        # by default.
+        return httpx.Client(transport=transport, timeout=None)
+
+
+def tls(kwargs):
+    """ Pops the `verify` and `cert` keyword arguments of `requests` (which
+    `httpx` only accepts per connection pool) and returns their values. """
+
+    verify = kwargs.pop('verify', None)
+    cert = kwargs.pop('cert', None)
+
+    return (
+        True if verify is None else verify,
+        tuple(cert) if isinstance(cert, list) else cert,
+    )
+
+
+def httpx_verify(verify):
+    # Unlike `requests`, `httpx` takes CA bundles as SSL contexts.
+    if not isinstance(verify, six.string_types):
+        return verify
+
+    return ssl_context(verify)
+
+
+def converted(kwargs):
+    """ Converts `requests` keyword arguments into `httpx` ones,
+    returns the arguments of the request and those of sending it. """
+
+    unsupported = [name for name in UNSUPPORTED_ARGUMENTS if kwargs.get(name)]
+    if unsupported:
+        raise TransportError(
+            'Unsupported arguments of the HTTP/2 transport: {} (pass `proxy` '
+            'to the client rather than `proxies` to requests).'.format(
+                ', '.join(map(repr, unsupported))
+            )
+        )
+
+    kwargs = dict(
+        (name, value) for name, value in kwargs.items()
+        if name not in UNSUPPORTED_ARGUMENTS
+    )
+    options = {'follow_redirects': kwargs.pop('allow_redirects', True)}
+    if 'auth' in kwargs:
+        options['auth'] = kwargs.pop('auth')
+
+    if 'params' in kwargs:
+        kwargs['params'] = flattened_params(kwargs['params'])
+
+    data = kwargs.get('data')
+    if isinstance(data, (six.binary_type, six.text_type)):
+        # Raw bodies go as `content`, `data` is for form fields only.
+        kwargs['content'] = kwargs.pop('data')
+
+    timeout = kwargs.get('timeout')
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        kwargs['timeout'] = httpx.Timeout(None, connect=connect, read=read)
+
+    return kwargs, options
+
+
+def built(response, content=None):
+    """ Builds the same response as `StandardRequest` returns
+    from an `httpx` one. """
+
+    return build_response(
+        response.request.method,
+        response.url,
+        response.status_code,
+        response.headers,
+        response.content if content is None else content,
+        reason=response.reason_phrase or None,  # None over HTTP/2.
+    )
+
+
+class _Raw(object):
+    """ Lets `requests` read the body of a streamed `httpx` response. """
+
+    def __init__(self, response):
+        self._response = response
+
+    def stream(self, amount, decode_content=True):
+        try:
+            for chunk in self._response.iter_bytes(amount):
+                yield chunk
+        except httpx.HTTPError as error:
+            six.raise_from(_requests_error(error), error)
+
+    def close(self):
+        self._response.close()
+
+    def release_conn(self):
+        self._response.close()
+
+
+def _requests_error(error):
+    # Let the other requests handle errors the same way as usual
+    # (the most specific classes go first).
+    errors = (
+        (httpx.ConnectTimeout, requests.ConnectTimeout),
+        (httpx.ReadTimeout, requests.ReadTimeout),
+        (httpx.TimeoutException, requests.Timeout),
+        (httpx.ProxyError, requests.exceptions.ProxyError),
+        (httpx.NetworkError, requests.ConnectionError),
+        (httpx.RemoteProtocolError, requests.ConnectionError),
+        (httpx.TooManyRedirects, requests.TooManyRedirects),
+        (httpx.HTTPError, requests.RequestException),
+    )
+
+    cls = next(cls for source, cls in errors if isinstance(error, source))
+
+    return cls(error)
@@ -0,0 +1,96 @@
+import json
+import threading
+from fnmatch import fnmatchcase
+
+import six
+from six.moves.urllib.parse import urlparse
+
+from .base import Request
+from .response import build_response
+
+TOKEN_PATH = '/iroh/oauth2/token'
+
+
+class InMemoryRequest(Request):
+    """
+    Serves canned responses from memory rather than over the network, e.g.
+    to measure (or profile) the overhead of the client itself separately from
+    the network or to test code using the client without any server.
+
+    Responses are looked up by method and URL path (both may be shell-style
+    patterns, e.g. `('*', '/ctia/*/search')`), the most recently added route
+    matching a request wins, unmatched requests get `404 Not Found`.
+    The `routes` are `(method, path, payload)` tuples (see `add`). Token
+    requests are served with the `token` (unless it is `None`). Thread-safe.
+    """
+
+    def __init__(self, routes=None, token='ACCESS_TOKEN', expires_in=600):
+        self._routes = []
+        self._lock = threading.Lock()
+        self._performed = 0
+
+        if token is not None:
+            self.add('POST', TOKEN_PATH, {'access_token': token,
+                                          'token_type': 'bearer',
+                                          'expires_in': expires_in})
+
+        for route in routes or ():
+            self.add(*route)
+
+    @property
+    def performed(self):
+        """ The number of requests performed so far. """
+
+        return self._performed
+
+    def add(self, method, path, payload=None, status_code=200, headers=None):
+        """ Serves the requests matching the method and path with the payload
+        (encoded as JSON in advance unless it is already `bytes`). The payload
+        may also be a function taking the same arguments as `perform` and
+        returning a response (e.g. built by `build_response`). """
+
+        if callable(payload):
+            respond = payload
+        else:
+            headers = dict(headers or {})
+            if isinstance(payload, six.binary_type):
+                content = payload
+            else:
+                content = json.dumps(payload).encode('utf-8')
+                headers.setdefault('Content-Type', 'application/json')
+
+            def respond(method, url, **kwargs):
+                return build_response(method, url, status_code,
+                                      headers, content)
+
+        with self._lock:
+            self._routes.insert(0, ((method.upper(), path), respond))
+
+    def perform(self, method, url, **kwargs):
+        path = urlparse(url).path
+
+        with self._lock:
+            self._performed += 1
+            respond = next(
+                (respond for patterns, respond in self._routes
+                 if _matching((method.upper(), path), patterns)),
+                None
+            )
+
+        if respond is None:
+            return build_response(
+                method, url, 404, {'Content-Type': 'application/json'},
+                json.dumps({'error': 'No route for {} {}.'.format(
+                    method, path
+                )}).encode('utf-8')
+            )
+
+        return respond(method, url, **kwargs)
+
+    def close(self):
+        pass
+
+
+def _matching(values, patterns):
+    return all(fnmatchcase(value, pattern)
+               for value, pattern in zip(values, patterns))
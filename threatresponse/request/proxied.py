@@ -6,8 +6,8 @@ class ProxiedRequest(StandardRequest):
     Supports HTTP request proxying via a specified proxy server.
     """
 
-    def __init__(self, proxy):
-        super(ProxiedRequest, self).__init__()
+    def __init__(self, proxy, **pool_options):
+        super(ProxiedRequest, self).__init__(**pool_options)
 
         self._proxy = proxy
 
@@ -0,0 +1,111 @@
+import threading
+import time
+
+from .base import Request
+from ..exceptions import RateLimitError
+
+
+class TokenBucket(object):
+    """
+    Allows `rate` requests per second on average with bursts of up to `burst`
+    requests (`rate` by default, but at least one). Thread-safe and never
+    blocks by itself, so it may be shared by threads and coroutines.
+    """
+
+    def __init__(self, rate, burst=None):
+        self._rate = float(rate)
+        self._burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self._burst
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """ Takes a token (possibly in advance) and returns the number
+        of seconds to wait before the token becomes available. """
+
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+
+            return max(-self._tokens / self._rate, 0)
+
+    def take(self):
+        """ Takes a token if it is available right away. """
+
+        with self._lock:
+            self._refill()
+
+            if self._tokens < 1:
+                return False
+
+            self._tokens -= 1
+
+            return True
+
+    def _refill(self):
+        now = time.time()
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self._rate,
+            self._burst
+        )
+        self._updated = now
+
+
+class RateLimitedRequest(Request):
+    """
+    Limits the rate of inner requests with the specified token bucket
+    or with a dict of token buckets by URL prefix (e.g. by API family),
+    in which case the longest prefix of each URL picks its bucket and
+    requests to any other URLs are not limited at all.
+    If `block`, waits for the bucket to allow each request,
+    otherwise immediately raises `RateLimitError` if it does not.
+    """
+
+    def __init__(self, request, bucket, block=True):
+        self._request = request
+        if hasattr(bucket, 'items'):
+            self._bucket = None
+            self._buckets = sorted(bucket.items(),
+                                   key=lambda item: -len(item[0]))
+        else:
+            self._bucket = bucket
+            self._buckets = None
+        self._block = block
+
+    def perform(self, method, url, **kwargs):
+        delay = self._delay(method, url)
+        if delay:
+            time.sleep(delay)
+
+        return self._request.perform(method, url, **kwargs)
+
+    def _delay(self, method, url):
+        """ Returns the number of seconds to wait before the request
+        (or raises `RateLimitError` if it must not wait). """
+
+        bucket = self._bucket_for(url)
+        if bucket is None:
+            return 0
+
+        if self._block:
+            return bucket.reserve()
+
+        if not bucket.take():
+            raise RateLimitError(
+                'Rate limit exceeded for {method} {url}.'.format(
+                    method=method.upper(),
+                    url=url,
+                )
+            )
+
+        return 0
+
+    def _bucket_for(self, url):
+        if self._buckets is None:
+            return self._bucket
+
+        return next(
+            (bucket for prefix, bucket in self._buckets
+             if url.startswith(prefix)),
+            None
+        )
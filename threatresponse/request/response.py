@@ -1,6 +1,7 @@
 import json
 
 import requests
+import six
 
 
 class Response(object):
@@ -10,8 +11,9 @@ class Response(object):
     May also customize some instance methods.
     """
 
-    def __init__(self, response):
+    def __init__(self, response, codec=None):
         self._response = response
+        self._codec = codec
 
     def __getattr__(self, key):
         return getattr(self._response, key)
@@ -20,11 +22,18 @@ class Response(object):
         # This is an antidote against infinite recursion:
         # in order to use self._response for redirecting calls,
         # make sure to set the '_response' attribute directly first.
-        if key == '_response':
+        if key in ('_response', '_codec'):
             super(Response, self).__setattr__(key, value)
         else:
             setattr(self._response, key, value)
 
+    def json(self, **kwargs):
+        # Decode with the codec (if any) rather than the built-in module.
+        if self._codec is None:
+            return self._response.json(**kwargs)
+
+        return self._codec.loads(self._response.content)
+
     def raise_for_status(self):
         extended = self._extended
 
@@ -33,14 +42,15 @@ class Response(object):
         except requests.HTTPError as error:
             raise extended(error)
 
-    @staticmethod
-    def _extended(error):
+    def _extended(self, error):
         # Try to extend the default error message with the response payload
         # in order to give the user more insight about what went wrong.
 
+        loads = json.loads if self._codec is None else self._codec.loads
+
         try:
-            payload = json.loads(error.response.text)
-        except json.JSONDecodeError:
+            payload = loads(error.response.text)
+        except ValueError:  # Including all the `JSONDecodeError` classes.
             return error
 
         message = error.args[0]  # 1-element tuple.
@@ -49,3 +59,27 @@ class Response(object):
         error.args = (message,)
 
         return error
+
+
+def build_response(method, url, status_code, headers, content, reason=None):
+    """
+    Builds an instance of the `requests.Response` class from raw parts.
+    Lets transports other than `requests` return the very same responses.
+    """
+
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = (
+        reason if reason is not None else
+        six.moves.http_client.responses.get(status_code, '')
+    )
+    response.headers = requests.structures.CaseInsensitiveDict(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(
+        response.headers
+    )
+    response.url = str(url)
+    response.request = requests.Request(method, str(url)).prepare()
+    response._content = content
+    response._content_consumed = True
+
+    return Response(response)
@@ -0,0 +1,147 @@
+import random
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+import requests
+
+from .base import Request
+
+
+class RetryingRequest(Request):
+    """
+    Retries requests failed with one of the specified `statuses`
+    (or with a connection error) with exponential backoff and jitter.
+
+    Unless `methods` are specified, the non-idempotent methods (e.g. `POST`)
+    are only retried on `429`, since a request failed with any other status
+    or a connection error may have already taken effect (pass e.g.
+    `methods=['GET', 'POST']` to opt in to retrying `POST` anyway).
+    Both `statuses` and `methods` may either be collections or mappings
+    to the maximum number of retries (e.g. `{429: 5, 503: 2}`), in which case
+    the least of the two numbers applies, otherwise `retries` applies.
+    The delay before the n-th retry is a random number between zero and
+    `min(backoff_factor * 2 ** (n - 1), backoff_max)` seconds (unless
+    `jitter` is `False`), but never less than the `Retry-After` header asks
+    for (unless `respect_retry_after` is `False`), and if that is more than
+    `backoff_max`, the request is not retried at all. If `budget` is specified,
+    no retry is attempted once that many seconds have passed since the very
+    first attempt or would have passed after the delay.
+    """
+
+    DEFAULT_STATUSES = (
+        429,  # Too Many Requests.
+        502,  # Bad Gateway.
+        503,  # Service Unavailable.
+        504,  # Gateway Timeout.
+    )
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+    def __init__(self, request, retries=3, statuses=None, methods=None,
+                 backoff_factor=0.5, backoff_max=60, jitter=True,
+                 respect_retry_after=True, budget=None):
+        self._request = request
+        self._retries = retries
+        self._statuses = _policy(
+            self.DEFAULT_STATUSES if statuses is None else statuses,
+            retries
+        )
+        self._methods = (
+            None if methods is None else
+            _policy(methods, retries, key=lambda method: method.upper())
+        )
+        self._backoff_factor = backoff_factor
+        self._backoff_max = backoff_max
+        self._jitter = jitter
+        self._respect_retry_after = respect_retry_after
+        self._budget = budget
+
+    def perform(self, method, url, **kwargs):
+        started = time.time()
+        attempt = 0
+
+        while True:
+            try:
+                response = self._request.perform(method, url, **kwargs)
+            except requests.ConnectionError:
+                delay = self._delay(method, attempt, started)
+                if delay is None:
+                    raise
+            else:
+                delay = self._delay(method, attempt, started, response)
+                if delay is None:
+                    return response
+                # Release the connection of the response being discarded.
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _delay(self, method, attempt, started, response=None):
+        """ Returns the number of seconds to wait before the next attempt
+        or `None` if the request must not be retried (anymore). """
+
+        if response is None:
+            limit = self._retries
+        elif response.status_code in self._statuses:
+            limit = self._statuses[response.status_code]
+        else:
+            return None
+
+        if self._methods is not None:
+            limit = min(limit, self._methods.get(method.upper(), 0))
+        elif not _safe_to_retry(method, response):
+            return None
+
+        if attempt >= limit:
+            return None
+
+        delay = min(self._backoff_factor * 2 ** attempt, self._backoff_max)
+        if self._jitter:
+            delay = random.uniform(0, delay)
+
+        if self._respect_retry_after and response is not None:
+            retry_after = _retry_after(response)
+            if retry_after > self._backoff_max:
+                return None
+            delay = max(delay, retry_after)
+
+        if self._budget is not None:
+            if time.time() + delay - started > self._budget:
+                return None
+
+        return delay
+
+
+def _policy(limits, retries, key=lambda value: value):
+    if not hasattr(limits, 'items'):
+        limits = dict((value, retries) for value in limits)
+
+    return dict((key(value), limit) for value, limit in limits.items())
+
+
+def _safe_to_retry(method, response):
+    if method.upper() in RetryingRequest.IDEMPOTENT_METHODS:
+        return True
+
+    # The server rejects requests with `429` before processing them,
+    # so retrying them is safe whatever the method is.
+    return response is not None and response.status_code == 429
+
+
+def _retry_after(response):
+    # The header is either a number of seconds or an HTTP date.
+    value = response.headers.get('Retry-After')
+
+    if not value:
+        return 0
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    date = parsedate_tz(value)
+    if date is None:
+        return 0
+
+    return max(mktime_tz(date) - time.time(), 0)
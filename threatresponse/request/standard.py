@@ -1,4 +1,9 @@
+import os
+import ssl
+
 import requests
+import six
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from .base import Request
 from .response import Response
@@ -7,10 +12,84 @@ from .response import Response
 class StandardRequest(Request):
     """
     Performs plain HTTP requests using the `requests` library.
+
+    Connections are pooled per host: `pool_connections` is the number of
+    hosts to keep pools for, `pool_maxsize` is the number of connections
+    to keep per host (should be at least the number of threads sharing
+    the request), if `pool_block`, no more connections than that are opened
+    (threads wait for a free one instead). `max_retries` is the number of
+    retries on connection errors. Connections are kept alive between requests
+    unless `keep_alive` is `False`.
     """
 
-    def __init__(self):
+    def __init__(self, pool_connections=DEFAULT_POOLSIZE,
+                 pool_maxsize=DEFAULT_POOLSIZE, pool_block=False,
+                 max_retries=0, keep_alive=True):
         self._session = requests.Session()
 
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block,
+                              max_retries=max_retries)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        if not keep_alive:
+            self._session.headers['Connection'] = 'close'
+
     def perform(self, method, url, **kwargs):
         return Response(self._session.request(method, url, **kwargs))
+
+    def close(self):
+        self._session.close()
+
+
+def flattened_params(params):
+    """ Returns the query params as `(key, value)` pairs of strings the way
+    `requests` sends them (i.e. expanding lists of values, skipping `None`
+    values and stringifying the other ones with `str`, e.g. `True` becomes
+    'True' not 'true'), so the other libraries send the very same query. """
+
+    if params is None or isinstance(params, (six.binary_type,
+                                             six.text_type)):
+        return params
+
+    items = params.items() if hasattr(params, 'items') else params
+
+    flattened = []
+
+    for key, value in items:
+        values = value if isinstance(value, (list, tuple)) else [value]
+        flattened.extend(
+            (key, item if isinstance(item, six.string_types) else str(item))
+            for item in values
+            if item is not None
+        )
+
+    return flattened
+
+
+def ssl_context(verify=True, cert=None):
+    """ Builds an SSL context out of the `verify` (a CA bundle file or
+    directory or whether to verify certificates at all) and `cert` (a client
+    certificate file or a `(cert, key)` pair) arguments of `requests`,
+    so the other libraries verify certificates the very same way. """
+
+    if isinstance(verify, six.string_types):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        context = ssl.create_default_context()
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+
+    if cert is not None:
+        if isinstance(cert, six.string_types):
+            context.load_cert_chain(cert)
+        else:
+            context.load_cert_chain(*cert)
+
+    return context
@@ -0,0 +1,158 @@
+import abc
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import six
+
+try:
+    import fcntl
+except ImportError:  # Not a POSIX platform (e.g. Windows).
+    fcntl = None
+
+
+def token_key(client_id, client_password, token_url):
+    """ Returns a key identifying tokens issued for the specified credentials
+    by the specified token URL (i.e. for the specified region/environment).
+    The key is a hash, so it discloses neither of the credentials. """
+
+    # The password is a part of the key, so a client with wrong credentials
+    # can never get a token issued for the right ones.
+    credentials = '\n'.join([client_id, client_password, token_url])
+
+    return hashlib.sha256(credentials.encode('utf-8')).hexdigest()
+
+
+class TokenCache(six.with_metaclass(abc.ABCMeta, object)):
+    """
+    Interface for sharing tokens between clients with the same credentials.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    @abc.abstractmethod
+    def get(self, key):
+        """ Returns a `(token, expires_at)` pair or `None` if there is
+        no token stored by the key or the token has already expired. """
+
+    @abc.abstractmethod
+    def set(self, key, token, expires_at):
+        """ Stores the token (`expires_at` is a timestamp or `None`). """
+
+    def lock(self, key):
+        """ Returns a lock to hold while requesting a token for the key,
+        so concurrent clients share a single token request. """
+
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _expired(expires_at):
+        return expires_at is not None and expires_at <= time.time()
+
+
+class MemoryTokenCache(TokenCache):
+    """
+    Keeps tokens in memory, so they are shared within a single process.
+    """
+
+    def __init__(self):
+        super(MemoryTokenCache, self).__init__()
+
+        self._entries = {}
+        self._entries_lock = threading.Lock()
+
+    def get(self, key):
+        with self._entries_lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self._expired(entry[1]):
+                del self._entries[key]
+                entry = None
+
+            return entry
+
+    def set(self, key, token, expires_at):
+        with self._entries_lock:
+            self._entries[key] = (token, expires_at)
+
+
+class FileTokenCache(TokenCache):
+    """
+    Keeps tokens in a JSON file, so they are shared between processes
+    (e.g. workers of a pool) running on the same host.
+    The file is only readable by its owner since tokens are secrets.
+    On POSIX platforms concurrent processes share a single token request.
+    """
+
+    def __init__(self, path):
+        super(FileTokenCache, self).__init__()
+
+        self._path = path
+
+    def get(self, key):
+        entry = self._read().get(key)
+
+        if entry is None or self._expired(entry['expires_at']):
+            return None
+
+        return entry['token'], entry['expires_at']
+
+    def set(self, key, token, expires_at):
+        entries = dict(
+            (other, entry)
+            for other, entry in self._read().items()
+            if not self._expired(entry['expires_at'])
+        )
+        entries[key] = {'token': token, 'expires_at': expires_at}
+
+        self._write(entries)
+
+    @contextmanager
+    def lock(self, key):
+        with super(FileTokenCache, self).lock(key):
+            if fcntl is None:
+                yield
+                return
+
+            with open(self._path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self._path, 'r') as fin:
+                return json.load(fin)
+        except (IOError, OSError, ValueError):
+            # Missing or corrupted files are just empty caches.
+            return {}
+
+    def _write(self, entries):
+        directory = os.path.dirname(os.path.abspath(self._path))
+
+        # Write to a temporary file (only readable by its owner) first
+        # and then atomically replace the original one,
+        # so readers never see partially written data.
+        fd, temporary = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as fout:
+                json.dump(entries, fout)
+            # Unlike `os.rename`, `os.replace` (Python 3.3+)
+            # also overwrites existing files on Windows.
+            getattr(os, 'replace', os.rename)(temporary, self._path)
+        except Exception:
+            os.remove(temporary)
+            raise
+
+
+# The default cache shared by all clients within the current process.
+default_token_cache = MemoryTokenCache()
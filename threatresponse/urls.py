@@ -1,6 +1,9 @@
+import threading
+from collections import OrderedDict
+
 from six.moves.urllib.parse import quote
 
-from .exceptions import RegionError
+from .exceptions import EnvironmentValueError, RegionError
 
 _url_patterns_by_api_family = {
     'visibility': 'https://visibility{region}.amp.cisco.com',
@@ -8,50 +11,137 @@ _url_patterns_by_api_family = {
     'global_intel': 'https://intel{region}.amp.cisco.com'
 }
 
+REGIONS = ('', 'us', 'eu', 'apjc')
 
-def _url_for_region(url_pattern, region):
-    # Fall back to the default region.
-    if region == 'us':
-        region = ''
+# The number of the most recently resolved environments to keep.
+MAX_RESOLVED_ENVIRONMENTS = 32
 
-    return url_pattern.format(region='.' + region if region != '' else '')
 
+class Environment(object):
+    """
+    Represents the URLs of the API families by region built once (and never
+    modified afterwards) from the URL patterns by API family, where `{region}`
+    stands for the region (e.g. `'https://intel{region}.amp.cisco.com'`).
+    """
 
-def _urls_by_region(urls):
-    return dict(
-        (
-            region,
-            dict(
-                (api_family, _url_for_region(url_pattern, region))
-                for api_family, url_pattern in urls.items()
+    def __init__(self, patterns=None):
+        if patterns is None:
+            patterns = _url_patterns_by_api_family
+
+        _validate(patterns)
+
+        self._urls = dict(
+            (
+                region,
+                dict(
+                    (api_family, _url_for_region(url_pattern, region))
+                    for api_family, url_pattern in patterns.items()
+                )
             )
+            for region in REGIONS
         )
-        for region in (
-            '',
-            'us',
-            'eu',
-            'apjc',
+
+    @classmethod
+    def resolved(cls, environment=None):
+        """ Returns the environment for the URL patterns by API family
+        (the default ones if `None`), the very same one for equal patterns.
+        """
+
+        if isinstance(environment, cls):
+            return environment
+        if environment is None:
+            environment = _url_patterns_by_api_family
+
+        key = _key(environment)
+        with _environments_lock:
+            resolved = _environments.pop(key, None)
+            if resolved is not None:
+                # Mark the environment as the most recently used one.
+                _environments[key] = resolved
+                return resolved
+
+        resolved = cls(environment)
+
+        with _environments_lock:
+            # Valid patterns (i.e. strings by API family) are always hashable.
+            resolved = _environments.setdefault(key, resolved)
+
+            while len(_environments) > MAX_RESOLVED_ENVIRONMENTS:
+                _environments.popitem(last=False)
+
+        return resolved
+
+    def url_for(self, region, family):
+        # Fall back to the default region.
+        if region is None:
+            region = ''
+        if region not in self._urls:
+            # Use `repr` to make each region enclosed in quotes.
+            raise RegionError(
+                'Invalid region {}, must be one of: {}.'.format(
+                    repr(region),
+                    ', '.join(map(repr, REGIONS)),
+                )
+            )
+
+        return self._urls[region][family]
+
+
+# The environments resolved recently by their URL patterns
+# (the least recently used ones get evicted).
+_environments = OrderedDict()
+_environments_lock = threading.Lock()
+
+
+def _is_mapping(value):
+    return hasattr(value, 'items')
+
+
+def _key(patterns):
+    # Equal patterns have equal keys (invalid ones have none).
+    try:
+        return frozenset(patterns.items())
+    except (AttributeError, TypeError):
+        return None
+
+
+def _validate(patterns):
+    if not _is_mapping(patterns):
+        raise EnvironmentValueError(
+            'Invalid environment {}, must be a dict of URLs by API family.'
+            .format(repr(patterns))
         )
-    )
 
+    missing = [api_family for api_family in _url_patterns_by_api_family
+               if api_family not in patterns]
+    if missing:
+        raise EnvironmentValueError(
+            'Invalid environment, missing URLs for: {}.'.format(
+                ', '.join(map(repr, sorted(missing)))
+            )
+        )
 
-def url_for(region, family, environment=None):
+    for api_family, url_pattern in patterns.items():
+        try:
+            _url_for_region(url_pattern, '')
+        except (AttributeError, IndexError, KeyError, ValueError):
+            raise EnvironmentValueError(
+                'Invalid URL {} for {}, must be a string optionally '
+                'containing {{region}}.'.format(repr(url_pattern),
+                                                repr(api_family))
+            )
+
+
+def _url_for_region(url_pattern, region):
     # Fall back to the default region.
-    if region is None:
+    if region == 'us':
         region = ''
-    # Fall back to the default environment.
-    if environment is None:
-        environment = _url_patterns_by_api_family
-    if region not in _urls_by_region(environment):
-        # Use `repr` to make each region enclosed in quotes.
-        raise RegionError(
-            'Invalid region {}, must be one of: {}.'.format(
-                repr(region),
-                ', '.join(map(repr, _urls_by_region(environment).keys())),
-            )
-        )
 
-    return _urls_by_region(environment)[region][family]
+    return url_pattern.format(region='.' + region if region != '' else '')
+
+
+def url_for(region, family, environment=None):
+    return Environment.resolved(environment).url_for(region, family)
 
 
 def join(base, *parts):
@@ -0,0 +1,150 @@
+import calendar
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import datetime
+
+
+class VerdictCache(object):
+    """
+    Keeps verdicts of the deliberate endpoint by observable (i.e. by its type
+    and value) until the earliest of their `valid_time.end_time` values,
+    but no longer than `ttl` seconds (if specified), evicting the least
+    recently used observables beyond `max_entries`. If `negative_ttl` is
+    specified, observables without any verdict are kept for that long too.
+    Responses with errors are never stored since their verdicts may lack
+    the ones of failed modules. Thread-safe.
+    """
+
+    def __init__(self, max_entries=10000, ttl=None, negative_ttl=None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(('hits', 'misses', 'evictions'), 0)
+
+    def split(self, observables):
+        """ Returns a response (of the very same shape as the deliberate
+        endpoint returns) made of the cached verdicts for the observables
+        along with the list of observables missing from the cache. """
+
+        modules = []
+        misses = []
+        seen = set()
+        now = time.time()
+
+        with self._lock:
+            for observable in observables:
+                key = _key(observable)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                entry = self._entries.pop(key, None)
+                if entry is None or entry[0] <= now:
+                    self._stats['misses'] += 1
+                    misses.append(observable)
+                    continue
+
+                # Mark the entry as the most recently used one.
+                self._entries[key] = entry
+                self._stats['hits'] += 1
+                modules.extend(entry[1])
+
+        # Copy the verdicts to not let callers modify the cached ones.
+        return {'data': deepcopy(modules)}, misses
+
+    def store(self, observables, response):
+        """ Stores the verdicts of the deliberate endpoint response
+        to a request for the observables. """
+
+        if response.get('errors'):
+            return
+
+        fragments = OrderedDict((_key(observable), [])
+                                for observable in observables)
+        for module in response.get('data', []):
+            for doc in module.get('data', {}) \
+                    .get('verdicts', {}) \
+                    .get('docs', []):
+                fragments.setdefault(_key(doc['observable']), []).append(
+                    _fragment(module, doc)
+                )
+
+        now = time.time()
+
+        with self._lock:
+            for key, modules in fragments.items():
+                expires_at = self._expires_at(modules, now)
+                if expires_at is None or expires_at <= now:
+                    continue
+
+                self._entries.pop(key, None)
+                self._entries[key] = (expires_at, modules)
+
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Returns the numbers of hits, misses (both by observable)
+        and evictions along with the hit rate. """
+
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = float(stats['hits']) / lookups if lookups else 0.0
+
+        return stats
+
+    def _expires_at(self, modules, now):
+        if not modules:
+            if self._negative_ttl:
+                return now + self._negative_ttl
+            return None
+
+        end_times = [
+            _timestamp(module['data']['verdicts']['docs'][0]
+                       .get('valid_time', {})
+                       .get('end_time'))
+            for module in modules
+        ]
+        if self._ttl is not None:
+            end_times.append(now + self._ttl)
+
+        # Verdicts without end time are only kept for `ttl` seconds.
+        if None in end_times:
+            return now + self._ttl if self._ttl is not None else None
+
+        return min(end_times)
+
+
+def _key(observable):
+    return observable['type'], observable['value']
+
+
+def _fragment(module, doc):
+    # A module result with the only verdict, so the results of different
+    # observables can later be merged by `merged_responses`.
+    fragment = dict((key, value) for key, value in module.items()
+                    if key != 'data')
+    fragment['data'] = {'verdicts': {'count': 1, 'docs': [deepcopy(doc)]}}
+
+    return fragment
+
+
+def _timestamp(value):
+    # CTIM timestamps are in UTC, e.g. '2525-01-01T00:00:00.000Z'.
+    try:
+        moment = datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+    return calendar.timegm(moment.timetuple())